@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""generate-extension.py — Deterministic synthetic extensions for benchmarking.
+
+Usage: generate-extension.py OUTPUT [--files N] [--loc N] [--depth N]
+                             [--signals D] [--timeouts D] [--widgets D]
+                             [--try-catch D] [--minified N] [--bundled N]
+                             [--schema-keys N] [--seed N] [--zip]
+
+Writes a complete extension to OUTPUT (a directory, or OUTPUT.zip with
+--zip): metadata.json, LICENSE, extension.js, prefs.js, stylesheet.css, a
+GSettings schema, and --files modules under lib/, nested --depth
+directories deep, each about --loc lines long. The code follows the
+idioms of tests/fixtures/ and skills/ego-scaffold/assets/: widgets added in
+enable() and destroyed in disable(), settings signals and GLib timeouts
+tracked in fields and released, try/catch around fallible calls. Densities
+(D) are per 100 lines of code:
+
+  --signals    settings 'changed::' connections (default 2)
+  --timeouts   GLib timeouts (default 1)
+  --widgets    St widgets (default 3)
+  --try-catch  try/catch blocks (default 2)
+
+Counts and densities may be 0 but not negative; --loc and --schema-keys
+must be at least 1. Anything else is rejected with a usage error.
+
+--minified and --bundled add that many minified (one long line) or
+webpack-style bundled files, which check-files.py reports on purpose.
+
+The same arguments always produce byte-identical output (--seed varies the
+mix of statements), so timings of runs on it are comparable. It is the
+input for benchmarks of checks whose cost grows with file size or field
+count: the lifecycle and resource-graph method spans, catch-block scans,
+and the per-module import graph.
+
+    generate-extension.py /tmp/synthetic@bench --files 200 --loc 1000
+    ./ego-lint /tmp/synthetic@bench
+
+The UUID is the name of OUTPUT when that looks like one (contains '@'),
+else synthetic@bench.
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import zipfile
+
+DEFAULT_UUID = 'synthetic@bench'
+SCHEMA_ID = 'org.gnome.shell.extensions.synthetic'
+SCHEMA_PATH = '/org/gnome/shell/extensions/synthetic/'
+# Fixed member timestamp, so --zip output is byte-identical too
+ZIP_DATE = (2024, 1, 1, 0, 0, 0)
+# Smallest value of each size and density option; 0 where "none" makes sense
+MINIMUMS = {
+    'files': 0, 'loc': 1, 'depth': 0, 'signals': 0, 'timeouts': 0, 'widgets': 0,
+    'try_catch': 0, 'minified': 0, 'bundled': 0, 'schema_keys': 1,
+}
+
+LICENSE = '''\
+SPDX-License-Identifier: GPL-2.0-or-later
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 2 of the License, or
+(at your option) any later version.
+'''
+
+# (GVariant type, default, accessor) of the schema's keys, in rotation
+KEY_TYPES = (
+    ('b', 'true', 'boolean'),
+    ('i', '10', 'int'),
+    ('s', "'label'", 'string'),
+    ('d', '0.5', 'double'),
+    ('as', '[]', 'strv'),
+)
+
+# Filler statements: (template, lines); {n} is a per-file counter
+FILLER = (
+    ("        const value{n} = this._counter * {n} + 1;", 1),
+    ("        this._counter = (this._counter + {n}) % 1000;", 1),
+    ("        const parts{n} = `item-{n}`.split('-');", 1),
+    ("        if (this._counter > {n})\n            this._counter -= {n};", 2),
+    ("        const items{n} = [1, 2, 3].map(x => x * {n});", 1),
+)
+
+
+def key_name(i):
+    return f'key-{i}'
+
+
+class Module:
+    """One generated lib/ module: its path, class name and what it imports."""
+
+    def __init__(self, index, rel_dir):
+        self.index = index
+        self.rel_dir = rel_dir
+        self.name = f'module{index}.js'
+        self.class_name = f'Module{index}'
+
+    @property
+    def rel(self):
+        return f'{self.rel_dir}/{self.name}'
+
+    def import_path(self, from_dir):
+        path = os.path.relpath(self.rel, from_dir)
+        return path if path.startswith('.') else './' + path
+
+
+class Generator:
+    def __init__(self, args, uuid=DEFAULT_UUID):
+        self.args = args
+        self.uuid = uuid
+        self.rng = random.Random(args.seed)
+        self.keys = args.schema_keys
+
+    def key(self):
+        """A random schema key: (name, accessor)."""
+        i = self.rng.randrange(self.keys)
+        return key_name(i), KEY_TYPES[i % len(KEY_TYPES)][2]
+
+    def modules(self):
+        modules = []
+        for i in range(self.args.files):
+            parts = ['lib'] + [f'level{d}_{(i >> d) % 3}' for d in range(self.args.depth)]
+            modules.append(Module(i, '/'.join(parts)))
+        return modules
+
+    def module_js(self, module, modules):
+        """A class with enable()/destroy() and filler methods, ~--loc lines."""
+        rng = self.rng
+        args = self.args
+        imports = [
+            "import GLib from 'gi://GLib';",
+            "import St from 'gi://St';",
+        ]
+        if module.index > 0:
+            dep = modules[rng.randrange(module.index)]
+            imports.append(f"import {{{dep.class_name}}} from "
+                           f"'{dep.import_path(module.rel_dir)}';")
+        budget = max(args.loc - len(imports) - 20, 10)
+        per_line = {kind: density / 100 for kind, density in (
+            ('widget', args.widgets), ('signal', args.signals),
+            ('timeout', args.timeouts), ('try', args.try_catch))}
+
+        enable = []
+        cleanup = []
+        methods = []
+        body = []
+        n = 0
+        lines = 0
+        while lines < budget:
+            n += 1
+            roll = rng.random()
+            acc = 0.0
+            kind = 'filler'
+            for name, p in per_line.items():
+                acc += p
+                if roll < acc:
+                    kind = name
+                    break
+            if kind == 'widget':
+                enable += [f"        this._widget{n} = new St.Label({{text: 'Item {n}'}});",
+                           f"        this._box.add_child(this._widget{n});"]
+                cleanup += [f"        this._widget{n}?.destroy();",
+                            f"        this._widget{n} = null;"]
+                lines += 4
+            elif kind == 'signal':
+                name, accessor = self.key()
+                enable += [f"        this._signal{n} = this._settings.connect('changed::{name}',",
+                           f"            () => this._onChanged{n}());"]
+                cleanup += [f"        if (this._signal{n}) {{",
+                            f"            this._settings.disconnect(this._signal{n});",
+                            f"            this._signal{n} = null;",
+                            "        }"]
+                methods += [f"    _onChanged{n}() {{",
+                            f"        this._value{n} = this._settings.get_{accessor}('{name}');",
+                            "    }", ""]
+                lines += 10
+            elif kind == 'timeout':
+                enable += [f"        this._timeout{n} = GLib.timeout_add_seconds("
+                           f"GLib.PRIORITY_DEFAULT, {n % 60 + 1}, () => {{",
+                           "            this._tick();",
+                           "            return GLib.SOURCE_CONTINUE;",
+                           "        });"]
+                cleanup += [f"        if (this._timeout{n}) {{",
+                            f"            GLib.Source.remove(this._timeout{n});",
+                            f"            this._timeout{n} = null;",
+                            "        }"]
+                lines += 8
+            elif kind == 'try':
+                body += ["        try {",
+                         f"            this._parsed{n} = JSON.parse(this._raw ?? '{{}}');",
+                         "        } catch (e) {",
+                         f"            logError(e, 'Failed to parse item {n}');",
+                         f"            this._parsed{n} = null;",
+                         "        }"]
+                lines += 6
+            else:
+                template, count = FILLER[rng.randrange(len(FILLER))]
+                body.append(template.format(n=n))
+                lines += count
+
+        out = imports + [
+            "",
+            f"export class {module.class_name} {{",
+            "    constructor(settings, box) {",
+            "        this._settings = settings;",
+            "        this._box = box;",
+            "        this._counter = 0;",
+            "        this._raw = null;",
+            "    }",
+            "",
+            "    enable() {",
+            *enable,
+            "    }",
+            "",
+            "    _tick() {",
+            *body,
+            "    }",
+            "",
+            *methods,
+            "    destroy() {",
+            *cleanup,
+            "        this._settings = null;",
+            "        this._box = null;",
+            "    }",
+            "}",
+            "",
+        ]
+        return '\n'.join(out)
+
+    def extension_js(self, modules):
+        lines = [
+            "import St from 'gi://St';",
+            "import * as Main from 'resource:///org/gnome/shell/ui/main.js';",
+            "import * as PanelMenu from 'resource:///org/gnome/shell/ui/panelMenu.js';",
+            "import {Extension} from 'resource:///org/gnome/shell/extensions/extension.js';",
+        ]
+        lines += [f"import {{{m.class_name}}} from '{m.import_path('.')}';" for m in modules]
+        lines += [
+            "",
+            "export default class SyntheticExtension extends Extension {",
+            "    enable() {",
+            "        this._settings = this.getSettings();",
+            "        this._box = new St.BoxLayout({style_class: 'synthetic-box'});",
+            "        this._indicator = new PanelMenu.Button(0.0, this.metadata.name, false);",
+            "        this._indicator.add_child(this._box);",
+            "        Main.panel.addToStatusArea(this.uuid, this._indicator);",
+            "        this._modules = [",
+            *[f"            new {m.class_name}(this._settings, this._box)," for m in modules],
+            "        ];",
+            "        this._modules.forEach(module => module.enable());",
+            "    }",
+            "",
+            "    disable() {",
+            "        this._modules.forEach(module => module.destroy());",
+            "        this._modules = null;",
+            "        this._indicator.destroy();",
+            "        this._indicator = null;",
+            "        this._box = null;",
+            "        this._settings = null;",
+            "    }",
+            "}",
+            "",
+        ]
+        return '\n'.join(lines)
+
+    def prefs_js(self):
+        rows = []
+        for i in range(min(self.keys, 50)):
+            if KEY_TYPES[i % len(KEY_TYPES)][0] != 'b':
+                continue
+            rows += [f"        const row{i} = new Adw.SwitchRow({{title: _('Key {i}')}});",
+                     f"        settings.bind('{key_name(i)}', row{i}, 'active', "
+                     "Gio.SettingsBindFlags.DEFAULT);",
+                     f"        group.add(row{i});"]
+        return '\n'.join([
+            "import Adw from 'gi://Adw';",
+            "import Gio from 'gi://Gio';",
+            "",
+            "import {ExtensionPreferences, gettext as _} from "
+            "'resource:///org/gnome/Shell/Extensions/js/extensions/prefs.js';",
+            "",
+            "export default class SyntheticPreferences extends ExtensionPreferences {",
+            "    fillPreferencesWindow(window) {",
+            "        const settings = this.getSettings();",
+            "        const page = new Adw.PreferencesPage({title: _('General')});",
+            "        window.add(page);",
+            "        const group = new Adw.PreferencesGroup({title: _('Settings')});",
+            "        page.add(group);",
+            *rows,
+            "    }",
+            "}",
+            "",
+        ])
+
+    def schema_xml(self):
+        lines = ['<?xml version="1.0" encoding="UTF-8"?>', '<schemalist>',
+                 f'  <schema id="{SCHEMA_ID}" path="{SCHEMA_PATH}">']
+        for i in range(self.keys):
+            vtype, default, _accessor = KEY_TYPES[i % len(KEY_TYPES)]
+            lines += [f'    <key name="{key_name(i)}" type="{vtype}">',
+                      f'      <default>{default}</default>',
+                      f'      <summary>Synthetic key {i}</summary>',
+                      '    </key>']
+        lines += ['  </schema>', '</schemalist>', '']
+        return '\n'.join(lines)
+
+    def minified_js(self, i):
+        statements = ''.join(f'var a{j}=function(b){{return b*{j}+{i}}};'
+                             for j in range(60))
+        return f'/* minified-{i} */{statements}export{{a0}};\n'
+
+    def bundled_js(self, i):
+        return '\n'.join([
+            f'// bundle {i}',
+            '(() => {',
+            '    var __webpack_modules__ = {};',
+            '    function __webpack_require__(moduleId) {',
+            '        return __webpack_modules__[moduleId];',
+            '    }',
+            '    __webpack_require__(0);',
+            '})();',
+            '',
+        ])
+
+    def files(self):
+        """(relative path, text) of every file, in a fixed order."""
+        modules = self.modules()
+        metadata = '\n'.join([
+            '{',
+            f'    "uuid": "{self.uuid}",',
+            '    "name": "Synthetic Benchmark",',
+            '    "description": "Generated by benchmarks/generate-extension.py",',
+            '    "shell-version": ["48", "49"],',
+            f'    "settings-schema": "{SCHEMA_ID}",',
+            '    "url": "https://github.com/example/synthetic"',
+            '}',
+            '',
+        ])
+        yield 'metadata.json', metadata
+        yield 'LICENSE', LICENSE
+        yield 'stylesheet.css', '.synthetic-box {\n    spacing: 6px;\n}\n'
+        yield f'schemas/{SCHEMA_ID}.gschema.xml', self.schema_xml()
+        # Modules first: they draw from the seeded stream in index order
+        module_files = [(m.rel, self.module_js(m, modules)) for m in modules]
+        yield 'extension.js', self.extension_js(modules)
+        yield 'prefs.js', self.prefs_js()
+        yield from module_files
+        for i in range(self.args.minified):
+            yield f'lib/vendor/minified{i}.js', self.minified_js(i)
+        for i in range(self.args.bundled):
+            yield f'lib/vendor/bundle{i}.js', self.bundled_js(i)
+
+
+def write_dir(output, files):
+    for rel, text in files:
+        path = os.path.join(output, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+
+def write_zip(output, files):
+    with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for rel, text in files:
+            info = zipfile.ZipInfo(rel, ZIP_DATE)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = 0o644 << 16
+            zf.writestr(info, text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('output', help='directory to create (or OUTPUT.zip with --zip)')
+    parser.add_argument('--files', type=int, default=20,
+                        help='lib/ modules, 0 or more (default 20)')
+    parser.add_argument('--loc', type=int, default=300,
+                        help='lines per module, 1 or more (default 300)')
+    parser.add_argument('--depth', type=int, default=2,
+                        help='lib/ nesting, 0 for a flat lib/ (default 2)')
+    parser.add_argument('--signals', type=float, default=2.0,
+                        help="settings 'changed::' connections per 100 lines (default 2)")
+    parser.add_argument('--timeouts', type=float, default=1.0,
+                        help='GLib timeouts per 100 lines (default 1)')
+    parser.add_argument('--widgets', type=float, default=3.0,
+                        help='St widgets per 100 lines (default 3)')
+    parser.add_argument('--try-catch', type=float, default=2.0,
+                        help='try/catch blocks per 100 lines (default 2)')
+    parser.add_argument('--minified', type=int, default=0,
+                        help='minified one-line files to add (default 0)')
+    parser.add_argument('--bundled', type=int, default=0,
+                        help='webpack-style bundled files to add (default 0)')
+    parser.add_argument('--schema-keys', type=int, default=20,
+                        help='keys in the GSettings schema, 1 or more (default 20)')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='varies the mix of statements (default 0)')
+    parser.add_argument('--zip', action='store_true', help='write OUTPUT.zip instead')
+    args = parser.parse_args()
+    for name, minimum in MINIMUMS.items():
+        value = getattr(args, name)
+        if not math.isfinite(value) or value < minimum:
+            parser.error(f"--{name.replace('_', '-')} must be at least {minimum} (got {value})")
+
+    output = args.output
+    if args.zip and not output.endswith('.zip'):
+        output += '.zip'
+    if os.path.exists(output) and (not os.path.isdir(output) or os.listdir(output)):
+        parser.error(f"{output} already exists")
+
+    name = os.path.basename(os.path.normpath(output)).removesuffix('.zip')
+    files = list(Generator(args, name if '@' in name else DEFAULT_UUID).files())
+    if args.zip:
+        write_zip(output, files)
+    else:
+        write_dir(output, files)
+    lines = sum(text.count('\n') for _rel, text in files)
+    size = sum(len(text.encode('utf-8')) for _rel, text in files)
+    print(f"{output}: {len(files)} files, {lines} lines, {size} bytes", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
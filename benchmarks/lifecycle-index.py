@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""lifecycle-index.py — Micro-benchmark for the lifecycle index.
+
+Usage: lifecycle-index.py [--fields N] [--repeat N]
+
+Writes a synthetic extension whose enable() creates N widget, timeout and
+settings fields (500 by default) and whose disable() destroys, removes and
+nulls every one of them, then reports:
+
+  tokens  tokenizing extension.js (ego_lint.jstokens)
+  index   building its LifecycleIndex on top of the tokens (enable/disable/
+          destroy spans, fields, calls, null resets)
+  check   a full check-lifecycle.py run over the extension, in a fresh
+          interpreter each time
+
+Each figure is the best of --repeat runs (default 5), in milliseconds.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                           '..', 'skills', 'ego-lint', 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+from ego_lint import jstokens, lifecycle  # noqa: E402
+
+
+METADATA = '''{
+  "uuid": "lifecycle-bench@bench",
+  "name": "Lifecycle Benchmark",
+  "description": "Synthetic extension for the lifecycle index benchmark",
+  "shell-version": ["48"]
+}
+'''
+
+
+def extension_js(fields):
+    """extension.js with `fields` widgets, timeouts and settings objects."""
+    enable = []
+    disable = []
+    for i in range(fields):
+        kind = i % 3
+        if kind == 0:
+            enable.append(f"        this._label{i} = new St.Label({{text: 'Label {i}'}});")
+            enable.append(f"        Main.panel._rightBox.add_child(this._label{i});")
+            disable.append(f"        this._label{i}?.destroy();")
+            disable.append(f"        this._label{i} = null;")
+        elif kind == 1:
+            enable.append(f"        this._timeout{i} = GLib.timeout_add_seconds("
+                          f"GLib.PRIORITY_DEFAULT, {i % 60 + 1}, () => {{")
+            enable.append(f"            this._label{i - 1}?.set_text('{i}');")
+            enable.append("            return GLib.SOURCE_CONTINUE;")
+            enable.append("        });")
+            disable.append(f"        if (this._timeout{i}) {{")
+            disable.append(f"            GLib.Source.remove(this._timeout{i});")
+            disable.append(f"            this._timeout{i} = null;")
+            disable.append("        }")
+        else:
+            enable.append(f"        this._settings{i} = this.getSettings();")
+            enable.append(f"        this._settings{i}.connectObject('changed::key-{i}', "
+                          f"() => this._label{i - 2}?.queue_relayout(), this);")
+            disable.append(f"        this._settings{i}?.disconnectObject(this);")
+            disable.append(f"        this._settings{i} = null;")
+    return '\n'.join([
+        "import GLib from 'gi://GLib';",
+        "import St from 'gi://St';",
+        "import * as Main from 'resource:///org/gnome/shell/ui/main.js';",
+        "import {Extension} from 'resource:///org/gnome/shell/extensions/extension.js';",
+        "",
+        "export default class LifecycleBenchExtension extends Extension {",
+        "    enable() {",
+        *enable,
+        "    }",
+        "",
+        "    disable() {",
+        "        // Also runs on the lock screen: nothing is kept for unlock-dialog",
+        *disable,
+        "    }",
+        "}",
+        "",
+    ])
+
+
+def best_of(repeat, func):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--fields', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as ext_dir:
+        ext_js = os.path.join(ext_dir, 'extension.js')
+        with open(ext_js, 'w', encoding='utf-8') as f:
+            f.write(extension_js(args.fields))
+        with open(os.path.join(ext_dir, 'metadata.json'), 'w', encoding='utf-8') as f:
+            f.write(METADATA)
+        with open(ext_js, encoding='utf-8') as f:
+            text = f.read()
+
+        def tokenize():
+            src = jstokens.JSSource(text)
+            src.masked
+            src.match(0)
+            return src
+
+        def build_index(src):
+            index = lifecycle.LifecycleIndex(src)
+            index.enable, index.disable, index.destroy
+            index.null_resets
+
+        check = [sys.executable, os.path.join(SCRIPTS_DIR, 'check-lifecycle.py'), ext_dir]
+        tokens_ms = best_of(args.repeat, tokenize)
+        src = tokenize()
+        index_ms = best_of(args.repeat, lambda: build_index(src))
+        check_ms = best_of(args.repeat, lambda: subprocess.run(
+            check, check=True, stdout=subprocess.DEVNULL))
+
+    print(f"fields: {args.fields} ({len(text)} bytes, {text.count(chr(10))} lines)")
+    print(f"tokens: {tokens_ms:8.1f} ms")
+    print(f"index:  {index_ms:8.1f} ms")
+    print(f"check:  {check_ms:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""run-benchmarks.py — Time every ego-lint engine and gate on regressions.
+
+Usage: run-benchmarks.py [--corpus NAME]... [--engine NAME]...
+                         [--repeat N] [--warmup N] [--save FILE]
+                         [--compare FILE] [--threshold PCT] [--list]
+
+Runs each engine on each corpus: the full ego-lint.sh, apply-patterns.py,
+every check-*.py and check-*.sh, and build-resource-graph.py. Each run is a
+fresh process, as in a lint run, with the on-disk caches disabled
+(EGO_LINT_NO_CACHE=1) so every run does the full work. After --warmup
+discarded runs (default 1), --repeat runs (default 3) record:
+
+  wall  elapsed time, median of the runs (ms)
+  cpu   user + system time of the process and its children, median (ms)
+  rss   peak resident set size of the largest process, maximum (KB)
+
+Corpora:
+
+  small      generate-extension.py, 20 modules x 300 lines (default)
+  large      generate-extension.py, 100 modules x 800 lines (default)
+  fixtures   every tests/fixtures/ directory, one after another per run
+
+--save FILE writes the results as JSON; use it to record a baseline.
+--compare FILE reads a baseline and exits 1 when any engine is slower
+(wall or cpu) or larger (rss) by more than --threshold percent (default
+25). Differences under --min-delta-ms (default 20 ms) or 1 MB never count,
+so tiny engines are not failed by timer noise. Baselines are only
+comparable on the same machine and Python.
+
+Everything runs offline with the standard library on Linux (peak RSS comes
+from wait4()).
+
+    run-benchmarks.py --save /tmp/before.json
+    # ...change a check...
+    run-benchmarks.py --compare /tmp/before.json --engine check-lifecycle
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+SCRIPTS_DIR = os.path.join(ROOT_DIR, 'skills', 'ego-lint', 'scripts')
+FIXTURES_DIR = os.path.join(ROOT_DIR, 'tests', 'fixtures')
+PATTERNS_FILE = os.path.join(ROOT_DIR, 'rules', 'patterns.yaml')
+GENERATOR = os.path.join(BENCH_DIR, 'generate-extension.py')
+
+# Bump when the results file changes shape
+RESULTS_VERSION = 1
+
+# name -> generate-extension.py arguments
+SYNTHETIC_CORPORA = {
+    'small': ['--files', '20', '--loc', '300'],
+    'large': ['--files', '100', '--loc', '800'],
+}
+CORPORA = tuple(SYNTHETIC_CORPORA) + ('fixtures',)
+DEFAULT_CORPORA = tuple(SYNTHETIC_CORPORA)
+
+DEFAULT_THRESHOLD = 25.0
+DEFAULT_MIN_DELTA_MS = 20.0
+MIN_DELTA_RSS_KB = 1024
+
+
+def engines():
+    """{name: argv prefix}; the extension directory is appended to each."""
+    found = {
+        'ego-lint': ['bash', os.path.join(SCRIPTS_DIR, 'ego-lint.sh')],
+        'apply-patterns': [sys.executable, os.path.join(SCRIPTS_DIR, 'apply-patterns.py'),
+                           PATTERNS_FILE],
+    }
+    for path in sorted(glob.glob(os.path.join(SCRIPTS_DIR, 'check-*'))):
+        name, ext = os.path.splitext(os.path.basename(path))
+        if ext == '.py':
+            found[name] = [sys.executable, path]
+        elif ext == '.sh':
+            found[name] = ['bash', path]
+    found['build-resource-graph'] = [
+        sys.executable, os.path.join(SCRIPTS_DIR, 'build-resource-graph.py'), '--compact']
+    return found
+
+
+def run_once(argv, env):
+    """(wall ms, cpu ms, peak rss KB) of one run of argv."""
+    start = time.perf_counter()
+    proc = subprocess.Popen(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                            stdin=subprocess.DEVNULL, env=env)
+    # wait4() rather than proc.wait(): it also returns the child's rusage
+    _pid, status, usage = os.wait4(proc.pid, 0)
+    wall = time.perf_counter() - start
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    return wall * 1000, (usage.ru_utime + usage.ru_stime) * 1000, usage.ru_maxrss
+
+
+def measure(argv, ext_dirs, env, warmup, repeat):
+    """{wall_ms, cpu_ms, rss_kb} of argv over ext_dirs; see the module docstring."""
+    walls = []
+    cpus = []
+    rss = 0
+    for i in range(warmup + repeat):
+        wall = cpu = 0.0
+        for ext_dir in ext_dirs:
+            w, c, r = run_once(argv + [ext_dir], env)
+            wall += w
+            cpu += c
+            rss = max(rss, r) if i >= warmup else rss
+        if i >= warmup:
+            walls.append(wall)
+            cpus.append(cpu)
+    return {'wall_ms': round(statistics.median(walls), 1),
+            'cpu_ms': round(statistics.median(cpus), 1),
+            'rss_kb': rss}
+
+
+def corpus_dirs(name, work_dir):
+    """Extension directories of a corpus, generating synthetic ones in work_dir."""
+    if name == 'fixtures':
+        return sorted(entry.path for entry in os.scandir(FIXTURES_DIR) if entry.is_dir())
+    ext_dir = os.path.join(work_dir, f'{name}@bench')
+    subprocess.run([sys.executable, GENERATOR, ext_dir, *SYNTHETIC_CORPORA[name]],
+                   check=True, stderr=subprocess.DEVNULL)
+    return [ext_dir]
+
+
+def compare(results, baseline, threshold, min_delta_ms):
+    """Yield (corpus, engine, metric, old, new) for each regression."""
+    limit = 1 + threshold / 100
+    for corpus, by_engine in results.items():
+        for engine, now in by_engine.items():
+            before = baseline.get(corpus, {}).get(engine)
+            if not before:
+                continue
+            for metric, min_delta in (('wall_ms', min_delta_ms), ('cpu_ms', min_delta_ms),
+                                      ('rss_kb', MIN_DELTA_RSS_KB)):
+                old = before.get(metric)
+                new = now[metric]
+                if old is not None and new > old * limit and new - old >= min_delta:
+                    yield corpus, engine, metric, old, new
+
+
+def change(old, new):
+    if not old:
+        return ''
+    return f'{(new - old) / old * 100:+.0f}%'
+
+
+def print_results(results, baseline):
+    print(f"{'corpus':<10} {'engine':<22} {'wall ms':>9} {'cpu ms':>9} {'rss MB':>7}"
+          + ('  vs baseline (wall/cpu/rss)' if baseline else ''))
+    for corpus, by_engine in results.items():
+        for engine, m in by_engine.items():
+            line = (f"{corpus:<10} {engine:<22} {m['wall_ms']:>9.1f} {m['cpu_ms']:>9.1f} "
+                    f"{m['rss_kb'] / 1024:>7.1f}")
+            before = baseline.get(corpus, {}).get(engine) if baseline else None
+            if before:
+                line += '  ' + ' / '.join(change(before.get(k), m[k])
+                                          for k in ('wall_ms', 'cpu_ms', 'rss_kb'))
+            print(line)
+
+
+def main():
+    all_engines = engines()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--corpus', action='append', choices=CORPORA,
+                        help='corpus to run (repeatable; default: small, large)')
+    parser.add_argument('--engine', action='append', metavar='NAME',
+                        help='engine to run (repeatable; default: all, see --list)')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--save', metavar='FILE', help='write the results as JSON')
+    parser.add_argument('--compare', metavar='FILE', help='baseline JSON to gate against')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, metavar='PCT')
+    parser.add_argument('--min-delta-ms', type=float, default=DEFAULT_MIN_DELTA_MS)
+    parser.add_argument('--list', action='store_true', help='list engines and corpora')
+    args = parser.parse_args()
+
+    if args.list:
+        print('engines: ' + ' '.join(all_engines))
+        print('corpora: ' + ' '.join(CORPORA))
+        return 0
+    if args.repeat < 1 or args.warmup < 0:
+        parser.error('--repeat must be at least 1 and --warmup not negative')
+    unknown = [name for name in args.engine or () if name not in all_engines]
+    if unknown:
+        parser.error(f"unknown engine(s): {', '.join(unknown)} (see --list)")
+
+    baseline = None
+    if args.compare:
+        try:
+            with open(args.compare, encoding='utf-8') as f:
+                baseline = json.load(f)['results']
+        except (OSError, ValueError, KeyError) as e:
+            parser.error(f'cannot read baseline {args.compare}: {e}')
+
+    selected = {name: argv for name, argv in all_engines.items()
+                if not args.engine or name in args.engine}
+    env = dict(os.environ, EGO_LINT_NO_CACHE='1')
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='ego-lint-bench-') as work_dir:
+        for corpus in args.corpus or DEFAULT_CORPORA:
+            ext_dirs = corpus_dirs(corpus, work_dir)
+            results[corpus] = {}
+            for name, argv in selected.items():
+                print(f'{corpus}: {name}...', file=sys.stderr)
+                results[corpus][name] = measure(argv, ext_dirs, env, args.warmup, args.repeat)
+
+    print_results(results, baseline)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': RESULTS_VERSION,
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'cpus': os.cpu_count(),
+                'repeat': args.repeat,
+                'warmup': args.warmup,
+                'corpora': {name: SYNTHETIC_CORPORA.get(name, []) for name in results},
+                'results': results,
+            }, f, indent=2)
+            f.write('\n')
+
+    if baseline is None:
+        return 0
+    regressions = list(compare(results, baseline, args.threshold, args.min_delta_ms))
+    for corpus, engine, metric, old, new in regressions:
+        print(f"REGRESSION|{corpus}/{engine}|{metric} {old} -> {new} ({change(old, new)}, "
+              f"threshold {args.threshold:g}%)")
+    if regressions:
+        return 1
+    print(f"No regressions over {args.threshold:g}% against {args.compare}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
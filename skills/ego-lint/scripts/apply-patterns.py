@@ -9,12 +9,14 @@ outputs pipe-delimited results: STATUS|rule-id|detail
 Requires only Python stdlib (no PyYAML dependency).
 """
 
-import glob
-import json
+import fnmatch
 import os
 import re
 import sys
 
+from ego_lint import extfs, metadata, trace
+from ego_lint.passes import SKIP_DIRS
+
 
 def parse_rules(path):
     """Parse the constrained YAML subset used by patterns.yaml."""
@@ -87,27 +89,6 @@ def _unescape_yaml_double(s):
     return ''.join(result)
 
 
-def _get_shell_versions(ext_dir):
-    """Read shell-version from metadata.json and return as list of ints."""
-    metadata_path = os.path.join(ext_dir, 'metadata.json')
-    if not os.path.isfile(metadata_path):
-        return []
-    try:
-        with open(metadata_path, encoding='utf-8') as f:
-            meta = json.load(f)
-        versions = meta.get('shell-version', [])
-        if not isinstance(versions, list):
-            return []
-        result = []
-        for v in versions:
-            m = re.match(r'^(\d+)', str(v))
-            if m:
-                result.append(int(m.group(1)))
-        return result
-    except (json.JSONDecodeError, OSError):
-        return []
-
-
 def _version_gate_applies(rule, shell_versions):
     """Check if a version-gated rule should apply given the shell versions.
 
@@ -220,26 +201,44 @@ def validate_rules(rules_file):
         return 0
 
 
-def main():
-    # Handle --validate mode
-    if len(sys.argv) >= 3 and sys.argv[1] == '--validate':
-        sys.exit(validate_rules(sys.argv[2]))
+def scope_files(ext_dir):
+    """Files rule scopes can match, relative to ext_dir, in walk order.
 
-    if len(sys.argv) < 3:
-        print("Usage: apply-patterns.py RULES_YAML EXTENSION_DIR", file=sys.stderr)
-        print("       apply-patterns.py --validate RULES_YAML", file=sys.stderr)
-        sys.exit(1)
+    Matches what the rules' recursive globs always did: hidden files and
+    directories never match, and vendored/VCS directories are skipped.
+    """
+    files = []
+    for dirpath, dirs, filenames in extfs.walk(ext_dir):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS and not d.startswith('.')]
+        for name in filenames:
+            if not name.startswith('.'):
+                files.append(os.path.relpath(os.path.join(dirpath, name), ext_dir))
+    return files
 
-    rules_file = sys.argv[1]
-    ext_dir = os.path.realpath(sys.argv[2])
 
-    if not os.path.isfile(rules_file):
-        return
+def load_rules(rules_file):
+    """(rule, compiled pattern or None if invalid) for each rule of a file.
 
-    rules = parse_rules(rules_file)
-    shell_versions = _get_shell_versions(ext_dir)
+    Loaded once, the rules can be applied to any number of extensions
+    (ego-lint --corpus keeps them for the life of a worker).
+    """
+    rules = []
+    for rule in parse_rules(rules_file):
+        try:
+            compiled = re.compile(rule.get('pattern', ''))
+        except re.error:
+            compiled = None
+        rules.append((rule, compiled))
+    return rules
 
-    for rule in rules:
+
+def apply_rules(rules, ext_dir):
+    """Print the results of load_rules() rules on one extension."""
+    shell_versions = metadata.load(ext_dir).shell_versions
+    files = scope_files(ext_dir)
+    contents = {}  # rel -> text, read on first use by any rule
+
+    for rule, compiled in rules:
         rid = rule.get('id', '?')
         pattern = rule.get('pattern', '')
         scopes = rule.get('scope', ['*.js'])
@@ -259,59 +258,48 @@ def main():
         found = False
         dedup_files = set()  # For deduplicate mode
 
-        try:
-            compiled = re.compile(pattern)
-        except re.error:
+        if compiled is None:
             print(f"SKIP|{rid}|Invalid regex: {pattern}")
             continue
 
-        for scope in scopes:
-            # Expand glob relative to extension dir
-            matches = glob.glob(os.path.join(ext_dir, '**', scope), recursive=True)
-            # Also check files directly in ext_dir
-            matches += glob.glob(os.path.join(ext_dir, scope))
-            # Deduplicate and skip non-extension directories
-            seen = set()
-            skip_dirs = ('node_modules', '.git', '__pycache__')
-            for filepath in matches:
-                if filepath in seen or not os.path.isfile(filepath):
-                    continue
-                # Skip files inside non-extension directories
-                rel = os.path.relpath(filepath, ext_dir)
-                if any(part in skip_dirs for part in rel.split(os.sep)):
-                    continue
-                seen.add(filepath)
-                try:
-                    with open(filepath, encoding='utf-8', errors='replace') as f:
-                        file_content = f.read()
-
-                    # Check replacement-pattern: if both old and new patterns
-                    # exist in the same file, it's backward-compatible — skip
-                    replacement = rule.get('replacement-pattern', '')
-                    if replacement and replacement in file_content:
+        # One span per rule under ego-lint --timings/--trace
+        with trace.span(rid):
+            for scope in scopes:
+                for rel in files:
+                    if not fnmatch.fnmatchcase(os.path.basename(rel), scope):
                         continue
-
-                    prev_line = ''
-                    for lineno, line in enumerate(file_content.splitlines(True), 1):
-                        if compiled.search(line):
-                            # Check for inline suppression
-                            if _is_suppressed(line, prev_line, rid):
-                                prev_line = line
-                                continue
-                            rel = os.path.relpath(filepath, ext_dir)
-                            if deduplicate:
-                                dedup_files.add(rel)
-                                found = True
-                            else:
-                                fix = rule.get('fix', '')
-                                if fix:
-                                    print(f"{status}|{rid}|{rel}:{lineno}: {message}|fix: {fix}")
+                    try:
+                        file_content = contents.get(rel)
+                        if file_content is None:
+                            file_content = contents[rel] = extfs.read_text(
+                                os.path.join(ext_dir, rel))
+
+                        # Check replacement-pattern: if both old and new patterns
+                        # exist in the same file, it's backward-compatible — skip
+                        replacement = rule.get('replacement-pattern', '')
+                        if replacement and replacement in file_content:
+                            continue
+
+                        prev_line = ''
+                        for lineno, line in enumerate(file_content.splitlines(True), 1):
+                            if compiled.search(line):
+                                # Check for inline suppression
+                                if _is_suppressed(line, prev_line, rid):
+                                    prev_line = line
+                                    continue
+                                if deduplicate:
+                                    dedup_files.add(rel)
+                                    found = True
                                 else:
-                                    print(f"{status}|{rid}|{rel}:{lineno}: {message}")
-                                found = True
-                        prev_line = line
-                except OSError:
-                    continue
+                                    fix = rule.get('fix', '')
+                                    if fix:
+                                        print(f"{status}|{rid}|{rel}:{lineno}: {message}|fix: {fix}")
+                                    else:
+                                        print(f"{status}|{rid}|{rel}:{lineno}: {message}")
+                                    found = True
+                            prev_line = line
+                    except OSError:
+                        continue
 
         if deduplicate and dedup_files:
             files_list = ', '.join(sorted(dedup_files))
@@ -325,5 +313,24 @@ def main():
             print(f"PASS|{rid}|No matches")
 
 
+def main():
+    # Handle --validate mode
+    if len(sys.argv) >= 3 and sys.argv[1] == '--validate':
+        sys.exit(validate_rules(sys.argv[2]))
+
+    if len(sys.argv) < 3:
+        print("Usage: apply-patterns.py RULES_YAML EXTENSION_DIR", file=sys.stderr)
+        print("       apply-patterns.py --validate RULES_YAML", file=sys.stderr)
+        sys.exit(1)
+
+    rules_file = sys.argv[1]
+    ext_dir = os.path.realpath(sys.argv[2])
+
+    if not os.path.isfile(rules_file):
+        return
+
+    apply_rules(load_rules(rules_file), ext_dir)
+
+
 if __name__ == '__main__':
     main()
@@ -1,20 +1,46 @@
 #!/usr/bin/env python3
 """build-resource-graph.py — Cross-file resource graph builder for GNOME extensions.
 
-Usage: build-resource-graph.py EXTENSION_DIR
+Usage: build-resource-graph.py [--no-cache] [--compact] [--format FORMAT] EXTENSION_DIR
+       build-resource-graph.py query EXTENSION_DIR --file REL_PATH
+       build-resource-graph.py query EXTENSION_DIR --path FROM TO
 
 Scans all JS files in a GNOME extension directory and builds a structured JSON
-resource graph with ownership chains and orphan detection.
+resource graph with ownership chains and orphan detection. --format dot or
+--format graphml streams the same graph for Graphviz/yEd/Gephi instead.
+
+The query subcommand inspects one chain without re-running the pipeline:
+  --file lib/foo.js        every resource created in lib/foo.js and where it
+                           is destroyed (or why it is an orphan)
+  --path extension.js X    ownership path from one module to another; X may be
+                           a file path or an imported class name
+Queries read the last graph snapshot for EXTENSION_DIR from the cache when no
+JS file has changed since (checked by size and mtime), so nothing is rescanned.
+Only the MAX_GRAPH_SNAPSHOTS most recently used snapshots are kept.
 
 Resource types tracked: signal, timeout, widget, dbus, filemonitor, gsettings
 
+Per-file scan results depend only on the file's contents, so they are cached
+on disk keyed by a content hash; only changed files are rescanned. The cache
+lives in $EGO_LINT_CACHE_DIR (default: $XDG_CACHE_HOME/ego-lint) and is
+disabled by --no-cache or EGO_LINT_NO_CACHE=1.
+
 Output: JSON to stdout
 """
 
+import argparse
+import hashlib
 import json
 import os
 import re
 import sys
+from collections import deque, namedtuple
+from xml.sax.saxutils import escape, quoteattr
+
+from ego_lint import cache, extfs
+from ego_lint.cache import default_cache_dir
+from ego_lint.importgraph import ImportGraph
+from ego_lint.jstokens import JSSource
 
 
 # ---------------------------------------------------------------------------
@@ -25,7 +51,7 @@ def find_js_files(ext_dir, exclude_prefs=False):
     """Find JS files, optionally excluding prefs.js."""
     skip_dirs = {'node_modules', '.git', '__pycache__'}
     files = []
-    for root, dirs, filenames in os.walk(ext_dir):
+    for root, dirs, filenames in extfs.walk(ext_dir):
         dirs[:] = [d for d in dirs if d not in skip_dirs]
         for name in filenames:
             if name.endswith('.js'):
@@ -36,15 +62,35 @@ def find_js_files(ext_dir, exclude_prefs=False):
 
 
 def read_file(path):
-    with open(path, encoding='utf-8', errors='replace') as f:
-        return f.read()
+    return extfs.read_text(path)
+
+
+# ---------------------------------------------------------------------------
+# Event records
+# ---------------------------------------------------------------------------
 
+# Events are namedtuples rather than dicts: large extensions produce tens of
+# thousands of them, and a tuple carries no per-instance key table. Type and
+# ref strings are interned so repeated values share one object.
+CreateEvent = namedtuple('CreateEvent', 'line type pattern stored_as')
+DestroyEvent = namedtuple('DestroyEvent', 'line type pattern ref')
+InstantiateEvent = namedtuple(
+    'InstantiateEvent',
+    'line type cls stored_as has_destroy_call destroy_line')
 
-def strip_comments(content):
-    """Remove single-line and block comments from JS content."""
-    content = re.sub(r'/\*.*?\*/', '', content, flags=re.DOTALL)
-    content = re.sub(r'//.*$', '', content, flags=re.MULTILINE)
-    return content
+# Cleanup methods whose bodies are indexed for `this._x = null` releases
+CLEANUP_METHODS = ('destroy', 'disable', '_destroy')
+
+
+def _intern(value):
+    return sys.intern(value) if value is not None else None
+
+
+def event_to_dict(event):
+    """Convert an event record to the JSON shape used in the graph output."""
+    # `class` is a keyword, so InstantiateEvent names the field `cls`
+    return {('class' if k == 'cls' else k): v
+            for k, v in event._asdict().items()}
 
 
 # ---------------------------------------------------------------------------
@@ -108,89 +154,33 @@ DESTROY_PATTERNS = {
 }
 
 
-# ---------------------------------------------------------------------------
-# Import resolution
-# ---------------------------------------------------------------------------
-
-def parse_imports(content, file_path, ext_dir):
-    """Parse ES module imports to map class names to source files.
-
-    Returns dict: {class_name: resolved_relative_path}
-    """
-    imports = {}
-    file_dir = os.path.dirname(file_path)
-
-    # import {Foo, Bar} from './path.js'
-    for m in re.finditer(
-        r'import\s+\{([^}]+)\}\s+from\s+[\'"](\.[^"\']+)[\'"]', content
-    ):
-        names = [n.strip().split(' as ')[-1].strip() for n in m.group(1).split(',')]
-        import_path = m.group(2)
-        resolved = os.path.normpath(os.path.join(file_dir, import_path))
-        rel = os.path.relpath(resolved, ext_dir)
-        for name in names:
-            if name:
-                imports[name] = rel
-
-    # import Foo from './path.js'  (default import)
-    for m in re.finditer(
-        r'import\s+(\w+)\s+from\s+[\'"](\.[^"\']+)[\'"]', content
-    ):
-        name = m.group(1)
-        import_path = m.group(2)
-        resolved = os.path.normpath(os.path.join(file_dir, import_path))
-        rel = os.path.relpath(resolved, ext_dir)
-        imports[name] = rel
-
-    # import * as Foo from './path.js'
-    for m in re.finditer(
-        r'import\s+\*\s+as\s+(\w+)\s+from\s+[\'"](\.[^"\']+)[\'"]', content
-    ):
-        name = m.group(1)
-        import_path = m.group(2)
-        resolved = os.path.normpath(os.path.join(file_dir, import_path))
-        rel = os.path.relpath(resolved, ext_dir)
-        imports[name] = rel
-
-    return imports
-
-
 # ---------------------------------------------------------------------------
 # Method extraction
 # ---------------------------------------------------------------------------
 
-def find_method_body(content, method_name):
-    """Find the body of a method by name, handling brace nesting.
+def find_method_body(src, method_name):
+    """Find the body of a method by name in a tokenized file.
 
-    Returns (start_line, end_line, body_text) or None.
+    Returns (start_line, end_line, body_text) or None; body_text has
+    comments blanked.
     """
     # Match method_name() { ... } — handles class method syntax
     pattern = re.compile(
         r'(?:^|\s)' + re.escape(method_name) + r'\s*\([^)]*\)\s*\{',
         re.MULTILINE
     )
-    m = pattern.search(content)
+    m = pattern.search(src.masked)
     if not m:
         return None
 
-    # Find the opening brace
-    brace_pos = content.index('{', m.start())
-    depth = 1
-    pos = brace_pos + 1
-    while pos < len(content) and depth > 0:
-        if content[pos] == '{':
-            depth += 1
-        elif content[pos] == '}':
-            depth -= 1
-        pos += 1
-
-    body = content[brace_pos + 1:pos - 1]
+    # The tokenizer pairs the braces, skipping any inside literals
+    brace_pos = m.end() - 1
+    end = src.match(brace_pos)
+    if end is None:
+        end = len(src.code)
 
-    # Calculate line numbers
-    start_line = content[:brace_pos].count('\n') + 1
-    end_line = content[:pos].count('\n') + 1
-
-    return start_line, end_line, body
+    body = src.code[brace_pos + 1:end]
+    return src.line_of(brace_pos), src.line_of(end), body
 
 
 # ---------------------------------------------------------------------------
@@ -236,10 +226,58 @@ def extract_destroy_ref(line):
 # Scan a single file
 # ---------------------------------------------------------------------------
 
-def scan_file(file_path, ext_dir):
-    """Scan a JS file and return creates, destroys, instantiates, imports, and method info."""
-    raw_content = read_file(file_path)
-    content = strip_comments(raw_content)
+INSTANTIATE_RE = re.compile(r'(this[._]\w+)\s*=\s*new\s+(\w+)\s*\(')
+REF_DESTROY_RE = re.compile(r'(this[._]\w+)\??\.destroy\s*\(')
+CHILD_ADD_RE = re.compile(
+    r'\.(?:add_child|insert_child_below|insert_child_above|'
+    r'insert_child_at_index|set_child|add_actor)\s*\(\s*(this[._]\w+)'
+)
+PRIVATE_DESTROY_RE = re.compile(
+    r'(?:^|\s)_destroy\w*\s*\([^)]*\)\s*\{', re.MULTILINE
+)
+NULL_ASSIGN_RE = re.compile(r'(this[._]\w+)\s*=\s*null')
+
+
+def scan_file(file_path, ext_dir, cache_dir=None, import_graph=None):
+    """Scan a JS file and return creates, destroys, instantiates, imports, and method info.
+
+    With a cache_dir, a previous scan of identical content is reused instead
+    of rescanning. Pass one ImportGraph for all files of an extension so
+    import specifiers are resolved once.
+    """
+    if import_graph is None:
+        import_graph = ImportGraph(ext_dir)
+    try:
+        data = extfs.read_bytes(file_path)
+    except extfs.MemberError:
+        data = b''  # scanned as empty, as extfs.read_text() reads it
+    rel = os.path.relpath(file_path, ext_dir)
+
+    cache_path = None
+    if cache_dir:
+        cache_path = scan_cache_path(cache_dir, rel, data)
+        scan = load_cached_scan(cache_path, rel, import_graph)
+        if scan is not None:
+            cache.touch(cache_path)
+            return scan
+
+    scan = scan_content(data.decode('utf-8', errors='replace'), file_path, ext_dir,
+                        import_graph)
+    if cache_path:
+        store_cached_scan(cache_path, scan)
+    return scan
+
+
+def scan_content(raw_content, file_path, ext_dir, import_graph=None):
+    """Scan the contents of one JS file.
+
+    The tokenized file is only held for the duration of the scan;
+    what orphan detection needs from it (cleanup method spans and the refs
+    nulled inside them) is extracted here.
+    """
+    # Not the shared jstokens cache: nothing from one file is kept past its scan
+    src = JSSource(raw_content)
+    content = src.code
     lines = content.splitlines()
     rel = os.path.relpath(file_path, ext_dir)
 
@@ -247,7 +285,12 @@ def scan_file(file_path, ext_dir):
     destroys = []
     instantiates = []
 
-    imports = parse_imports(raw_content, file_path, ext_dir)
+    if import_graph is None:
+        import_graph = ImportGraph(ext_dir)
+    import_specs = import_graph.binding_specs(rel, raw_content)
+
+    # First .destroy() line per ref, for matching instantiations below
+    destroy_lines = {}
 
     for lineno, line in enumerate(lines, 1):
         stripped = line.strip()
@@ -258,90 +301,144 @@ def scan_file(file_path, ext_dir):
         for rtype, patterns in CREATE_PATTERNS.items():
             for pat in patterns:
                 if pat.search(stripped):
-                    creates.append({
-                        'line': lineno,
-                        'type': rtype,
-                        'pattern': stripped[:120],
-                        'stored_as': extract_stored_ref(stripped),
-                    })
+                    creates.append(CreateEvent(
+                        lineno, rtype, stripped[:120],
+                        _intern(extract_stored_ref(stripped))))
                     break  # one match per type per line
 
         # Detect resource destroys
         for rtype, patterns in DESTROY_PATTERNS.items():
             for pat in patterns:
                 if pat.search(stripped):
-                    destroys.append({
-                        'line': lineno,
-                        'type': rtype,
-                        'pattern': stripped[:120],
-                        'ref': extract_destroy_ref(stripped),
-                    })
+                    destroys.append(DestroyEvent(
+                        lineno, rtype, stripped[:120],
+                        _intern(extract_destroy_ref(stripped))))
                     break
 
         # Detect instantiations: this._foo = new ClassName(...)
-        inst_match = re.search(
-            r'(this[._]\w+)\s*=\s*new\s+(\w+)\s*\(', stripped
-        )
+        inst_match = INSTANTIATE_RE.search(stripped)
         if inst_match:
-            ref = inst_match.group(1)
-            cls = inst_match.group(2)
-            instantiates.append({
-                'line': lineno,
-                'type': 'object',
-                'class': cls,
-                'stored_as': ref,
-                'has_destroy_call': False,
-                'destroy_line': None,
-            })
+            instantiates.append((lineno, _intern(inst_match.group(1)),
+                                 _intern(inst_match.group(2))))
+
+        for m in REF_DESTROY_RE.finditer(line):
+            destroy_lines.setdefault(m.group(1), lineno)
 
     # Check if instantiated objects have .destroy() calls
-    for inst in instantiates:
-        ref = inst['stored_as']
-        if not ref:
-            continue
-        # Look for ref.destroy() or ref?.destroy()
-        destroy_pat = re.compile(
-            re.escape(ref) + r'\??\.destroy\s*\('
-        )
-        for lineno, line in enumerate(lines, 1):
-            if destroy_pat.search(line):
-                inst['has_destroy_call'] = True
-                inst['destroy_line'] = lineno
-                break
+    instantiates = [
+        InstantiateEvent(lineno, 'object', cls, ref,
+                         ref in destroy_lines, destroy_lines.get(ref))
+        for lineno, ref, cls in instantiates
+    ]
 
     # Track widget refs that are added as children (auto-cleanup on parent destroy)
     child_refs = set()
-    child_add_pat = re.compile(
-        r'\.(?:add_child|insert_child_below|insert_child_above|'
-        r'insert_child_at_index|set_child|add_actor)\s*\(\s*(this[._]\w+)'
-    )
     for line in lines:
-        m = child_add_pat.search(line.strip())
+        m = CHILD_ADD_RE.search(line.strip())
         if m:
-            child_refs.add(m.group(1))
+            child_refs.add(_intern(m.group(1)))
+
+    # Index cleanup method spans and the refs they release with `= null`
+    method_spans = {}
+    nulled_refs = set()
+    for method_name in CLEANUP_METHODS:
+        mb = find_method_body(src, method_name)
+        if mb:
+            start_line, end_line, body = mb
+            method_spans[method_name] = (start_line, end_line)
+            for m in NULL_ASSIGN_RE.finditer(body):
+                nulled_refs.add(_intern(m.group(1)))
 
-    # Detect if file has a destroy() or disable() method
-    has_destroy = find_method_body(content, 'destroy') is not None
-    has_disable = find_method_body(content, 'disable') is not None
     # Also detect _destroyPowerManager-style private destroy methods
-    has_private_destroy = bool(re.search(
-        r'(?:^|\s)_destroy\w*\s*\([^)]*\)\s*\{', content, re.MULTILINE
-    ))
+    has_private_destroy = bool(PRIVATE_DESTROY_RE.search(content))
 
     return {
         'rel': rel,
         'creates': creates,
         'destroys': destroys,
         'instantiates': instantiates,
-        'imports': imports,
-        'has_destroy': has_destroy,
-        'has_disable': has_disable,
+        'imports': {name: import_graph.resolve(rel, spec)
+                    for name, spec in import_specs.items()},
+        'import_specs': import_specs,
+        'has_destroy': 'destroy' in method_spans,
+        'has_disable': 'disable' in method_spans,
         'has_private_destroy': has_private_destroy,
         'child_refs': child_refs,
-        'content': content,
+        'method_spans': method_spans,
+        'nulled_refs': nulled_refs,
     }
 
 
+# ---------------------------------------------------------------------------
+# Scan cache
+# ---------------------------------------------------------------------------
+
+# Bump when scan_content() output changes so stale entries are never reused
+SCAN_CACHE_VERSION = 3
+# Every new version of every scanned file adds an entry; the least recently
+# used go past this many (a few KB each)
+MAX_SCAN_ENTRIES = 8192
+
+
+def scan_cache_path(cache_dir, rel, data):
+    """Cache file for a scan of `data` at `rel`.
+
+    The relative path is part of the key because the recorded `rel` depends
+    on where the file lives. Imports are cached as specifiers and resolved on
+    load, since resolution also depends on which other files exist.
+    """
+    h = hashlib.sha256(f'{SCAN_CACHE_VERSION}\0{rel}\0'.encode())
+    h.update(data)
+    return cache.entry_path(cache_dir, 'resource-scan', h.hexdigest())
+
+
+def load_cached_scan(cache_path, rel, import_graph):
+    """Load a cached scan, or return None on a miss or unreadable entry."""
+    try:
+        with open(cache_path, encoding='utf-8') as f:
+            cached = json.load(f)
+        return {
+            'rel': rel,
+            'creates': [CreateEvent(line, _intern(rtype), pattern, _intern(ref))
+                        for line, rtype, pattern, ref in cached['creates']],
+            'destroys': [DestroyEvent(line, _intern(rtype), pattern, _intern(ref))
+                         for line, rtype, pattern, ref in cached['destroys']],
+            'instantiates': [
+                InstantiateEvent(line, _intern(rtype), _intern(cls), _intern(ref),
+                                 has_destroy, destroy_line)
+                for line, rtype, cls, ref, has_destroy, destroy_line
+                in cached['instantiates']],
+            'imports': {name: import_graph.resolve(rel, spec)
+                        for name, spec in cached['import_specs'].items()},
+            'import_specs': cached['import_specs'],
+            'has_destroy': 'destroy' in cached['method_spans'],
+            'has_disable': 'disable' in cached['method_spans'],
+            'has_private_destroy': cached['has_private_destroy'],
+            'child_refs': {_intern(r) for r in cached['child_refs']},
+            'method_spans': {name: tuple(span)
+                             for name, span in cached['method_spans'].items()},
+            'nulled_refs': {_intern(r) for r in cached['nulled_refs']},
+        }
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def store_cached_scan(cache_path, scan):
+    """Persist a scan and prune old ones; failures are ignored."""
+    cached = {
+        'creates': scan['creates'],
+        'destroys': scan['destroys'],
+        'instantiates': scan['instantiates'],
+        'import_specs': scan['import_specs'],
+        'has_private_destroy': scan['has_private_destroy'],
+        'child_refs': sorted(scan['child_refs']),
+        'method_spans': scan['method_spans'],
+        'nulled_refs': sorted(scan['nulled_refs']),
+    }
+    cache.store_json(cache_path, cached)
+    cache.prune_fanout(cache_path, MAX_SCAN_ENTRIES)
+
+
 # ---------------------------------------------------------------------------
 # Ownership graph building
 # ---------------------------------------------------------------------------
@@ -365,16 +462,16 @@ def build_ownership(file_scans, ext_dir):
     for rel, scan in file_scans.items():
         file_ownership = {}
         for inst in scan['instantiates']:
-            ref = inst['stored_as']
-            cls = inst['class']
+            ref = inst.stored_as
+            cls = inst.cls
             if not ref:
                 continue
             source_file = global_import_map.get(cls)
             file_ownership[ref] = {
                 'class': cls,
                 'source_file': source_file,
-                'created_line': inst['line'],
-                'destroyed_line': inst['destroy_line'],
+                'created_line': inst.line,
+                'destroyed_line': inst.destroy_line,
             }
         if file_ownership:
             ownership[rel] = file_ownership
@@ -470,9 +567,9 @@ def detect_orphans(file_scans, ownership):
         destroy_refs = set()
         destroy_types = set()
         for d in destroys:
-            if d.get('ref'):
-                destroy_refs.add(d['ref'])
-            destroy_types.add(d['type'])
+            if d.ref:
+                destroy_refs.add(d.ref)
+            destroy_types.add(d.type)
 
         # Check if parent calls destroy on this object
         parent_rel = parent_of.get(rel)
@@ -489,9 +586,9 @@ def detect_orphans(file_scans, ownership):
             for c in creates:
                 orphans.append({
                     'file': rel,
-                    'line': c['line'],
-                    'type': c['type'],
-                    'pattern': c['pattern'],
+                    'line': c.line,
+                    'type': c.type,
+                    'pattern': c.pattern,
                     'reason': f"no destroy()/disable() method in {rel}",
                 })
             continue
@@ -501,9 +598,9 @@ def detect_orphans(file_scans, ownership):
             for c in creates:
                 orphans.append({
                     'file': rel,
-                    'line': c['line'],
-                    'type': c['type'],
-                    'pattern': c['pattern'],
+                    'line': c.line,
+                    'type': c.type,
+                    'pattern': c.pattern,
                     'reason': f"parent does not call destroy() on {rel}",
                 })
             continue
@@ -511,48 +608,34 @@ def detect_orphans(file_scans, ownership):
         # Refs that are added as widget children (auto-cleanup by parent widget)
         child_refs = scan.get('child_refs', set())
 
-        # Also check if refs are set to null in cleanup methods — a form of
-        # releasing references even when the resource auto-cleans itself
-        nulled_refs = set()
-        content = scan['content']
-        for method_name in ('destroy', 'disable', '_destroy'):
-            mb = find_method_body(content, method_name)
-            if mb:
-                _, _, body = mb
-                for m in re.finditer(r'(this[._]\w+)\s*=\s*null', body):
-                    nulled_refs.add(m.group(1))
+        # Refs set to null in cleanup methods — a form of releasing
+        # references even when the resource auto-cleans itself
+        nulled_refs = scan['nulled_refs']
+
+        # All ref-bearing destroy lines joined once, so the sub-ref match below
+        # is one substring search per create instead of a loop over destroys
+        destroy_text = '\n'.join(d.pattern for d in destroys if d.ref)
 
         # Case 3: Module has destroy() which is called, but specific resources
         # are not cleaned up. Match by stored_as ref.
         for c in creates:
-            stored = c.get('stored_as')
+            stored = c.stored_as
             if not stored:
                 # Resource not stored — can't track, skip (no false positive)
                 continue
 
             # Skip widgets added as children — auto-destroyed by parent widget
-            if c['type'] == 'widget' and stored in child_refs:
+            if c.type == 'widget' and stored in child_refs:
                 continue
 
             # Skip dbus makeProxyWrapper — creates a class, not an instance
-            if c['type'] == 'dbus' and 'makeProxyWrapper' in c.get('pattern', ''):
+            if c.type == 'dbus' and 'makeProxyWrapper' in c.pattern:
                 continue
 
-            # Check if there's a matching destroy for this ref
-            matched = False
-            for d in destroys:
-                d_ref = d.get('ref')
-                if not d_ref:
-                    continue
-                # Direct match: this._foo used in both create and destroy
-                if d_ref == stored:
-                    matched = True
-                    break
-                # Stored ref is a sub-ref (e.g., stored this._handlerId,
-                # destroy uses something.disconnect(this._handlerId))
-                if stored in d.get('pattern', ''):
-                    matched = True
-                    break
+            # Direct match: this._foo used in both create and destroy.
+            # Sub-ref match: stored this._handlerId, destroy uses
+            # something.disconnect(this._handlerId)
+            matched = stored in destroy_refs or stored in destroy_text
 
             # Also count as matched if ref is nulled in cleanup method
             if not matched and stored in nulled_refs:
@@ -561,9 +644,9 @@ def detect_orphans(file_scans, ownership):
             if not matched:
                 orphans.append({
                     'file': rel,
-                    'line': c['line'],
-                    'type': c['type'],
-                    'pattern': c['pattern'],
+                    'line': c.line,
+                    'type': c.type,
+                    'pattern': c.pattern,
                     'reason': f"{stored} created but not cleaned up in destroy()",
                 })
 
@@ -574,9 +657,21 @@ def detect_orphans(file_scans, ownership):
 # Main
 # ---------------------------------------------------------------------------
 
-def build_resource_graph(ext_dir):
-    """Build the complete resource graph for an extension directory."""
+def build_resource_graph(ext_dir, cache_dir=None):
+    """Build the complete resource graph for an extension directory.
+
+    With a cache_dir, unchanged files are loaded from the scan cache and only
+    the ownership graph and orphans are recomputed. The finished graph is
+    also saved as the snapshot that queries read.
+    """
     js_files = find_js_files(ext_dir, exclude_prefs=True)
+    graph = _build_graph(ext_dir, js_files, cache_dir)
+    if cache_dir:
+        save_graph_snapshot(cache_dir, ext_dir, js_files, graph)
+    return graph
+
+
+def _build_graph(ext_dir, js_files, cache_dir):
     if not js_files:
         return {
             'files': {},
@@ -593,9 +688,10 @@ def build_resource_graph(ext_dir):
 
     # Scan all files
     file_scans = {}
+    import_graph = ImportGraph(ext_dir)
     for fp in js_files:
         rel = os.path.relpath(fp, ext_dir)
-        file_scans[rel] = scan_file(fp, ext_dir)
+        file_scans[rel] = scan_file(fp, ext_dir, cache_dir, import_graph)
 
     # Build ownership
     ownership, _ = build_ownership(file_scans, ext_dir)
@@ -634,18 +730,345 @@ def build_resource_graph(ext_dir):
     }
 
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: build-resource-graph.py EXTENSION_DIR", file=sys.stderr)
+def write_graph_json(graph, out, indent=2):
+    """Write the graph as JSON, converting event records file by file.
+
+    Produces the same document as json.dumps(graph, indent=indent) would for
+    the dict form, without materializing a dict per event for the whole graph.
+    indent=None selects compact output, which uses the C encoder and is much
+    faster on large graphs.
+    """
+    if indent is None:
+        out.write('{"files": {')
+        for i, (rel, events) in enumerate(graph['files'].items()):
+            entry = {key: [event_to_dict(e) for e in records]
+                     for key, records in events.items()}
+            out.write(f'{", " if i else ""}{json.dumps(rel)}: {json.dumps(entry)}')
+        out.write('}')
+        for key in ('ownership', 'orphans', 'summary'):
+            out.write(f', "{key}": {json.dumps(graph[key])}')
+        out.write('}\n')
+        return
+
+    out.write('{\n  "files": {')
+    for i, (rel, events) in enumerate(graph['files'].items()):
+        entry = {key: [event_to_dict(e) for e in records]
+                 for key, records in events.items()}
+        body = json.dumps(entry, indent=2).replace('\n', '\n    ')
+        out.write(f'{"," if i else ""}\n    {json.dumps(rel)}: {body}')
+    out.write('\n  }' if graph['files'] else '}')
+    for key in ('ownership', 'orphans', 'summary'):
+        body = json.dumps(graph[key], indent=2).replace('\n', '\n  ')
+        out.write(f',\n  "{key}": {body}')
+    out.write('\n}\n')
+
+
+# ---------------------------------------------------------------------------
+# Graph snapshots
+# ---------------------------------------------------------------------------
+
+GRAPH_SNAPSHOT_VERSION = 1
+
+# Snapshots are keyed by directory, not content, so each newly linted
+# directory adds one; --corpus runs over hundreds. Older ones are pruned.
+MAX_GRAPH_SNAPSHOTS = 64
+
+
+def _snapshot_path(cache_dir, ext_dir):
+    digest = hashlib.sha256(ext_dir.encode()).hexdigest()[:32]
+    return os.path.join(cache_dir, 'resource-graph', digest + '.json')
+
+
+def _fingerprint(ext_dir, js_files):
+    """Size and mtime of every scanned file — a stat-only change check."""
+    fingerprint = {}
+    for fp in js_files:
+        fingerprint[os.path.relpath(fp, ext_dir)] = list(extfs.stat_key(fp))
+    return fingerprint
+
+
+def save_graph_snapshot(cache_dir, ext_dir, js_files, graph):
+    """Save the graph for later queries and prune old snapshots; failures are ignored."""
+    path = _snapshot_path(cache_dir, ext_dir)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        fingerprint = _fingerprint(ext_dir, js_files)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(f'{{"version": {GRAPH_SNAPSHOT_VERSION}, '
+                    f'"fingerprint": {json.dumps(fingerprint)}, "graph": ')
+            write_graph_json(graph, f, indent=None)
+            f.write('}\n')
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        return
+    cache.prune(os.path.dirname(path), MAX_GRAPH_SNAPSHOTS)
+
+
+def load_graph_snapshot(cache_dir, ext_dir):
+    """Return the saved graph if no JS file changed since it was built."""
+    path = _snapshot_path(cache_dir, ext_dir)
+    try:
+        with open(path, encoding='utf-8') as f:
+            snapshot = json.load(f)
+        if snapshot.get('version') != GRAPH_SNAPSHOT_VERSION:
+            return None
+        js_files = find_js_files(ext_dir, exclude_prefs=True)
+        if snapshot['fingerprint'] != _fingerprint(ext_dir, js_files):
+            return None
+        graph = snapshot['graph']
+    except (OSError, ValueError, KeyError):
+        return None
+    cache.touch(path)
+    return graph
+
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+def _file_events(graph, rel, key):
+    """Events of one kind for a file as dicts, from records or a loaded graph."""
+    return [event_to_dict(e) if isinstance(e, tuple) else e
+            for e in graph['files'].get(rel, {}).get(key, [])]
+
+
+def _orphan_sites(graph):
+    return {(o['file'], o['line'], o['type']): o['reason'] for o in graph['orphans']}
+
+
+def _ownership_edges(graph):
+    """Yield (owner_file, ref, info) for every instantiation of a scanned module."""
+    for rel, refs in graph['ownership'].items():
+        for ref, info in refs.items():
+            if info.get('source_file') in graph['files']:
+                yield rel, ref, info
+
+
+def write_graph_dot(graph, out):
+    """Stream the graph as Graphviz DOT: modules, their resources, ownership."""
+    orphans = _orphan_sites(graph)
+    out.write('digraph resources {\n'
+              '  rankdir=LR;\n'
+              '  node [fontname="monospace", fontsize=10];\n')
+    for rel in graph['files']:
+        out.write(f'  {json.dumps(rel)} [shape=box, style=bold];\n')
+        for c in _file_events(graph, rel, 'creates'):
+            node = json.dumps(f"{rel}:{c['line']}:{c['type']}")
+            label = json.dumps(f"{c['type']} {c['stored_as'] or ''}\nline {c['line']}")
+            orphan = (rel, c['line'], c['type']) in orphans
+            color = ', color=red, fontcolor=red' if orphan else ''
+            out.write(f'  {node} [shape=ellipse, label={label}{color}];\n'
+                      f'  {json.dumps(rel)} -> {node} [arrowhead=none];\n')
+    for rel, ref, info in _ownership_edges(graph):
+        style = '' if info.get('destroyed_line') is not None else ', style=dashed'
+        out.write(f"  {json.dumps(rel)} -> {json.dumps(info['source_file'])} "
+                  f"[label={json.dumps(ref)}{style}];\n")
+    out.write('}\n')
+
+
+def write_graph_graphml(graph, out):
+    """Stream the graph as GraphML with the same nodes and edges as the DOT export."""
+    orphans = _orphan_sites(graph)
+    out.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+              '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n')
+    for key, domain, attr_type in (
+            ('kind', 'node', 'string'), ('label', 'node', 'string'),
+            ('line', 'node', 'int'), ('rtype', 'node', 'string'),
+            ('orphan', 'node', 'boolean'), ('reason', 'node', 'string'),
+            ('edge_kind', 'edge', 'string'), ('ref', 'edge', 'string'),
+            ('destroyed', 'edge', 'boolean')):
+        out.write(f'  <key id="{key}" for="{domain}" attr.name="{key}" '
+                  f'attr.type="{attr_type}"/>\n')
+    out.write('  <graph id="resources" edgedefault="directed">\n')
+
+    def data(key, value):
+        return f'<data key="{key}">{escape(str(value))}</data>'
+
+    edge_id = 0
+    for rel in graph['files']:
+        out.write(f'    <node id={quoteattr(rel)}>{data("kind", "module")}'
+                  f'{data("label", rel)}</node>\n')
+        for c in _file_events(graph, rel, 'creates'):
+            node = f"{rel}:{c['line']}:{c['type']}"
+            reason = orphans.get((rel, c['line'], c['type']))
+            out.write(f'    <node id={quoteattr(node)}>{data("kind", "resource")}'
+                      f'{data("label", c["stored_as"] or c["pattern"])}'
+                      f'{data("line", c["line"])}{data("rtype", c["type"])}'
+                      f'{data("orphan", "true" if reason else "false")}'
+                      + (data('reason', reason) if reason else '') + '</node>\n')
+            out.write(f'    <edge id="e{edge_id}" source={quoteattr(rel)} '
+                      f'target={quoteattr(node)}>{data("edge_kind", "creates")}</edge>\n')
+            edge_id += 1
+    for rel, ref, info in _ownership_edges(graph):
+        destroyed = 'true' if info.get('destroyed_line') is not None else 'false'
+        out.write(f'    <edge id="e{edge_id}" source={quoteattr(rel)} '
+                  f'target={quoteattr(info["source_file"])}>'
+                  f'{data("edge_kind", "owns")}{data("ref", ref)}'
+                  f'{data("destroyed", destroyed)}</edge>\n')
+        edge_id += 1
+    out.write('  </graph>\n</graphml>\n')
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+def query_file(graph, rel):
+    """Describe every resource created in `rel` and where it is cleaned up.
+
+    Returns a list of output lines.
+    """
+    if rel not in graph['files']:
+        return [f"{rel}: not in resource graph (not scanned or excluded)"]
+
+    destroys = _file_events(graph, rel, 'destroys')
+    orphans = _orphan_sites(graph)
+    lines = []
+    for c in _file_events(graph, rel, 'creates'):
+        stored = c['stored_as']
+        lines.append(f"{rel}:{c['line']} {c['type']} {stored or '(not stored)'}")
+        # Same matching as detect_orphans(): direct ref or sub-ref in the line
+        sites = [d for d in destroys
+                 if stored and d['ref'] and (d['ref'] == stored or stored in d['pattern'])]
+        for d in sites:
+            lines.append(f"    destroyed at {rel}:{d['line']}: {d['pattern']}")
+        reason = orphans.get((rel, c['line'], c['type']))
+        if reason:
+            lines.append(f"    ORPHAN: {reason}")
+        elif not sites:
+            lines.append("    no matching destroy in this file")
+
+    owners = [(owner, ref, info) for owner, ref, info in _ownership_edges(graph)
+              if info['source_file'] == rel]
+    for owner, ref, info in owners:
+        if info.get('destroyed_line') is not None:
+            lines.append(f"owned by {owner}:{info['created_line']} as {ref}, "
+                         f"destroyed at {owner}:{info['destroyed_line']}")
+        else:
+            lines.append(f"owned by {owner}:{info['created_line']} as {ref}, "
+                         f"never destroyed by owner")
+    if not lines:
+        lines.append(f"{rel}: no tracked resources")
+    return lines
+
+
+def query_path(graph, source, target):
+    """Find the ownership path from module `source` to `target`.
+
+    `target` may be a module path or an instantiated class name. Returns a
+    list of output lines.
+    """
+    children = {}
+    classes = {}
+    for owner, ref, info in _ownership_edges(graph):
+        children.setdefault(owner, []).append((ref, info))
+        classes.setdefault(info['class'], info['source_file'])
+    target_file = target if target in graph['files'] else classes.get(target)
+    if source not in graph['files']:
+        return [f"{source}: not in resource graph"]
+    if target_file is None:
+        return [f"{target}: no scanned module or instantiated class by that name"]
+
+    # BFS keeps the first (shortest) edge into each module
+    came_from = {source: None}
+    queue = deque([source])
+    while queue:
+        node = queue.popleft()
+        if node == target_file:
+            break
+        for ref, info in children.get(node, []):
+            child = info['source_file']
+            if child not in came_from:
+                came_from[child] = (node, ref, info)
+                queue.append(child)
+
+    if target_file not in came_from:
+        return [f"no ownership path from {source} to {target_file}"]
+
+    hops = []
+    node = target_file
+    while came_from[node] is not None:
+        owner, ref, info = came_from[node]
+        hops.append((owner, ref, info, node))
+        node = owner
+    lines = [source]
+    for owner, ref, info, child in reversed(hops):
+        destroyed = (f"destroyed at line {info['destroyed_line']}"
+                     if info.get('destroyed_line') is not None else "never destroyed")
+        lines.append(f"  -> {child} via {ref} = new {info['class']}() "
+                     f"({owner}:{info['created_line']}, {destroyed})")
+    return lines
+
+
+def query_main(argv):
+    parser = argparse.ArgumentParser(
+        prog='build-resource-graph.py query',
+        description='Inspect a resource chain using the cached graph.')
+    parser.add_argument('ext_dir', metavar='EXTENSION_DIR')
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('--file', metavar='REL_PATH',
+                       help='resources created in this module and their cleanup')
+    group.add_argument('--path', nargs=2, metavar=('FROM', 'TO'),
+                       help='ownership path between two modules (TO may be a class)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='rebuild the graph without reading or writing the cache')
+    args = parser.parse_args(argv)
+
+    ext_dir = os.path.realpath(args.ext_dir)
+    if not extfs.isdir(ext_dir):
+        print(f"Error: {ext_dir} is not a directory", file=sys.stderr)
         sys.exit(1)
 
-    ext_dir = os.path.realpath(sys.argv[1])
-    if not os.path.isdir(ext_dir):
+    cache_dir = None if args.no_cache else default_cache_dir()
+    graph = load_graph_snapshot(cache_dir, ext_dir) if cache_dir else None
+    if graph is None:
+        graph = build_resource_graph(ext_dir, cache_dir)
+
+    if args.file:
+        lines = query_file(graph, os.path.normpath(args.file))
+    else:
+        source, target = args.path
+        if target.endswith('.js'):
+            target = os.path.normpath(target)
+        lines = query_path(graph, os.path.normpath(source), target)
+    print('\n'.join(lines))
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == 'query':
+        query_main(sys.argv[2:])
+        return
+
+    parser = argparse.ArgumentParser(
+        prog='build-resource-graph.py',
+        description='Build the cross-file resource graph for an extension.')
+    parser.add_argument('ext_dir', metavar='EXTENSION_DIR')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='do not read or write the on-disk scan cache')
+    parser.add_argument('--compact', action='store_true',
+                        help='compact JSON output (faster on large graphs)')
+    parser.add_argument('--format', choices=('json', 'dot', 'graphml'),
+                        default='json', help='output format (default: json)')
+    args = parser.parse_args()
+
+    ext_dir = os.path.realpath(args.ext_dir)
+    if not extfs.isdir(ext_dir):
         print(f"Error: {ext_dir} is not a directory", file=sys.stderr)
         sys.exit(1)
 
-    graph = build_resource_graph(ext_dir)
-    print(json.dumps(graph, indent=2))
+    cache_dir = None if args.no_cache else default_cache_dir()
+    graph = build_resource_graph(ext_dir, cache_dir)
+    if args.format == 'dot':
+        write_graph_dot(graph, sys.stdout)
+    elif args.format == 'graphml':
+        write_graph_graphml(graph, sys.stdout)
+    else:
+        write_graph_json(graph, sys.stdout, indent=None if args.compact else 2)
 
 
 if __name__ == '__main__':
@@ -14,6 +14,8 @@ import os
 import re
 import sys
 
+from ego_lint import extfs, jstokens, lifecycle
+
 
 def result(status, check, detail):
     print(f"{status}|{check}|{detail}")
@@ -23,7 +25,7 @@ def find_js_files(ext_dir, exclude_prefs=True):
     """Find JS files, optionally excluding prefs.js."""
     skip_dirs = {'node_modules', '.git', '__pycache__'}
     files = []
-    for root, dirs, filenames in os.walk(ext_dir):
+    for root, dirs, filenames in extfs.walk(ext_dir):
         dirs[:] = [d for d in dirs if d not in skip_dirs]
         for name in filenames:
             if name.endswith('.js'):
@@ -33,13 +35,6 @@ def find_js_files(ext_dir, exclude_prefs=True):
     return files
 
 
-def strip_comments(content):
-    """Remove single-line and block comments from JS content."""
-    content = re.sub(r'/\*.*?\*/', '', content, flags=re.DOTALL)
-    content = re.sub(r'//.*$', '', content, flags=re.MULTILINE)
-    return content
-
-
 def check_cancellable_usage(ext_dir, js_files):
     """WARN when Gio async calls exist but Gio.Cancellable is not used."""
     has_gio_async = False
@@ -58,17 +53,15 @@ def check_cancellable_usage(ext_dir, js_files):
 
     for filepath in js_files:
         rel = os.path.relpath(filepath, ext_dir)
-        with open(filepath, encoding='utf-8', errors='replace') as f:
-            content = f.read()
-
-        clean = strip_comments(content)
+        src = jstokens.load(filepath)
+        code = src.masked
 
-        if 'Gio.Cancellable' in clean or 'new Gio.Cancellable' in clean:
+        if 'Gio.Cancellable' in code or 'new Gio.Cancellable' in code:
             has_cancellable = True
 
         for pat in gio_async_patterns:
-            for m in re.finditer(pat, clean):
-                lineno = clean[:m.start()].count('\n') + 1
+            for m in re.finditer(pat, code):
+                lineno = src.line_of(m.start())
                 has_gio_async = True
                 async_locations.append(f"{rel}:{lineno}")
 
@@ -95,9 +88,10 @@ def check_async_inline_cancellable(ext_dir, js_files):
 
     for filepath in js_files:
         rel = os.path.relpath(filepath, ext_dir)
-        with open(filepath, encoding='utf-8', errors='replace') as f:
-            content = f.read()
-            lines = content.splitlines(True)
+        src = jstokens.load(filepath)
+        content = src.text
+        lines = content.splitlines(True)
+        masked_lines = src.masked.splitlines(True)
 
         # If file uses _destroyed pattern, it has an alternative async safety
         # mechanism — suppress missing-cancellable warnings for this file
@@ -109,7 +103,7 @@ def check_async_inline_cancellable(ext_dir, js_files):
         scope_depth = 0
         scope_start_depth = -1
 
-        for lineno, line in enumerate(lines, 1):
+        for lineno, (line, masked) in enumerate(zip(lines, masked_lines), 1):
             stripped = line.lstrip()
             if stripped.startswith('//') or stripped.startswith('*'):
                 continue
@@ -124,8 +118,8 @@ def check_async_inline_cancellable(ext_dir, js_files):
                     has_cancellable_param = True
                     scope_start_depth = scope_depth
 
-            # Track brace depth
-            scope_depth += line.count('{') - line.count('}')
+            # Track brace depth (braces in strings and comments don't count)
+            scope_depth += masked.count('{') - masked.count('}')
 
             # Reset cancellable param flag when exiting the function scope
             if has_cancellable_param and scope_depth <= scope_start_depth:
@@ -155,13 +149,11 @@ def check_async_inline_cancellable(ext_dir, js_files):
 def check_disable_cancellation(ext_dir, js_files):
     """WARN when extension uses async but disable() has no cancel/abort."""
     ext_js = os.path.join(ext_dir, 'extension.js')
-    if not os.path.isfile(ext_js):
+    if not extfs.isfile(ext_js):
         return
 
-    with open(ext_js, encoding='utf-8', errors='replace') as f:
-        content = f.read()
-
-    clean = strip_comments(content)
+    src = jstokens.load(ext_js)
+    clean = src.code
 
     # Check if extension uses async
     has_async = bool(re.search(r'\basync\b', clean)) and \
@@ -170,24 +162,13 @@ def check_disable_cancellation(ext_dir, js_files):
         return
 
     # Check if disable() contains cancel/abort
-    disable_match = re.search(r'\bdisable\s*\(\s*\)\s*\{', clean)
-    if not disable_match:
+    index = lifecycle.index(src)
+    disable = index.disable
+    if disable is None:
         return
 
-    # Extract disable body
-    start = disable_match.end()
-    depth = 1
-    pos = start
-    while pos < len(clean) and depth > 0:
-        if clean[pos] == '{':
-            depth += 1
-        elif clean[pos] == '}':
-            depth -= 1
-        pos += 1
-    disable_body = clean[start:pos - 1]
-
-    has_cancel = bool(re.search(r'\.(cancel|abort)\s*\(', disable_body))
-    has_destroyed = bool(re.search(r'_destroyed\s*=\s*true', disable_body))
+    has_cancel = any(callee.endswith(('.cancel', '.abort')) for callee, _ in disable.calls)
+    has_destroyed = bool(re.search(r'_destroyed\s*=\s*true', index.text(disable)))
 
     if not has_cancel and not has_destroyed:
         result("WARN", "async/disable-no-cancel",
@@ -209,10 +190,7 @@ def check_catch_on_sync(ext_dir, js_files):
 
     for filepath in js_files:
         rel = os.path.relpath(filepath, ext_dir)
-        with open(filepath, encoding='utf-8', errors='replace') as f:
-            content = f.read()
-
-        clean = strip_comments(content)
+        clean = jstokens.load(filepath).masked
         lines = clean.splitlines()
 
         # Build method registry: name -> is_async
@@ -6,14 +6,19 @@ Usage: check-css.py EXTENSION_DIR
 Checks:
   - Bare generic CSS class names without prefix/scope
   - !important usage
+  - Top-level overrides of GNOME Shell theme classes
+
+All checks run over stylesheet.css and, when present, stylesheet-dark.css
+and stylesheet-light.css, each tokenized once (ego_lint.csstokens).
 
 Output: PIPE-delimited lines: STATUS|check-name|detail
 """
 
 import os
-import re
 import sys
 
+from ego_lint import csstokens
+
 
 def result(status, check, detail):
     print(f"{status}|{check}|{detail}")
@@ -31,30 +36,27 @@ KNOWN_SHELL_CLASSES = {
 }
 
 
-def strip_css_comments(content):
-    """Remove CSS block comments."""
-    return re.sub(r'/\*.*?\*/', '', content, flags=re.DOTALL)
+def leading_classes(sheets):
+    """First class of each selector that starts with one, in source order.
+
+    `.my-ext .panel-button` yields my-ext: a class scoped by an ancestor
+    selector is not a top-level selector.
+    """
+    for sheet in sheets:
+        for rule in sheet.rules:
+            for selector in rule.selectors:
+                if selector.compounds[0].startswith('.') and selector.classes[0]:
+                    yield selector.classes[0][0]
 
 
-def check_unscoped_classes(ext_dir):
+def check_unscoped_classes(sheets):
     """WARN on bare generic CSS class names without prefix."""
-    css_path = os.path.join(ext_dir, 'stylesheet.css')
-    if not os.path.isfile(css_path):
+    if not sheets:
         result("SKIP", "css/scoping", "No stylesheet.css found")
         return
 
-    with open(css_path, encoding='utf-8', errors='replace') as f:
-        content = f.read()
-
-    content = strip_css_comments(content)
-
-    # Extract top-level class selectors (first class in a rule)
-    classes = set()
-    for m in re.finditer(r'^\s*\.([\w-]+)', content, re.MULTILINE):
-        classes.add(m.group(1))
-
     unscoped = []
-    for cls in sorted(classes):
+    for cls in sorted(set(leading_classes(sheets))):
         # "Scoped" means contains hyphen or underscore (namespace prefix)
         if '-' not in cls and '_' not in cls:
             # Skip known GNOME Shell theme classes
@@ -70,59 +72,44 @@ def check_unscoped_classes(ext_dir):
         result("PASS", "css/scoping", "CSS classes appear properly scoped")
 
 
-def check_important_usage(ext_dir):
-    """WARN on !important usage in stylesheet."""
-    css_path = os.path.join(ext_dir, 'stylesheet.css')
-    if not os.path.isfile(css_path):
+def check_important_usage(sheets):
+    """WARN on !important usage in stylesheets."""
+    if not sheets:
         return
 
-    with open(css_path, encoding='utf-8', errors='replace') as f:
-        content = f.read()
-
-    content = strip_css_comments(content)
-    count = len(re.findall(r'!important', content))
+    count = 0
+    names = []
+    for sheet in sheets:
+        important = sum(decl.important for rule in sheet.rules for decl in rule.declarations)
+        if important:
+            count += important
+            names.append(sheet.name)
 
     if count > 0:
         result("WARN", "css/important",
-               f"Found {count} !important usage(s) in stylesheet.css — "
+               f"Found {count} !important usage(s) in {', '.join(names)} — "
                f"!important overrides Shell theme; prefer higher specificity")
     else:
         result("PASS", "css/important", "No !important usage")
 
 
-def check_shell_class_override(ext_dir):
+def check_shell_class_override(sheets):
     """WARN when a KNOWN_SHELL_CLASSES member appears as a top-level selector."""
-    css_path = os.path.join(ext_dir, 'stylesheet.css')
-    if not os.path.isfile(css_path):
+    if not sheets:
         result("SKIP", "css/shell-class-override", "No stylesheet.css found")
         return
 
-    with open(css_path, encoding='utf-8', errors='replace') as f:
-        content = f.read()
-
-    content = strip_css_comments(content)
-
+    # A top-level match: the selector starts with a known shell class, with
+    # no ancestor class/id/element selector that would scope it.
+    # e.g. ".panel-button { ..." or ".panel-button.foo { ..."
+    # but NOT ".my-extension .panel-button { ..."
     overrides = []
-    for line in content.splitlines():
-        stripped = line.strip()
-        if not stripped or stripped.startswith('}'):
-            continue
-        # A top-level match: the first class selector on the line is a known
-        # shell class (no preceding class/id/element selector that would scope it).
-        # e.g. ".panel-button { ..." or ".panel-button.foo { ..."
-        # but NOT ".my-extension .panel-button { ..."
-        m = re.match(r'^\.([\w-]+)', stripped)
-        if m:
-            cls = m.group(1)
-            if cls in KNOWN_SHELL_CLASSES:
-                overrides.append(cls)
+    for cls in leading_classes(sheets):
+        if cls in KNOWN_SHELL_CLASSES and cls not in overrides:
+            overrides.append(cls)
 
     if overrides:
-        seen = []
         for cls in overrides:
-            if cls not in seen:
-                seen.append(cls)
-        for cls in seen:
             result("FAIL", "css/shell-class-override",
                    f".{cls}: overrides GNOME Shell theme class "
                    f"— use a scoped selector (.my-extension .{cls})")
@@ -137,9 +124,11 @@ def main():
         sys.exit(1)
 
     ext_dir = os.path.realpath(sys.argv[1])
-    check_unscoped_classes(ext_dir)
-    check_important_usage(ext_dir)
-    check_shell_class_override(ext_dir)
+    # Each stylesheet is parsed once; every check reads the same rules
+    sheets = csstokens.load_stylesheets(ext_dir)
+    check_unscoped_classes(sheets)
+    check_important_usage(sheets)
+    check_shell_class_override(sheets)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""check-files.py — Whole-tree file checks for GNOME extensions.
+
+Usage: check-files.py EXTENSION_DIR
+
+Checks:
+  - extension.js and metadata.json present
+  - LICENSE or COPYING present, naming a GPL-compatible license
+  - console.log() calls outside comments
+  - Deprecated module imports (Mainloop, Lang, ByteArray)
+  - Binary files, by extension or ELF magic
+  - Non-GJS scripts, and whether a pkexec helper justifies them
+  - Shell scripts without execute permission
+  - Polkit policy/rules files
+  - Minified or bundled JavaScript
+
+Every check reads one pruned inventory of the tree (ego_lint.passes, which
+skips node_modules, .git and __pycache__), and each file is read only as far
+as its checks need: four bytes to sniff ELF magic, the bytes of the
+extension's own JS files once for every JS check. EXTENSION_DIR may be a zip
+(ego_lint.extfs).
+
+Output: PIPE-delimited lines: STATUS|check-name|detail
+"""
+
+import os
+import re
+import sys
+
+from ego_lint import extfs
+from ego_lint.passes import walk_files
+
+
+def result(status, check, detail):
+    print(f"{status}|{check}|{detail}")
+
+
+BINARY_EXTENSIONS = ('.so', '.o', '.a', '.exe', '.bin', '.dll', '.dylib', '.wasm')
+# Files whose type is known from the name, so never sniffed for ELF magic
+KNOWN_TEXT_EXTENSIONS = (
+    '.js', '.json', '.xml', '.css', '.mo', '.po', '.pot', '.md', '.txt',
+    '.yml', '.yaml', '.sh', '.py', '.svg', '.png', '.jpg', '.zip', '.ui',
+    '.policy', '.rules',
+)
+KNOWN_TEXT_NAMES = frozenset({'LICENSE', 'COPYING'})
+ELF_MAGIC = b'\x7fELF'
+SCRIPT_EXTENSIONS = ('.py', '.sh', '.rb', '.pl')
+POLKIT_EXTENSIONS = ('.policy', '.rules')
+
+LICENSE_NAMES = ('LICENSE', 'COPYING')
+GPL_COMPATIBLE_RE = re.compile(rb'GPL|LGPL|MIT|BSD|Apache|MPL|ISC|Artistic', re.IGNORECASE)
+
+CONSOLE_LOG_RE = re.compile(rb'console\.log\(')
+DEPRECATED_IMPORT_RE = re.compile(
+    rb"from ['\"]mainloop['\"]|from ['\"]bytearray['\"]|from ['\"]lang['\"]|"
+    rb"imports\.misc\.mainloop|imports\.lang|imports\.byteArray|"
+    rb"from ['\"]ByteArray['\"]|from ['\"]Lang['\"]|from ['\"]Mainloop['\"]")
+MAX_LINE_LENGTH = 500
+# Any line this long in bytes may be over MAX_LINE_LENGTH characters
+_LONG_LINE_RE = re.compile(rb'[^\n]{%d}' % (MAX_LINE_LENGTH + 1))
+
+
+class Inventory:
+    """Files of one extension, classified in a single walk."""
+
+    def __init__(self, ext_dir):
+        self.ext_dir = ext_dir
+        self.extension_js = []   # top-level *.js and lib/**/*.js
+        self.all_js = []
+        self.binaries = []       # by extension
+        self.sniff = []          # unknown types, checked for ELF magic
+        self.scripts = []
+        self.shell_scripts = []
+        self.polkit = []
+        lib_dir = os.path.join(ext_dir, 'lib') + os.sep
+        for path in walk_files(ext_dir):
+            name = os.path.basename(path)
+            if name.endswith('.js'):
+                self.all_js.append(path)
+                if (os.path.dirname(path) == ext_dir and not name.startswith('.')
+                        or path.startswith(lib_dir)):
+                    self.extension_js.append(path)
+            if name.endswith(BINARY_EXTENSIONS):
+                self.binaries.append(path)
+            elif not name.endswith(KNOWN_TEXT_EXTENSIONS) and name not in KNOWN_TEXT_NAMES:
+                self.sniff.append(path)
+            if name.endswith(SCRIPT_EXTENSIONS):
+                self.scripts.append(path)
+            if name.endswith('.sh'):
+                self.shell_scripts.append(path)
+            if name.endswith(POLKIT_EXTENSIONS):
+                self.polkit.append(path)
+
+
+def read_bytes(path, size=-1):
+    try:
+        return extfs.read_bytes(path, size)
+    except OSError:
+        return b''
+
+
+def code_lines_matching(data, regex):
+    """Lines `regex` matches that do not start (after indentation) with // or *."""
+    count = 0
+    for line in data.splitlines():
+        if regex.search(line) and not line.lstrip().startswith((b'//', b'*')):
+            count += 1
+    return count
+
+
+def is_minified(data):
+    """Webpack boilerplate, or any line over MAX_LINE_LENGTH characters."""
+    if b'__webpack_require__' in data:
+        return True
+    if not _LONG_LINE_RE.search(data):
+        return False
+    text = data.decode('utf-8', errors='replace')
+    return any(len(line) > MAX_LINE_LENGTH for line in text.split('\n'))
+
+
+def check_file_structure(ext_dir):
+    for name in ('extension.js', 'metadata.json'):
+        if extfs.isfile(os.path.join(ext_dir, name)):
+            result("PASS", f"file-structure/{name}", f"{name} exists")
+        else:
+            result("FAIL", f"file-structure/{name}", f"{name} is missing")
+
+
+def check_license(ext_dir):
+    # COPYING wins when both exist
+    license_files = [path for path in (os.path.join(ext_dir, name) for name in LICENSE_NAMES)
+                     if extfs.isfile(path)]
+    if not license_files:
+        result("FAIL", "license", "No LICENSE or COPYING file — MUST use GPL-compatible license")
+        return
+    head = b'\n'.join(read_bytes(license_files[-1]).split(b'\n', 5)[:5])
+    if GPL_COMPATIBLE_RE.search(head):
+        result("PASS", "license", "License file found (appears GPL-compatible)")
+    else:
+        result("WARN", "license", "License file found but could not confirm GPL-compatibility")
+
+
+def check_extension_js(inventory):
+    """console.log, deprecated imports and minification in the extension's JS."""
+    console_logs = 0
+    deprecated = 0
+    minified = 0
+    for path in inventory.extension_js:
+        data = read_bytes(path)
+        if b'console.log(' in data:
+            console_logs += code_lines_matching(data, CONSOLE_LOG_RE)
+        if DEPRECATED_IMPORT_RE.search(data):
+            deprecated += sum(1 for line in data.splitlines()
+                              if DEPRECATED_IMPORT_RE.search(line))
+        if is_minified(data):
+            minified += 1
+
+    if console_logs:
+        result("FAIL", "no-console-log", f"Found {console_logs} console.log() call(s)")
+    else:
+        result("PASS", "no-console-log", "No console.log() calls found")
+
+    if deprecated:
+        result("FAIL", "no-deprecated-modules", f"Found {deprecated} deprecated module import(s)")
+    else:
+        result("PASS", "no-deprecated-modules", "No deprecated module imports found")
+    return minified
+
+
+def check_binary_files(inventory):
+    count = len(inventory.binaries)
+    count += sum(1 for path in inventory.sniff if read_bytes(path, 4) == ELF_MAGIC)
+    if count:
+        result("FAIL", "no-binary-files",
+               f"Found {count} binary file(s) — extensions MUST NOT include binaries")
+    else:
+        result("PASS", "no-binary-files", "No binary files found")
+
+
+def check_non_gjs_scripts(inventory):
+    count = len(inventory.scripts)
+    if not count:
+        result("PASS", "non-gjs-scripts", "No non-GJS scripts found")
+        return
+    # pkexec helpers are the main exception to GJS-only code
+    if any(b'pkexec' in read_bytes(path) for path in inventory.all_js):
+        result("PASS", "non-gjs-scripts",
+               f"Found {count} non-GJS script(s) — pkexec helper detected, "
+               "scripts support privileged operations")
+    else:
+        result("FAIL", "non-gjs-scripts",
+               f"Found {count} non-GJS script(s) — scripts MUST be written in GJS; "
+               "no pkexec/privileged helper justification found")
+
+
+def check_script_permissions(inventory):
+    count = sum(1 for path in inventory.shell_scripts if not extfs.is_executable(path))
+    if count:
+        result("WARN", "script-permissions",
+               f"Found {count} shell script(s) without execute permission — "
+               "packaging tools may strip permissions")
+    else:
+        result("PASS", "script-permissions",
+               "All shell scripts have execute permission (or no shell scripts found)")
+
+
+def check_polkit_files(inventory):
+    count = len(inventory.polkit)
+    if count:
+        result("WARN", "polkit-files",
+               f"Found {count} polkit policy/rules file(s) — requires security review")
+    else:
+        result("PASS", "polkit-files", "No polkit policy files found")
+
+
+def check_minified_js(minified):
+    if minified:
+        result("FAIL", "minified-js",
+               f"Found {minified} minified/bundled JS file(s) — reviewers cannot review minified code")
+    else:
+        result("PASS", "minified-js", "No minified or bundled JavaScript detected")
+
+
+def main():
+    if len(sys.argv) < 2:
+        result("FAIL", "files/args", "No extension directory provided")
+        sys.exit(1)
+
+    ext_dir = os.path.realpath(sys.argv[1])
+    check_file_structure(ext_dir)
+    check_license(ext_dir)
+    inventory = Inventory(ext_dir)
+    minified = check_extension_js(inventory)
+    check_binary_files(inventory)
+    check_non_gjs_scripts(inventory)
+    check_script_permissions(inventory)
+    check_polkit_files(inventory)
+    check_minified_js(minified)
+
+
+if __name__ == '__main__':
+    main()
@@ -15,6 +15,8 @@ import os
 import re
 import sys
 
+from ego_lint import extfs, jstokens, scopes
+
 
 def result(status, check, detail):
     print(f"{status}|{check}|{detail}")
@@ -24,7 +26,7 @@ def find_js_files(ext_dir):
     """Find all JS files in extension directory, excluding node_modules."""
     skip_dirs = {'node_modules', '.git', '__pycache__'}
     files = []
-    for root, dirs, filenames in os.walk(ext_dir):
+    for root, dirs, filenames in extfs.walk(ext_dir):
         dirs[:] = [d for d in dirs if d not in skip_dirs]
         for name in filenames:
             if name.endswith('.js'):
@@ -37,15 +39,12 @@ def check_gtypename(ext_dir, js_files):
     missing = []
     for filepath in js_files:
         rel = os.path.relpath(filepath, ext_dir)
-        with open(filepath, encoding='utf-8', errors='replace') as f:
-            content = f.read()
+        index = scopes.load(filepath)
 
-        for m in re.finditer(r'GObject\.registerClass\s*\(', content):
-            lineno = content[:m.start()].count('\n') + 1
-            # Look ahead for GTypeName in the next ~300 chars (metadata object)
-            lookahead = content[m.start():m.start() + 300]
-            if 'GTypeName' not in lookahead:
-                missing.append(f"{rel}:{lineno}")
+        for call in index.register_calls:
+            # GTypeName in the metadata object, or a static field of the class
+            if 'GTypeName' not in index.text(call.args):
+                missing.append(f"{rel}:{index.src.line_of(call.start)}")
 
     if missing:
         for loc in missing[:5]:
@@ -62,40 +61,21 @@ def check_super_init(ext_dir, js_files):
     missing = []
     for filepath in js_files:
         rel = os.path.relpath(filepath, ext_dir)
-        with open(filepath, encoding='utf-8', errors='replace') as f:
-            content = f.read()
-
-        # Find class ... extends ... { patterns inside registerClass
-        for m in re.finditer(
-            r'class\s+\w+\s+extends\s+[\w.]+\s*\{', content
-        ):
-            # Check if this class is inside registerClass
-            preceding = content[max(0, m.start() - 80):m.start()]
-            if 'registerClass' not in preceding:
-                continue
+        index = scopes.load(filepath)
+        if not index.register_calls:
+            continue
 
-            # Find _init method in this class
-            class_body = content[m.end():]
-            init_match = re.search(r'\b_init\s*\([^)]*\)\s*\{', class_body)
-            if not init_match:
+        # Subclasses passed to registerClass that define their own _init()
+        for cls in index.classes:
+            if not cls.base or index.registered(cls) is None:
+                continue
+            init = index.methods(cls).get('_init')
+            if init is None:
                 continue
 
-            # Extract init body (find matching brace)
-            start = init_match.end()
-            depth = 1
-            pos = start
-            while pos < len(class_body) and depth > 0:
-                if class_body[pos] == '{':
-                    depth += 1
-                elif class_body[pos] == '}':
-                    depth -= 1
-                pos += 1
-            init_body = class_body[start:pos - 1]
-
+            init_body = index.text(init.body)
             if 'super._init' not in init_body and 'super(params)' not in init_body:
-                lineno = content[:m.start()].count('\n') + \
-                    class_body[:init_match.start()].count('\n') + 1
-                missing.append(f"{rel}:{lineno}")
+                missing.append(f"{rel}:{index.src.line_of(init.start)}")
 
     if missing:
         for loc in missing[:5]:
@@ -106,23 +86,43 @@ def check_super_init(ext_dir, js_files):
                "All GObject subclass _init() methods call super._init()")
 
 
+DRAW_CALLBACK_RE = re.compile(r'(vfunc_repaint|set_draw_func)\s*[\(\{]')
+BODY_OPEN_RE = re.compile(r'\s*\{')
+
+
+def draw_callback_span(src, m):
+    """Span of a drawing callback: the vfunc_repaint() body or set_draw_func() args."""
+    open_pos = m.end() - 1
+    if src.masked[open_pos] == '(':
+        close = scopes.close_paren(src.masked, open_pos)
+        if close is None:
+            return None
+        # vfunc_repaint() { ... } is a method definition; use its body
+        body = BODY_OPEN_RE.match(src.masked, close + 1)
+        if body is None:
+            return (open_pos, close)
+        open_pos = body.end() - 1
+    close = src.match(open_pos)
+    return None if close is None else (open_pos, close)
+
+
 def check_cairo_dispose(ext_dir, js_files):
     """WARN when drawing callbacks use get_context() without $dispose()."""
     missing = []
     for filepath in js_files:
         rel = os.path.relpath(filepath, ext_dir)
-        with open(filepath, encoding='utf-8', errors='replace') as f:
-            content = f.read()
+        src = jstokens.load(filepath)
+        if 'vfunc_repaint' not in src.text and 'set_draw_func' not in src.text:
+            continue
 
         # Find vfunc_repaint or set_draw_func callbacks
-        for m in re.finditer(
-            r'(vfunc_repaint|set_draw_func)\s*[\(\{]', content
-        ):
-            lineno = content[:m.start()].count('\n') + 1
-            # Look ahead for the function body
-            lookahead = content[m.start():m.start() + 500]
-            if 'get_context' in lookahead and '$dispose' not in lookahead:
-                missing.append(f"{rel}:{lineno}")
+        for m in DRAW_CALLBACK_RE.finditer(src.masked):
+            span = draw_callback_span(src, m)
+            if span is None:
+                continue
+            callback = src.code[span[0] + 1:span[1]]
+            if 'get_context' in callback and '$dispose' not in callback:
+                missing.append(f"{rel}:{src.line_of(m.start())}")
 
     if missing:
         for loc in missing:
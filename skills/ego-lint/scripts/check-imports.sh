@@ -1,7 +1,7 @@
 #!/usr/bin/env bash
 # check-imports.sh — Validate import segregation between extension and prefs contexts.
 #
-# Usage: check-imports.sh EXTENSION_DIR
+# Usage: check-imports.sh (EXTENSION_DIR | EXTENSION_ZIP)
 #
 # The rule:
 #   - Extension runtime code (extension.js, lib/**/*.js) must NOT import GTK libraries.
@@ -11,7 +11,46 @@
 
 set -euo pipefail
 
-EXT_DIR="$(cd "${1:-.}" && pwd)"
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+# A zip is read in place through ego_lint/extfs.py; a directory with find/grep
+EXT_ZIP=false
+if [[ -f "${1:-.}" ]]; then
+    EXT_DIR="$(cd "$(dirname "$1")" && pwd)/$(basename "$1")"
+    EXT_ZIP=true
+    zip_members="$(PYTHONPATH="$SCRIPT_DIR" python3 -m ego_lint.extfs list "$EXT_DIR")"
+else
+    EXT_DIR="$(cd "${1:-.}" && pwd)"
+fi
+
+# has_file REL — whether the extension ships REL
+has_file() {
+    if [[ "$EXT_ZIP" == true ]]; then
+        grep -qxF -- "$1" <<< "$zip_members"
+    else
+        [[ -f "$EXT_DIR/$1" ]]
+    fi
+}
+
+# lib_js_files — lib/**/*.js, relative to EXT_DIR
+lib_js_files() {
+    if [[ "$EXT_ZIP" == true ]]; then
+        grep -E '^lib/.*\.js$' <<< "$zip_members" || true
+    elif [[ -d "$EXT_DIR/lib" ]]; then
+        (cd "$EXT_DIR" && find lib -name '*.js' 2>/dev/null) || true
+    fi
+}
+
+# ext_grep PATTERN REL... — REL:LINE:text for every line matching PATTERN
+ext_grep() {
+    local pattern="$1"
+    shift
+    if [[ "$EXT_ZIP" == true ]]; then
+        PYTHONPATH="$SCRIPT_DIR" python3 -m ego_lint.extfs grep "$pattern" "$EXT_DIR" "$@" 2>/dev/null || true
+    else
+        (cd "$EXT_DIR" && grep -HnE "$pattern" -- "$@" 2>/dev/null) || true
+    fi
+}
 
 violations=0
 
@@ -24,22 +63,21 @@ gtk_pattern="gi://Gtk|gi://Gdk|gi://Adw"
 
 # Build list of runtime JS files
 runtime_files=()
-if [[ -f "$EXT_DIR/extension.js" ]]; then
-    runtime_files+=("$EXT_DIR/extension.js")
-fi
-if [[ -d "$EXT_DIR/lib" ]]; then
-    while IFS= read -r -d '' f; do
-        runtime_files+=("$f")
-    done < <(find "$EXT_DIR/lib" -name '*.js' -print0 2>/dev/null)
+if has_file extension.js; then
+    runtime_files+=(extension.js)
 fi
+while IFS= read -r rel_path; do
+    runtime_files+=("$rel_path")
+done < <(lib_js_files)
 
-for f in "${runtime_files[@]}"; do
+if [[ ${#runtime_files[@]} -gt 0 ]]; then
     while IFS= read -r match; do
-        rel_path="${f#"$EXT_DIR/"}"
+        rel_path="${match%%:*}"
+        match="${match#*:}"
         echo "FAIL|imports/no-gtk-in-extension|$rel_path: $match"
         violations=$((violations + 1))
-    done < <(grep -nE "$gtk_pattern" "$f" 2>/dev/null || true)
-done
+    done < <(ext_grep "$gtk_pattern" "${runtime_files[@]}")
+fi
 
 # ---------------------------------------------------------------------------
 # Check prefs code for banned Shell runtime imports
@@ -48,11 +86,11 @@ done
 # Banned in prefs: gi://Clutter, gi://Meta, gi://St, gi://Shell
 shell_pattern="gi://Clutter|gi://Meta|gi://St|gi://Shell"
 
-if [[ -f "$EXT_DIR/prefs.js" ]]; then
+if has_file prefs.js; then
     while IFS= read -r match; do
-        echo "FAIL|imports/no-shell-in-prefs|prefs.js: $match"
+        echo "FAIL|imports/no-shell-in-prefs|prefs.js: ${match#prefs.js:}"
         violations=$((violations + 1))
-    done < <(grep -nE "$shell_pattern" "$EXT_DIR/prefs.js" 2>/dev/null || true)
+    done < <(ext_grep "$shell_pattern" prefs.js)
 fi
 
 # ---------------------------------------------------------------------------
@@ -60,21 +98,21 @@ fi
 # ---------------------------------------------------------------------------
 
 # prefs.js must NOT use resource:///org/gnome/shell/ (lowercase 's') — that's the extension context
-if [[ -f "$EXT_DIR/prefs.js" ]]; then
+if has_file prefs.js; then
     while IFS= read -r match; do
         echo "FAIL|imports/resource-path-case|prefs.js: wrong resource path case — use resource:///org/gnome/Shell/Extensions/ (capitalized Shell)"
         violations=$((violations + 1))
         break  # Report once
-    done < <(grep -nE 'resource:///org/gnome/shell/' "$EXT_DIR/prefs.js" 2>/dev/null || true)
+    done < <(ext_grep 'resource:///org/gnome/shell/' prefs.js)
 fi
 
 # extension.js must NOT use resource:///org/gnome/Shell/Extensions/ — that's the prefs context
-if [[ -f "$EXT_DIR/extension.js" ]]; then
+if has_file extension.js; then
     while IFS= read -r match; do
         echo "FAIL|imports/resource-path-case|extension.js: wrong resource path case — use resource:///org/gnome/shell/ (lowercase)"
         violations=$((violations + 1))
         break  # Report once
-    done < <(grep -nE 'resource:///org/gnome/Shell/Extensions/' "$EXT_DIR/extension.js" 2>/dev/null || true)
+    done < <(ext_grep 'resource:///org/gnome/Shell/Extensions/' extension.js)
 fi
 
 # ---------------------------------------------------------------------------
@@ -83,57 +121,23 @@ fi
 # even if they live in lib/ and are also used by extension.js.
 # ---------------------------------------------------------------------------
 
-resolve_import() {
-    local dir="$1" import_path="$2"
-    local resolved
-    resolved="$(cd "$dir" && realpath -m "$import_path" 2>/dev/null)" || return
-    if [[ -f "$resolved" ]]; then
-        echo "$resolved"
-    elif [[ -f "${resolved}.js" ]]; then
-        echo "${resolved}.js"
-    fi
-}
-
-get_local_imports() {
-    local file="$1"
-    local dir
-    dir="$(dirname "$file")"
-    grep -E "from\s+['\"]\.\.?/" "$file" 2>/dev/null | \
-        sed -E "s/.*from\s+['\"]([^'\"]+)['\"].*/\1/" | \
-        while IFS= read -r path; do
-            resolve_import "$dir" "$path"
-        done
-}
-
-if [[ -f "$EXT_DIR/prefs.js" ]]; then
-    # BFS from prefs.js to find all prefs-reachable modules
-    declare -A prefs_visited
-    prefs_queue=("$EXT_DIR/prefs.js")
-    prefs_visited["$EXT_DIR/prefs.js"]=1
-    prefs_idx=0
-
-    while [[ $prefs_idx -lt ${#prefs_queue[@]} ]]; do
-        current="${prefs_queue[$prefs_idx]}"
-        prefs_idx=$((prefs_idx + 1))
-
-        while IFS= read -r neighbor; do
-            [[ -z "$neighbor" ]] && continue
-            if [[ -z "${prefs_visited[$neighbor]:-}" ]]; then
-                prefs_visited["$neighbor"]=1
-                prefs_queue+=("$neighbor")
-            fi
-        done < <(get_local_imports "$current")
-    done
+if has_file prefs.js; then
+    # Modules reachable from prefs.js, one parse per module (see ego_lint/importgraph.py)
+    prefs_reachable=()
+    while IFS= read -r rel_path; do
+        [[ "$rel_path" == "prefs.js" ]] && continue
+        prefs_reachable+=("$rel_path")
+    done < <(python3 "$SCRIPT_DIR/import-graph.py" "$EXT_DIR" prefs.js)
 
     # Check prefs-reachable modules (excluding prefs.js itself) for Shell imports
-    for f in "${!prefs_visited[@]}"; do
-        [[ "$f" == "$EXT_DIR/prefs.js" ]] && continue
-        rel_path="${f#"$EXT_DIR/"}"
+    if [[ ${#prefs_reachable[@]} -gt 0 ]]; then
         while IFS= read -r match; do
+            rel_path="${match%%:*}"
+            match="${match#*:}"
             echo "FAIL|imports/shared-module-shell|$rel_path: Shell runtime import in module reachable from prefs.js: $match"
             violations=$((violations + 1))
-        done < <(grep -nE "$shell_pattern" "$f" 2>/dev/null || true)
-    done
+        done < <(ext_grep "$shell_pattern" "${prefs_reachable[@]}")
+    fi
 fi
 
 # ---------------------------------------------------------------------------
@@ -25,947 +25,961 @@ Checks:
   - R-SEC-16: Clipboard + keybinding cross-reference
   - R-FILE-07: Missing export default class
 
+Every check is a visitor over one shared pass (ego_lint.passes): each JS file
+is read and tokenized once, whole-file checks get visit_file(), per-line
+checks get visit_line() for the lines their trigger keyword hits, and
+checks that only look at extension.js read it from the LifecycleContext in
+finish(). Results are printed from finish(), in the order main() lists the
+checks.
+
 Output: PIPE-delimited lines: STATUS|check-name|detail
 """
 
-import json
 import os
 import re
 import sys
 
+from ego_lint import extfs, lifecycle, metadata
+from ego_lint.passes import Check, JSFile, find_js_files, run
+
 
 def result(status, check, detail):
     print(f"{status}|{check}|{detail}")
 
 
-def find_js_files(ext_dir, exclude_prefs=False):
-    """Find JS files, optionally excluding prefs.js."""
-    skip_dirs = {'node_modules', '.git', '__pycache__'}
-    files = []
-    for root, dirs, filenames in os.walk(ext_dir):
-        dirs[:] = [d for d in dirs if d not in skip_dirs]
-        for name in filenames:
-            if name.endswith('.js'):
-                if exclude_prefs and name == 'prefs.js':
-                    continue
-                files.append(os.path.join(root, name))
-    return files
+class LifecycleContext:
+    """What several checks share: extension.js, its lifecycle index, metadata."""
+
+    def __init__(self, ext_dir):
+        self.ext_dir = ext_dir
+        ext_js = os.path.join(ext_dir, 'extension.js')
+        self.extension = JSFile(ext_js, ext_dir) if extfs.isfile(ext_js) else None
+
+    @property
+    def lifecycle(self):
+        """extension.js LifecycleIndex (ego_lint.lifecycle), or None."""
+        if self.extension is None:
+            return None
+        return lifecycle.index(self.extension.src)
+
+    def disable_body(self, view='code'):
+        """extension.js disable() body text, or None."""
+        index = self.lifecycle
+        if index is None or index.disable is None:
+            return None
+        return index.text(index.disable, view)
+
+    @property
+    def unlock_dialog(self):
+        """Whether metadata.json declares the unlock-dialog session mode."""
+        return 'unlock-dialog' in (metadata.load(self.ext_dir).session_modes or ())
 
 
-def read_file(path):
-    with open(path, encoding='utf-8', errors='replace') as f:
-        return f.read()
+class LifecycleCheck(Check):
+    """A lifecycle check; skips prefs.js unless a subclass says otherwise."""
 
+    skip_prefs = True
 
-def strip_comments(content):
-    """Remove single-line and block comments from JS content."""
-    # Remove block comments
-    content = re.sub(r'/\*.*?\*/', '', content, flags=re.DOTALL)
-    # Remove single-line comments
-    content = re.sub(r'//.*$', '', content, flags=re.MULTILINE)
-    return content
+    def __init__(self, ctx):
+        super().__init__()
+        self.ctx = ctx
 
 
-def check_enable_disable(ext_dir):
+# Timeout/idle source creation, shared by the timeout checks
+TIMEOUT_KEYWORD_RE = re.compile(r'timeout_add|idle_add')
+TIMEOUT_CALL_RE = re.compile(r'(timeout_add|idle_add)\s*\(')
+SOURCE_REMOVE_CALLEES = ('Source.remove', 'source_remove')
+
+
+class EnableDisableCheck(LifecycleCheck):
     """R-LIFE-03: extension.js must define enable() and disable()."""
-    ext_js = os.path.join(ext_dir, 'extension.js')
-    if not os.path.isfile(ext_js):
-        return  # file-structure check handles this
 
-    content = strip_comments(read_file(ext_js))
+    def finish(self):
+        if self.ctx.extension is None:
+            return  # file-structure check handles this
+
+        content = self.ctx.extension.code
 
-    has_enable = bool(re.search(r'\benable\s*\(', content))
-    has_disable = bool(re.search(r'\bdisable\s*\(', content))
+        has_enable = bool(re.search(r'\benable\s*\(', content))
+        has_disable = bool(re.search(r'\bdisable\s*\(', content))
 
-    if not has_enable:
-        result("FAIL", "lifecycle/enable-method", "extension.js missing enable() method")
-    if not has_disable:
-        result("FAIL", "lifecycle/disable-method", "extension.js missing disable() method")
-    if has_enable and has_disable:
-        result("PASS", "lifecycle/enable-disable", "enable() and disable() both defined")
+        if not has_enable:
+            result("FAIL", "lifecycle/enable-method", "extension.js missing enable() method")
+        if not has_disable:
+            result("FAIL", "lifecycle/disable-method", "extension.js missing disable() method")
+        if has_enable and has_disable:
+            result("PASS", "lifecycle/enable-disable", "enable() and disable() both defined")
 
 
-def check_default_export(ext_dir):
+class DefaultExportCheck(LifecycleCheck):
     """R-FILE-07: extension.js should have export default class."""
-    ext_js = os.path.join(ext_dir, 'extension.js')
-    if not os.path.isfile(ext_js):
-        return
 
-    content = strip_comments(read_file(ext_js))
-    if not re.search(r'\bexport\s+default\s+class\b', content):
-        result("WARN", "lifecycle/default-export",
-               "extension.js missing 'export default class' — required for GNOME 45+")
-    else:
-        result("PASS", "lifecycle/default-export", "extension.js has default export class")
+    def finish(self):
+        if self.ctx.extension is None:
+            return
 
+        if not re.search(r'\bexport\s+default\s+class\b', self.ctx.extension.code):
+            result("WARN", "lifecycle/default-export",
+                   "extension.js missing 'export default class' — required for GNOME 45+")
+        else:
+            result("PASS", "lifecycle/default-export", "extension.js has default export class")
 
-def check_signal_balance(ext_dir):
+
+class SignalBalanceCheck(LifecycleCheck):
     """R-LIFE-01: Signal connection/disconnection balance."""
-    js_files = find_js_files(ext_dir, exclude_prefs=True)
-    if not js_files:
-        return
-
-    pure_connects = 0
-    pure_disconnects = 0
-    connect_objects = 0
-
-    for filepath in js_files:
-        for line in read_file(filepath).splitlines():
-            if re.search(r'\.connectObject\s*\(', line):
-                connect_objects += 1
-            elif re.search(r'\.connect\s*\(', line) and not re.search(r'\.disconnect', line):
-                pure_connects += 1
-            if re.search(r'\.disconnectObject\s*\(', line):
-                pass  # auto-cleanup
-            elif re.search(r'\.disconnect\s*\(', line) and not re.search(r'\.connect\s*\(', line):
-                pure_disconnects += 1
-
-    # connectObject calls auto-disconnect, so only manual connects need matching disconnects
-    imbalance = pure_connects - pure_disconnects
-    if imbalance > 1:
-        result("WARN", "lifecycle/signal-balance",
-               f"{pure_connects} manual .connect() calls but only {pure_disconnects} "
-               f".disconnect() calls — verify all signals are disconnected in disable()")
-    else:
-        result("PASS", "lifecycle/signal-balance",
-               f"Signal balance OK ({pure_connects} connects, {pure_disconnects} disconnects, "
-               f"{connect_objects} connectObject)")
-
-
-def check_untracked_timeouts(ext_dir):
+
+    # Every pattern below needs 'connect' somewhere on the line
+    trigger = re.compile(r'connect')
+
+    CONNECT_OBJECT_RE = re.compile(r'\.connectObject\s*\(')
+    CONNECT_RE = re.compile(r'\.connect\s*\(')
+    DISCONNECT_OBJECT_RE = re.compile(r'\.disconnectObject\s*\(')
+    DISCONNECT_RE = re.compile(r'\.disconnect\s*\(')
+
+    def __init__(self, ctx):
+        super().__init__(ctx)
+        self.pure_connects = 0
+        self.pure_disconnects = 0
+        self.connect_objects = 0
+
+    def visit_line(self, f, index):
+        line = f.lines[index]
+        if self.CONNECT_OBJECT_RE.search(line):
+            self.connect_objects += 1
+        elif self.CONNECT_RE.search(line) and '.disconnect' not in line:
+            self.pure_connects += 1
+        if self.DISCONNECT_OBJECT_RE.search(line):
+            pass  # auto-cleanup
+        elif self.DISCONNECT_RE.search(line) and not self.CONNECT_RE.search(line):
+            self.pure_disconnects += 1
+
+    def finish(self):
+        if not self.files_seen:
+            return
+
+        # connectObject calls auto-disconnect, so only manual connects need matching disconnects
+        imbalance = self.pure_connects - self.pure_disconnects
+        if imbalance > 1:
+            result("WARN", "lifecycle/signal-balance",
+                   f"{self.pure_connects} manual .connect() calls but only "
+                   f"{self.pure_disconnects} .disconnect() calls — "
+                   f"verify all signals are disconnected in disable()")
+        else:
+            result("PASS", "lifecycle/signal-balance",
+                   f"Signal balance OK ({self.pure_connects} connects, "
+                   f"{self.pure_disconnects} disconnects, "
+                   f"{self.connect_objects} connectObject)")
+
+
+class UntrackedTimeoutsCheck(LifecycleCheck):
     """R-LIFE-02: timeout_add/idle_add without stored return value."""
-    js_files = find_js_files(ext_dir, exclude_prefs=True)
-    if not js_files:
-        return
-
-    untracked = []
-    for filepath in js_files:
-        rel = os.path.relpath(filepath, ext_dir)
-        for lineno, line in enumerate(read_file(filepath).splitlines(), 1):
-            stripped = line.strip()
-            # Skip comments
-            if stripped.startswith('//') or stripped.startswith('*'):
-                continue
-            # Match timeout_add or idle_add calls
-            if re.search(r'(timeout_add|idle_add)\s*\(', stripped):
-                # Check if the return value is assigned
-                if not re.search(r'(=|return)\s*.*(timeout_add|idle_add)', stripped):
-                    untracked.append(f"{rel}:{lineno}")
-
-    if untracked:
-        for loc in untracked:
-            result("WARN", "lifecycle/untracked-timeout",
-                   f"{loc}: timeout_add/idle_add return value not stored — "
-                   f"cannot be removed in disable()")
-    else:
-        result("PASS", "lifecycle/untracked-timeout",
-               "All timeout/idle sources have stored IDs")
-
-
-def check_connect_object_migration(ext_dir):
+
+    trigger = TIMEOUT_KEYWORD_RE
+
+    ASSIGNED_RE = re.compile(r'(=|return)\s*.*(timeout_add|idle_add)')
+
+    def __init__(self, ctx):
+        super().__init__(ctx)
+        self.untracked = []
+
+    def visit_line(self, f, index):
+        stripped = f.lines[index].strip()
+        # Skip comments
+        if stripped.startswith('//') or stripped.startswith('*'):
+            return
+        # Match timeout_add or idle_add calls whose return value is not assigned
+        if TIMEOUT_CALL_RE.search(stripped) and not self.ASSIGNED_RE.search(stripped):
+            self.untracked.append(f"{f.rel}:{index + 1}")
+
+    def finish(self):
+        if not self.files_seen:
+            return
+
+        if self.untracked:
+            for loc in self.untracked:
+                result("WARN", "lifecycle/untracked-timeout",
+                       f"{loc}: timeout_add/idle_add return value not stored — "
+                       f"cannot be removed in disable()")
+        else:
+            result("PASS", "lifecycle/untracked-timeout",
+                   "All timeout/idle sources have stored IDs")
+
+
+class TimeoutRemovalInDisableCheck(LifecycleCheck):
+    """R-LIFE-12: Stored timeout IDs should have Source.remove() in disable()."""
+
+    STORED_ID_RE = re.compile(r'this\.(_\w+)\s*=\s*.*?(timeout_add|idle_add)')
+
+    def finish(self):
+        if self.ctx.extension is None:
+            return
+
+        # Find stored timeout IDs: this._foo = ...timeout_add... or this._foo = ...idle_add...
+        stored_ids = {m.group(1) for m in self.STORED_ID_RE.finditer(self.ctx.extension.code)}
+        if not stored_ids:
+            return  # No stored timeouts to check
+
+        disable = self.ctx.lifecycle.disable
+        if disable is None:
+            return  # EnableDisableCheck handles missing disable()
+
+        # Any Source.remove() in disable() is taken to cover every stored ID
+        has_remove = any(callee.endswith(SOURCE_REMOVE_CALLEES)
+                         for callee, _ in disable.calls)
+
+        if not has_remove:
+            for var_name in sorted(stored_ids):
+                result("FAIL", "lifecycle/timeout-not-removed",
+                       f"this.{var_name} stores timeout/idle source but no "
+                       f"GLib.Source.remove() call found in disable()")
+        else:
+            result("PASS", "lifecycle/timeout-not-removed",
+                   "All stored timeout/idle IDs have Source.remove() in disable()")
+
+
+class ConnectObjectMigrationCheck(LifecycleCheck):
     """R-LIFE-04: Suggest connectObject when 3+ manual connect/disconnect pairs."""
-    js_files = find_js_files(ext_dir, exclude_prefs=True)
-    if not js_files:
-        return
 
-    manual_pairs = 0
-    has_connect_object = False
+    CONNECT_OBJECT_RE = re.compile(r'\.connectObject\s*\(')
+    STORED_CONNECT_RE = re.compile(r'=\s*\w+\.connect\s*\(')
 
-    for filepath in js_files:
-        content = read_file(filepath)
-        if re.search(r'\.connectObject\s*\(', content):
-            has_connect_object = True
+    def __init__(self, ctx):
+        super().__init__(ctx)
+        self.manual_pairs = 0
+        self.has_connect_object = False
+
+    def visit_file(self, f):
+        content = f.text
+        if not self.has_connect_object and self.CONNECT_OBJECT_RE.search(content):
+            self.has_connect_object = True
         # Count lines that store a connect ID
-        manual_pairs += len(re.findall(
-            r'=\s*\w+\.connect\s*\(', content
-        ))
+        self.manual_pairs += len(self.STORED_CONNECT_RE.findall(content))
+
+    def finish(self):
+        if not self.files_seen:
+            return
 
-    if manual_pairs >= 3 and not has_connect_object:
-        result("WARN", "lifecycle/connectObject-migration",
-               f"{manual_pairs} manual signal connections found — "
-               f"consider using connectObject() for automatic cleanup")
-    else:
-        result("PASS", "lifecycle/connectObject-migration",
-               "Signal connection pattern OK")
+        if self.manual_pairs >= 3 and not self.has_connect_object:
+            result("WARN", "lifecycle/connectObject-migration",
+                   f"{self.manual_pairs} manual signal connections found — "
+                   f"consider using connectObject() for automatic cleanup")
+        else:
+            result("PASS", "lifecycle/connectObject-migration",
+                   "Signal connection pattern OK")
 
 
-def check_async_destroyed_guard(ext_dir):
+class AsyncDestroyedGuardCheck(LifecycleCheck):
     """R-LIFE-05: Async functions with await should check _destroyed after resuming."""
-    js_files = find_js_files(ext_dir, exclude_prefs=True)
-    if not js_files:
-        return
-
-    has_async_await = False
-    has_destroyed_flag = False
-
-    for filepath in js_files:
-        content = strip_comments(read_file(filepath))
-        if re.search(r'\basync\b', content) and re.search(r'\bawait\b', content):
-            has_async_await = True
-        if re.search(r'\b_destroyed\b', content) or re.search(r'\b_isDestroyed\b', content):
-            has_destroyed_flag = True
-
-    if has_async_await and not has_destroyed_flag:
-        result("WARN", "lifecycle/async-destroyed-guard",
-               "async/await used without _destroyed or _isDestroyed guard — "
-               "extension may act on stale state after disable()")
-    elif has_async_await and has_destroyed_flag:
-        result("PASS", "lifecycle/async-destroyed-guard",
-               "async/await with _destroyed guard detected")
-    # If no async/await, skip silently
-
-
-def check_timeout_return_value(ext_dir):
+
+    ASYNC_RE = re.compile(r'\basync\b')
+    AWAIT_RE = re.compile(r'\bawait\b')
+    DESTROYED_RE = re.compile(r'\b_destroyed\b|\b_isDestroyed\b')
+
+    def __init__(self, ctx):
+        super().__init__(ctx)
+        self.has_async_await = False
+        self.has_destroyed_flag = False
+
+    def visit_file(self, f):
+        content = f.code
+        if (not self.has_async_await and self.ASYNC_RE.search(content)
+                and self.AWAIT_RE.search(content)):
+            self.has_async_await = True
+        if not self.has_destroyed_flag and self.DESTROYED_RE.search(content):
+            self.has_destroyed_flag = True
+
+    def finish(self):
+        if self.has_async_await and not self.has_destroyed_flag:
+            result("WARN", "lifecycle/async-destroyed-guard",
+                   "async/await used without _destroyed or _isDestroyed guard — "
+                   "extension may act on stale state after disable()")
+        elif self.has_async_await and self.has_destroyed_flag:
+            result("PASS", "lifecycle/async-destroyed-guard",
+                   "async/await with _destroyed guard detected")
+        # If no async/await, skip silently
+
+
+class TimeoutReturnValueCheck(LifecycleCheck):
     """R-LIFE-06: timeout_add/idle_add callbacks should return SOURCE_REMOVE or SOURCE_CONTINUE."""
-    js_files = find_js_files(ext_dir, exclude_prefs=True)
-    if not js_files:
-        return
-
-    missing = []
-    for filepath in js_files:
-        rel = os.path.relpath(filepath, ext_dir)
-        lines = read_file(filepath).splitlines()
-        for i, line in enumerate(lines):
-            stripped = line.strip()
-            # Skip comments
-            if stripped.startswith('//') or stripped.startswith('*'):
-                continue
-            if re.search(r'(timeout_add|idle_add)\s*\(', stripped):
-                # Look ahead up to 20 lines for SOURCE_REMOVE or SOURCE_CONTINUE
-                lookahead = '\n'.join(lines[i:i + 20])
-                if 'SOURCE_REMOVE' not in lookahead and 'SOURCE_CONTINUE' not in lookahead:
-                    missing.append(f"{rel}:{i + 1}")
-                    if len(missing) >= 3:
-                        break
-        if len(missing) >= 3:
-            break
-
-    if missing:
-        locs = ', '.join(missing)
-        result("WARN", "lifecycle/timeout-return-value",
-               f"timeout_add/idle_add callback missing SOURCE_REMOVE/SOURCE_CONTINUE: {locs}")
-    else:
-        result("PASS", "lifecycle/timeout-return-value",
-               "All timeout/idle callbacks return SOURCE_REMOVE or SOURCE_CONTINUE")
-
-
-def check_keybinding_cleanup(ext_dir):
+
+    trigger = TIMEOUT_KEYWORD_RE
+
+    def __init__(self, ctx):
+        super().__init__(ctx)
+        self.missing = []
+
+    def visit_line(self, f, index):
+        lines = f.lines
+        stripped = lines[index].strip()
+        # Skip comments
+        if stripped.startswith('//') or stripped.startswith('*'):
+            return
+        if TIMEOUT_CALL_RE.search(stripped):
+            # Look ahead up to 20 lines for SOURCE_REMOVE or SOURCE_CONTINUE
+            lookahead = '\n'.join(lines[index:index + 20])
+            if 'SOURCE_REMOVE' not in lookahead and 'SOURCE_CONTINUE' not in lookahead:
+                self.missing.append(f"{f.rel}:{index + 1}")
+                if len(self.missing) >= 3:
+                    self.done = True
+
+    def finish(self):
+        if not self.files_seen:
+            return
+
+        if self.missing:
+            locs = ', '.join(self.missing)
+            result("WARN", "lifecycle/timeout-return-value",
+                   f"timeout_add/idle_add callback missing SOURCE_REMOVE/SOURCE_CONTINUE: {locs}")
+        else:
+            result("PASS", "lifecycle/timeout-return-value",
+                   "All timeout/idle callbacks return SOURCE_REMOVE or SOURCE_CONTINUE")
+
+
+class KeybindingCleanupCheck(LifecycleCheck):
     """R-LIFE-09: addKeybinding must have matching removeKeybinding."""
-    js_files = find_js_files(ext_dir)
-    if not js_files:
-        return
 
-    add_count = 0
-    remove_count = 0
+    skip_prefs = False
+
+    ADD_RE = re.compile(r'\.addKeybinding\s*\(')
+    REMOVE_RE = re.compile(r'\.removeKeybinding\s*\(')
 
-    for filepath in js_files:
-        content = strip_comments(read_file(filepath))
-        add_count += len(re.findall(r'\.addKeybinding\s*\(', content))
-        remove_count += len(re.findall(r'\.removeKeybinding\s*\(', content))
+    def __init__(self, ctx):
+        super().__init__(ctx)
+        self.add_count = 0
+        self.remove_count = 0
 
-    if add_count > 0 and remove_count == 0:
-        result("FAIL", "lifecycle/keybinding-cleanup",
-               f"{add_count} addKeybinding() call(s) but no removeKeybinding() — "
-               f"keybindings will leak after disable()")
-    elif add_count > 0 and remove_count > 0:
-        result("PASS", "lifecycle/keybinding-cleanup",
-               f"Keybinding balance OK ({add_count} add, {remove_count} remove)")
-    # If no keybindings, skip silently
+    def visit_file(self, f):
+        content = f.code
+        if 'Keybinding' not in content:
+            return
+        self.add_count += len(self.ADD_RE.findall(content))
+        self.remove_count += len(self.REMOVE_RE.findall(content))
 
+    def finish(self):
+        if self.add_count > 0 and self.remove_count == 0:
+            result("FAIL", "lifecycle/keybinding-cleanup",
+                   f"{self.add_count} addKeybinding() call(s) but no removeKeybinding() — "
+                   f"keybindings will leak after disable()")
+        elif self.add_count > 0 and self.remove_count > 0:
+            result("PASS", "lifecycle/keybinding-cleanup",
+                   f"Keybinding balance OK ({self.add_count} add, {self.remove_count} remove)")
+        # If no keybindings, skip silently
 
-def check_dbus_proxy_lifecycle(ext_dir):
+
+class DbusProxyLifecycleCheck(LifecycleCheck):
     """R-LIFE-07: DBus proxy creation should have matching disconnect."""
-    js_files = find_js_files(ext_dir, exclude_prefs=True)
-    if not js_files:
-        return
-
-    has_proxy = False
-    has_disconnect = False
-
-    for filepath in js_files:
-        content = strip_comments(read_file(filepath))
-        if (re.search(r'Gio\.DBusProxy\.new_for_bus', content) or
-                re.search(r'new\s+Gio\.DBusProxy', content) or
-                re.search(r'makeProxyWrapper', content)):
-            has_proxy = True
-        if re.search(r'disconnectObject', content) or re.search(r'\.disconnect\s*\(', content):
-            has_disconnect = True
-
-    if has_proxy and not has_disconnect:
-        result("WARN", "lifecycle/dbus-proxy-cleanup",
-               "DBus proxy created but no disconnect/disconnectObject found — "
-               "signals may leak after disable()")
-    elif has_proxy and has_disconnect:
-        result("PASS", "lifecycle/dbus-proxy-cleanup",
-               "DBus proxy with disconnect pattern detected")
-    # If no proxy, skip silently
-
-
-def check_file_monitor_lifecycle(ext_dir):
+
+    PROXY_RE = re.compile(r'Gio\.DBusProxy\.new_for_bus|new\s+Gio\.DBusProxy|makeProxyWrapper')
+    DISCONNECT_RE = re.compile(r'disconnectObject|\.disconnect\s*\(')
+
+    def __init__(self, ctx):
+        super().__init__(ctx)
+        self.has_proxy = False
+        self.has_disconnect = False
+
+    def visit_file(self, f):
+        content = f.code
+        if not self.has_proxy and self.PROXY_RE.search(content):
+            self.has_proxy = True
+        if not self.has_disconnect and self.DISCONNECT_RE.search(content):
+            self.has_disconnect = True
+
+    def finish(self):
+        if self.has_proxy and not self.has_disconnect:
+            result("WARN", "lifecycle/dbus-proxy-cleanup",
+                   "DBus proxy created but no disconnect/disconnectObject found — "
+                   "signals may leak after disable()")
+        elif self.has_proxy and self.has_disconnect:
+            result("PASS", "lifecycle/dbus-proxy-cleanup",
+                   "DBus proxy with disconnect pattern detected")
+        # If no proxy, skip silently
+
+
+class FileMonitorLifecycleCheck(LifecycleCheck):
     """R-LIFE-08: File monitors should be cancelled in disable()."""
-    js_files = find_js_files(ext_dir, exclude_prefs=True)
-    if not js_files:
-        return
-
-    has_monitor = False
-    has_cancel = False
-
-    for filepath in js_files:
-        content = strip_comments(read_file(filepath))
-        if (re.search(r'\.monitor_file\s*\(', content) or
-                re.search(r'\.monitor_directory\s*\(', content) or
-                re.search(r'\.monitor_children\s*\(', content)):
-            has_monitor = True
-        if re.search(r'\.cancel\s*\(', content):
-            has_cancel = True
-
-    if has_monitor and not has_cancel:
-        result("WARN", "lifecycle/file-monitor-cleanup",
-               "File monitor created but no .cancel() found — "
-               "monitor will continue after disable()")
-    elif has_monitor and has_cancel:
-        result("PASS", "lifecycle/file-monitor-cleanup",
-               "File monitor with cancel pattern detected")
-    # If no monitors, skip silently
-
-
-def check_injection_manager(ext_dir):
+
+    MONITOR_RE = re.compile(r'\.monitor_(?:file|directory|children)\s*\(')
+    CANCEL_RE = re.compile(r'\.cancel\s*\(')
+
+    def __init__(self, ctx):
+        super().__init__(ctx)
+        self.has_monitor = False
+        self.has_cancel = False
+
+    def visit_file(self, f):
+        content = f.code
+        if not self.has_monitor and self.MONITOR_RE.search(content):
+            self.has_monitor = True
+        if not self.has_cancel and self.CANCEL_RE.search(content):
+            self.has_cancel = True
+
+    def finish(self):
+        if self.has_monitor and not self.has_cancel:
+            result("WARN", "lifecycle/file-monitor-cleanup",
+                   "File monitor created but no .cancel() found — "
+                   "monitor will continue after disable()")
+        elif self.has_monitor and self.has_cancel:
+            result("PASS", "lifecycle/file-monitor-cleanup",
+                   "File monitor with cancel pattern detected")
+        # If no monitors, skip silently
+
+
+class InjectionManagerCheck(LifecycleCheck):
     """R-LIFE-10: InjectionManager must be cleared in disable().
     Also detects direct prototype overrides (WS1-D enhancement)."""
-    js_files = find_js_files(ext_dir, exclude_prefs=True)
-    if not js_files:
-        return
-
-    has_injection = False
-    has_clear = False
-
-    for filepath in js_files:
-        content = strip_comments(read_file(filepath))
-        if re.search(r'new\s+InjectionManager\s*\(', content):
-            has_injection = True
-        if re.search(r'\.clear\s*\(', content):
-            has_clear = True
-
-    if has_injection and not has_clear:
-        result("FAIL", "lifecycle/injection-cleanup",
-               "new InjectionManager() found but no .clear() call — "
-               "injections will persist after disable()")
-    elif has_injection and has_clear:
-        result("PASS", "lifecycle/injection-cleanup",
-               "InjectionManager with .clear() cleanup detected")
-
-    # WS1-D: Detect direct prototype overrides
-    prototype_overrides = []
-    for filepath in js_files:
-        content = strip_comments(read_file(filepath))
-        rel = os.path.relpath(filepath, ext_dir)
-        # SomeClass.prototype.methodName = ...
-        for m in re.finditer(r'(\w+\.prototype\.\w+)\s*=', content):
-            prototype_overrides.append((rel, m.group(1)))
-        # Object.assign(SomeClass.prototype, ...)
-        for m in re.finditer(r'Object\.assign\s*\(\s*(\w+\.prototype)', content):
-            prototype_overrides.append((rel, f"Object.assign({m.group(1)}, ...)"))
-
-    if prototype_overrides:
+
+    INJECTION_RE = re.compile(r'new\s+InjectionManager\s*\(')
+    CLEAR_RE = re.compile(r'\.clear\s*\(')
+    # SomeClass.prototype.methodName = ...
+    PROTOTYPE_ASSIGN_RE = re.compile(r'(\w+\.prototype\.\w+)\s*=')
+    # Object.assign(SomeClass.prototype, ...)
+    PROTOTYPE_OBJECT_ASSIGN_RE = re.compile(r'Object\.assign\s*\(\s*(\w+\.prototype)')
+    PROTOTYPE_RESTORE_RE = re.compile(r'\w+\.prototype\.\w+\s*=')
+
+    def __init__(self, ctx):
+        super().__init__(ctx)
+        self.has_injection = False
+        self.has_clear = False
+        self.prototype_overrides = []
+
+    def visit_file(self, f):
+        content = f.code
+        if not self.has_injection and self.INJECTION_RE.search(content):
+            self.has_injection = True
+        if not self.has_clear and self.CLEAR_RE.search(content):
+            self.has_clear = True
+
+        # WS1-D: Detect direct prototype overrides
+        if '.prototype' not in content:
+            return
+        for m in self.PROTOTYPE_ASSIGN_RE.finditer(content):
+            self.prototype_overrides.append((f.rel, m.group(1)))
+        for m in self.PROTOTYPE_OBJECT_ASSIGN_RE.finditer(content):
+            self.prototype_overrides.append((f.rel, f"Object.assign({m.group(1)}, ...)"))
+
+    def finish(self):
+        if self.has_injection and not self.has_clear:
+            result("FAIL", "lifecycle/injection-cleanup",
+                   "new InjectionManager() found but no .clear() call — "
+                   "injections will persist after disable()")
+        elif self.has_injection and self.has_clear:
+            result("PASS", "lifecycle/injection-cleanup",
+                   "InjectionManager with .clear() cleanup detected")
+
+        if not self.prototype_overrides:
+            return
+
         # Check if disable() restores prototypes
-        ext_js = os.path.join(ext_dir, 'extension.js')
-        disable_restores = False
-        if os.path.isfile(ext_js):
-            ext_content = strip_comments(read_file(ext_js))
-            disable_match = re.search(r'\bdisable\s*\(\s*\)\s*\{', ext_content)
-            if disable_match:
-                start = disable_match.end()
-                depth = 1
-                pos = start
-                while pos < len(ext_content) and depth > 0:
-                    if ext_content[pos] == '{':
-                        depth += 1
-                    elif ext_content[pos] == '}':
-                        depth -= 1
-                    pos += 1
-                disable_body = ext_content[start:pos]
-                # Check for prototype restoration in disable
-                if re.search(r'\w+\.prototype\.\w+\s*=', disable_body):
-                    disable_restores = True
-
-        if not disable_restores:
-            for rel, override in prototype_overrides:
-                result("WARN", "lifecycle/prototype-override",
-                       f"{rel}: {override} — direct prototype modification "
-                       f"should be restored in disable()")
-
-
-def check_selective_disable(ext_dir):
+        disable_body = self.ctx.disable_body()
+        if disable_body and self.PROTOTYPE_RESTORE_RE.search(disable_body):
+            return
+
+        for rel, override in self.prototype_overrides:
+            result("WARN", "lifecycle/prototype-override",
+                   f"{rel}: {override} — direct prototype modification "
+                   f"should be restored in disable()")
+
+
+class LockscreenSignalsCheck(LifecycleCheck):
+    """R-LIFE-11: Lock screen signal safety — keyboard signals with unlock-dialog mode."""
+
+    KEYBOARD_SIGNALS = ('key-press-event', 'key-release-event', 'captured-event')
+    GUARD_RE = re.compile(r'(currentMode|sessionMode|unlock-dialog|session-modes)')
+
+    def __init__(self, ctx):
+        super().__init__(ctx)
+        self.hit = None  # (rel, has_guard) for the first file with a keyboard signal
+        # Not relevant if extension doesn't run on lock screen
+        self.done = not ctx.unlock_dialog
+
+    def visit_file(self, f):
+        content = f.code
+        if any(sig in content for sig in self.KEYBOARD_SIGNALS):
+            # Check for session mode guard
+            self.hit = (f.rel, bool(self.GUARD_RE.search(content)))
+            self.done = True  # Only report once
+
+    def finish(self):
+        if self.hit is None:
+            return  # Has unlock-dialog mode but no keyboard signals — that's fine
+
+        rel, has_guard = self.hit
+        if not has_guard:
+            result("FAIL", "lifecycle/lockscreen-signals",
+                   f"{rel}: keyboard signal connected but session-modes includes "
+                   f"'unlock-dialog' — must disconnect or guard keyboard signals on lock screen")
+        else:
+            result("PASS", "lifecycle/lockscreen-signals",
+                   f"{rel}: keyboard signal with session mode guard detected")
+
+
+class SelectiveDisableCheck(LifecycleCheck):
     """R-LIFE-13: Detect conditional returns in disable() that skip cleanup."""
-    ext_js = os.path.join(ext_dir, 'extension.js')
-    if not os.path.isfile(ext_js):
-        return
-
-    content = strip_comments(read_file(ext_js))
-
-    # Extract disable() body using brace depth
-    disable_match = re.search(r'\bdisable\s*\(\s*\)\s*\{', content)
-    if not disable_match:
-        return
-
-    start = disable_match.end()
-    depth = 1
-    pos = start
-    while pos < len(content) and depth > 0:
-        if content[pos] == '{':
-            depth += 1
-        elif content[pos] == '}':
-            depth -= 1
-        pos += 1
-    disable_body = content[start:pos]
-
-    # Look for early returns that skip cleanup: `if (...) return;`
-    # But exclude legitimate null guards like `if (this._x) { this._x.destroy(); }`
-    # and `if (!this._x) return;` (null guard for a single resource)
-    early_return_patterns = re.finditer(
-        r'if\s*\(([^)]+)\)\s*return\s*;', disable_body
-    )
 
-    for m in early_return_patterns:
-        condition = m.group(1).strip()
+    EARLY_RETURN_RE = re.compile(r'if\s*\(([^)]+)\)\s*return\s*;')
+    NULL_GUARD_RE = re.compile(r'^!\s*this\._\w+$')
+
+    def finish(self):
+        disable_body = self.ctx.disable_body()
+        if disable_body is None:
+            return
 
-        # Exclude null guards: `if (!this._x)` — these protect a single destroy
-        if re.match(r'^!\s*this\._\w+$', condition):
-            continue
+        # Look for early returns that skip cleanup: `if (...) return;`
+        # But exclude legitimate null guards like `if (this._x) { this._x.destroy(); }`
+        # and `if (!this._x) return;` (null guard for a single resource)
+        for m in self.EARLY_RETURN_RE.finditer(disable_body):
+            condition = m.group(1).strip()
 
-        # Flag session mode / enabled state checks that skip all cleanup
-        result("FAIL", "lifecycle/selective-disable",
-               f"disable() has conditional return: 'if ({condition}) return;' — "
-               f"disable() must always clean up all resources regardless of state")
-        return  # Report once
+            # Exclude null guards: `if (!this._x)` — these protect a single destroy
+            if self.NULL_GUARD_RE.match(condition):
+                continue
+
+            # Flag session mode / enabled state checks that skip all cleanup
+            result("FAIL", "lifecycle/selective-disable",
+                   f"disable() has conditional return: 'if ({condition}) return;' — "
+                   f"disable() must always clean up all resources regardless of state")
+            return  # Report once
 
-    result("PASS", "lifecycle/selective-disable",
-           "disable() does not conditionally skip cleanup")
+        result("PASS", "lifecycle/selective-disable",
+               "disable() does not conditionally skip cleanup")
 
 
-def check_unlock_dialog_comment(ext_dir):
+class UnlockDialogCommentCheck(LifecycleCheck):
     """R-LIFE-14: unlock-dialog session mode should have explanatory comment in disable()."""
-    metadata_path = os.path.join(ext_dir, 'metadata.json')
-    if not os.path.isfile(metadata_path):
-        return
-
-    try:
-        with open(metadata_path, encoding='utf-8') as f:
-            metadata = json.load(f)
-    except (json.JSONDecodeError, OSError):
-        return
-
-    session_modes = metadata.get('session-modes', [])
-    if 'unlock-dialog' not in session_modes:
-        return  # Not relevant
-
-    ext_js = os.path.join(ext_dir, 'extension.js')
-    if not os.path.isfile(ext_js):
-        return
-
-    # Read raw content (not stripped) to preserve comments
-    raw_content = read_file(ext_js)
-
-    # Extract disable() body from raw content
-    disable_match = re.search(r'\bdisable\s*\(\s*\)\s*\{', raw_content)
-    if not disable_match:
-        return
-
-    start = disable_match.end()
-    depth = 1
-    pos = start
-    while pos < len(raw_content) and depth > 0:
-        if raw_content[pos] == '{':
-            depth += 1
-        elif raw_content[pos] == '}':
-            depth -= 1
-        pos += 1
-    disable_body = raw_content[start:pos]
-
-    # Look for comments mentioning unlock/lock/session/mode
-    comment_keywords = re.search(
-        r'//.*\b(unlock|lock|session|mode)\b', disable_body, re.IGNORECASE
-    )
 
-    if not comment_keywords:
-        result("WARN", "lifecycle/unlock-dialog-comment",
-               "extension declares 'unlock-dialog' session mode but disable() has no "
-               "comment explaining lock screen behavior — add a comment documenting "
-               "which resources need special handling on the lock screen")
-    else:
-        result("PASS", "lifecycle/unlock-dialog-comment",
-               "disable() has comment documenting lock screen behavior")
+    COMMENT_RE = re.compile(r'//.*\b(unlock|lock|session|mode)\b', re.IGNORECASE)
+
+    def finish(self):
+        if not self.ctx.unlock_dialog:
+            return  # Not relevant
+
+        # Keep comments in the body: they are what this check looks for
+        disable_body = self.ctx.disable_body(view='text')
+        if disable_body is None:
+            return
 
+        # Look for comments mentioning unlock/lock/session/mode
+        if not self.COMMENT_RE.search(disable_body):
+            result("WARN", "lifecycle/unlock-dialog-comment",
+                   "extension declares 'unlock-dialog' session mode but disable() has no "
+                   "comment explaining lock screen behavior — add a comment documenting "
+                   "which resources need special handling on the lock screen")
+        else:
+            result("PASS", "lifecycle/unlock-dialog-comment",
+                   "disable() has comment documenting lock screen behavior")
 
-def check_clipboard_keybinding(ext_dir):
+
+class ClipboardKeybindingCheck(LifecycleCheck):
     """R-SEC-16: Clipboard access combined with keybinding registration is suspicious."""
-    js_files = find_js_files(ext_dir, exclude_prefs=True)
-    if not js_files:
-        return
 
-    for filepath in js_files:
-        content = strip_comments(read_file(filepath))
-        rel = os.path.relpath(filepath, ext_dir)
+    def __init__(self, ctx):
+        super().__init__(ctx)
+        self.hit = None
 
-        has_clipboard = bool(re.search(r'St\.Clipboard', content))
-        has_keybinding = bool(re.search(r'addKeybinding', content))
+    def visit_file(self, f):
+        content = f.code
+        if 'St.Clipboard' in content and 'addKeybinding' in content:
+            self.hit = f.rel
+            self.done = True  # Report once
 
-        if has_clipboard and has_keybinding:
+    def finish(self):
+        if self.hit is not None:
             result("WARN", "lifecycle/clipboard-keybinding",
-                   f"{rel}: St.Clipboard and addKeybinding() in same file — "
+                   f"{self.hit}: St.Clipboard and addKeybinding() in same file — "
                    f"review whether keybinding-triggered clipboard access is intended "
                    f"and not a keylogger pattern")
-            return  # Report once
-
-    # No co-occurrence found, skip silently
+        # No co-occurrence found, skip silently
 
 
-def check_lockscreen_signals(ext_dir):
-    """R-LIFE-11: Lock screen signal safety — keyboard signals with unlock-dialog mode."""
-    metadata_path = os.path.join(ext_dir, 'metadata.json')
-    if not os.path.isfile(metadata_path):
-        return
-
-    try:
-        with open(metadata_path, encoding='utf-8') as f:
-            metadata = json.load(f)
-    except (json.JSONDecodeError, OSError):
-        return
-
-    session_modes = metadata.get('session-modes', [])
-    if 'unlock-dialog' not in session_modes:
-        return  # Not relevant if extension doesn't run on lock screen
-
-    js_files = find_js_files(ext_dir, exclude_prefs=True)
-    keyboard_signals = ['key-press-event', 'key-release-event', 'captured-event']
-
-    for filepath in js_files:
-        content = strip_comments(read_file(filepath))
-        rel = os.path.relpath(filepath, ext_dir)
-
-        has_keyboard_signal = False
-        for sig in keyboard_signals:
-            if sig in content:
-                has_keyboard_signal = True
-                break
-
-        if has_keyboard_signal:
-            # Check for session mode guard
-            has_guard = bool(
-                re.search(r'(currentMode|sessionMode|unlock-dialog|session-modes)', content)
-            )
-            if not has_guard:
-                result("FAIL", "lifecycle/lockscreen-signals",
-                       f"{rel}: keyboard signal connected but session-modes includes "
-                       f"'unlock-dialog' — must disconnect or guard keyboard signals on lock screen")
-            else:
-                result("PASS", "lifecycle/lockscreen-signals",
-                       f"{rel}: keyboard signal with session mode guard detected")
-            return  # Only report once
-
-    # Has unlock-dialog mode but no keyboard signals — that's fine
-
-
-def check_timeout_removal_in_disable(ext_dir):
-    """R-LIFE-12: Stored timeout IDs should have Source.remove() in disable()."""
-    ext_js = os.path.join(ext_dir, 'extension.js')
-    if not os.path.isfile(ext_js):
-        return
-
-    content = strip_comments(read_file(ext_js))
-
-    # Find stored timeout IDs: this._foo = ...timeout_add... or this._foo = ...idle_add...
-    stored_ids = set()
-    for m in re.finditer(r'this\.(_\w+)\s*=\s*.*?(timeout_add|idle_add)', content):
-        stored_ids.add(m.group(1))
-
-    if not stored_ids:
-        return  # No stored timeouts to check
-
-    # Extract disable() body
-    disable_match = re.search(r'\bdisable\s*\(\s*\)\s*\{', content)
-    if not disable_match:
-        return  # check_enable_disable handles missing disable()
-
-    # Extract body using brace depth
-    start = disable_match.end()
-    depth = 1
-    pos = start
-    while pos < len(content) and depth > 0:
-        if content[pos] == '{':
-            depth += 1
-        elif content[pos] == '}':
-            depth -= 1
-        pos += 1
-    disable_body = content[start:pos]
-
-    # Check if Source.remove is called in disable() for each stored ID
-    has_remove = bool(re.search(r'(Source\.remove|source_remove)\s*\(', disable_body))
-
-    missing = []
-    for var_name in stored_ids:
-        # Check if this specific ID is passed to Source.remove() or if there's a general remove
-        var_removed = bool(re.search(
-            rf'(Source\.remove|source_remove)\s*\(\s*this\.{re.escape(var_name)}',
-            disable_body
-        ))
-        if not var_removed and not has_remove:
-            missing.append(var_name)
-
-    if missing:
-        for var_name in sorted(missing):
-            result("FAIL", "lifecycle/timeout-not-removed",
-                   f"this.{var_name} stores timeout/idle source but no "
-                   f"GLib.Source.remove() call found in disable()")
-    else:
-        result("PASS", "lifecycle/timeout-not-removed",
-               "All stored timeout/idle IDs have Source.remove() in disable()")
-
-
-def check_pkexec_user_writable(ext_dir):
+class PkexecUserWritableCheck(LifecycleCheck):
     """R-SEC-18: pkexec target must not be user-writable."""
-    js_files = find_js_files(ext_dir)
-    if not js_files:
-        return
-
-    user_writable_prefixes = ['/home/', '/tmp/', './', '../']
-
-    for filepath in js_files:
-        content = strip_comments(read_file(filepath))
-        rel = os.path.relpath(filepath, ext_dir)
-
-        # Match pkexec in argv arrays: ['pkexec', '/path/to/script']
-        for m in re.finditer(
-            r"""pkexec['"]\s*,\s*['"]([^'"]+)['"]""", content
-        ):
-            target = m.group(1)
-            for prefix in user_writable_prefixes:
-                if target.startswith(prefix):
-                    result("FAIL", "lifecycle/pkexec-user-writable",
-                           f"{rel}: pkexec target '{target}' is user-writable — "
-                           f"attacker can replace it with arbitrary code")
-                    return
 
-        # Match pkexec in command strings: 'pkexec /path/to/script'
-        for m in re.finditer(
-            r"""['"]pkexec\s+([^'"]+)['"]""", content
-        ):
-            target = m.group(1).split()[0]
-            for prefix in user_writable_prefixes:
-                if target.startswith(prefix):
-                    result("FAIL", "lifecycle/pkexec-user-writable",
-                           f"{rel}: pkexec target '{target}' is user-writable — "
-                           f"attacker can replace it with arbitrary code")
-                    return
+    skip_prefs = False
 
+    USER_WRITABLE_PREFIXES = ('/home/', '/tmp/', './', '../')
+    # pkexec in argv arrays: ['pkexec', '/path/to/script']
+    ARGV_RE = re.compile(r"""pkexec['"]\s*,\s*['"]([^'"]+)['"]""")
+    # pkexec in command strings: 'pkexec /path/to/script'
+    COMMAND_RE = re.compile(r"""['"]pkexec\s+([^'"]+)['"]""")
 
-def check_destroy_then_null(ext_dir):
-    """GAP-004: destroy() calls should be followed by null assignment."""
-    js_files = find_js_files(ext_dir, exclude_prefs=True)
-    if not js_files:
-        return
-
-    violations = []
-    for filepath in js_files:
-        rel = os.path.relpath(filepath, ext_dir)
-        lines = read_file(filepath).splitlines()
-
-        for i, line in enumerate(lines):
-            stripped = line.strip()
-            if stripped.startswith('//') or stripped.startswith('*'):
-                continue
-            # Match this._xxx.destroy() or this._xxx?.destroy()
-            m = re.search(r'(this\._\w+)\??\.\bdestroy\s*\(', stripped)
-            if not m:
-                continue
-            prop = m.group(1)  # e.g. this._widget
-            # Look ahead 5 lines for null assignment
-            lookahead = '\n'.join(lines[i:i + 6])
-            null_pattern = re.escape(prop) + r'\s*=\s*null\b'
-            if not re.search(null_pattern, lookahead):
-                violations.append(f"{rel}:{i + 1}")
-                if len(violations) >= 5:
-                    break
-        if len(violations) >= 5:
-            break
-
-    if violations:
-        for loc in violations:
-            result("WARN", "lifecycle/destroy-no-null",
-                   f"{loc}: .destroy() without null assignment — "
-                   f"set reference to null after destroy to prevent stale access")
-    else:
-        result("PASS", "lifecycle/destroy-no-null",
-               "All destroy() calls followed by null assignment")
-
-
-def check_dbus_export_lifecycle(ext_dir):
+    def __init__(self, ctx):
+        super().__init__(ctx)
+        self.hit = None
+
+    def visit_file(self, f):
+        content = f.code
+        if 'pkexec' not in content:
+            return
+
+        targets = [m.group(1) for m in self.ARGV_RE.finditer(content)]
+        targets += [m.group(1).split()[0] for m in self.COMMAND_RE.finditer(content)]
+        for target in targets:
+            if target.startswith(self.USER_WRITABLE_PREFIXES):
+                self.hit = (f.rel, target)
+                self.done = True
+                return
+
+    def finish(self):
+        if self.hit is not None:
+            rel, target = self.hit
+            result("FAIL", "lifecycle/pkexec-user-writable",
+                   f"{rel}: pkexec target '{target}' is user-writable — "
+                   f"attacker can replace it with arbitrary code")
+
+
+class DbusExportLifecycleCheck(LifecycleCheck):
     """GAP-003: DBus exported interfaces must be unexported in disable()/destroy()."""
-    js_files = find_js_files(ext_dir, exclude_prefs=True)
-    if not js_files:
-        return
-
-    export_patterns = [
-        (r'\.export\s*\(', '.unexport('),
-        (r'\.export_action_group\s*\(', 'unexport_action_group('),
-        (r'\.export_menu_model\s*\(', 'unexport_menu_model('),
-    ]
-
-    exports_found = []
-    all_content = ''
-
-    for filepath in js_files:
-        content = strip_comments(read_file(filepath))
-        all_content += content
-        rel = os.path.relpath(filepath, ext_dir)
-        for export_pat, _ in export_patterns:
+
+    EXPORT_RES = (
+        re.compile(r'\.export\s*\('),
+        re.compile(r'\.export_action_group\s*\('),
+        re.compile(r'\.export_menu_model\s*\('),
+    )
+    UNEXPORT_RE = re.compile(
+        r'\.unexport\s*\(|unexport_action_group\s*\(|unexport_menu_model\s*\(')
+
+    def __init__(self, ctx):
+        super().__init__(ctx)
+        self.first_export = None
+        self.has_unexport = False
+
+    def visit_file(self, f):
+        content = f.code
+        if not self.has_unexport and self.UNEXPORT_RE.search(content):
+            self.has_unexport = True
+        if self.first_export is not None or '.export' not in content:
+            return
+        for export_re in self.EXPORT_RES:
             # Skip ESM 'export' keyword — only match method calls on objects
-            for m in re.finditer(export_pat, content):
+            for m in export_re.finditer(content):
                 # Check that it's a method call (preceded by identifier or closing paren/bracket)
                 start = m.start()
                 if start > 0 and content[start - 1] not in (' ', '\t', '\n', ';', '{'):
-                    exports_found.append((rel, export_pat))
-                    break
-
-    if not exports_found:
-        return  # No DBus exports found
-
-    # Check for matching unexports anywhere in extension code
-    has_unexport = False
-    for _, unexport_method in export_patterns:
-        if unexport_method.replace('(', '\\s*\\(').replace('.', '\\.') and \
-                re.search(re.escape(unexport_method).replace(r'\(', r'\s*\('), all_content):
-            has_unexport = True
-            break
-
-    if not has_unexport:
-        for rel, _ in exports_found:
+                    self.first_export = f.rel
+                    return
+
+    def finish(self):
+        if self.first_export is None:
+            return  # No DBus exports found
+
+        if not self.has_unexport:
             result("FAIL", "lifecycle/dbus-export-leak",
-                   f"{rel}: DBus interface exported but no .unexport() found — "
+                   f"{self.first_export}: DBus interface exported but no .unexport() found — "
                    f"exported interfaces must be unexported in disable()")
-            return  # Report once
-    else:
-        result("PASS", "lifecycle/dbus-export-leak",
-               "DBus export/unexport lifecycle OK")
+        else:
+            result("PASS", "lifecycle/dbus-export-leak",
+                   "DBus export/unexport lifecycle OK")
 
 
-def check_timeout_reassignment(ext_dir):
+class TimeoutReassignmentCheck(LifecycleCheck):
     """GAP-010: Timeout ID reassignment without prior Source.remove() leaks GLib sources."""
-    js_files = find_js_files(ext_dir, exclude_prefs=True)
-    if not js_files:
-        return
-
-    violations = []
-    for filepath in js_files:
-        rel = os.path.relpath(filepath, ext_dir)
-        content = strip_comments(read_file(filepath))
-        lines = content.splitlines()
-
-        for i, line in enumerate(lines):
-            # Match: this._xxx = GLib.timeout_add( or this._xxx = GLib.idle_add(
-            m = re.search(r'(this\._\w+)\s*=\s*.*?(timeout_add|idle_add)\s*\(', line)
-            if not m:
+
+    trigger = TIMEOUT_KEYWORD_RE
+    trigger_view = 'code'
+
+    # Match: this._xxx = GLib.timeout_add( or this._xxx = GLib.idle_add(
+    ASSIGN_RE = re.compile(r'(this\._\w+)\s*=\s*.*?(timeout_add|idle_add)\s*\(')
+    # What follows the property in an assignment, and what precedes it in a removal
+    ASSIGN_TAIL_RE = re.compile(r'\s*=\s*.*?(timeout_add|idle_add)\s*\(')
+    REMOVE_HEAD_RE = re.compile(r'(Source\.remove|source_remove)\s*\(\s*')
+    # Every offset where a `this._x` property (as long as possible) starts
+    PROPERTY_SITE_RE = re.compile(r'(?=(this\._\w+))')
+
+    def __init__(self, ctx):
+        super().__init__(ctx)
+        self.violations = []
+        self._file = None
+        self._assign_counts = {}
+        self._sites = None
+        self._file_done = False
+
+    def visit_line(self, f, index):
+        if f is not self._file:
+            self._file = f
+            self._assign_counts = {}
+            self._sites = None
+            self._file_done = False
+        if self._file_done:
+            return
+
+        lines = f.code_lines
+        m = self.ASSIGN_RE.search(lines[index])
+        if not m:
+            return
+        prop = m.group(1)
+        # Check if this property is assigned timeout/idle elsewhere too (reassignment pattern)
+        assign_count = self._assign_counts.get(prop)
+        if assign_count is None:
+            assign_count = self._assign_counts[prop] = self._count_assignments(f.code, prop)
+        if assign_count < 2:
+            return  # Single assignment, not a reassignment pattern
+        # Look back 5 lines for Source.remove(this._xxx)
+        lookback = '\n'.join(lines[max(0, index - 5):index])
+        if not any(lookback.startswith(prop, m.end())
+                   for m in self.REMOVE_HEAD_RE.finditer(lookback)):
+            self.violations.append(f"{f.rel}:{index + 1}")
+            self._file_done = True  # One per file
+
+    def _count_assignments(self, content, prop):
+        """Non-overlapping timeout/idle assignments to `prop` in content.
+
+        Same count as findall(escape(prop) + ASSIGN_TAIL_RE), from one index
+        of `this._x` sites per file instead of a pattern per property.
+        """
+        if self._sites is None:
+            self._sites = {}
+            for m in self.PROPERTY_SITE_RE.finditer(content):
+                self._sites.setdefault(m.group(1), []).append(m.start())
+        count = 0
+        end = 0
+        for pos in self._sites.get(prop, ()):
+            if pos < end:
                 continue
-            prop = m.group(1)
-            # Check if this property is assigned timeout/idle elsewhere too (reassignment pattern)
-            assign_count = len(re.findall(
-                re.escape(prop) + r'\s*=\s*.*?(timeout_add|idle_add)\s*\(',
-                content
-            ))
-            if assign_count < 2:
-                continue  # Single assignment, not a reassignment pattern
-            # Look back 5 lines for Source.remove(this._xxx)
-            lookback = '\n'.join(lines[max(0, i - 5):i])
-            remove_pat = r'(Source\.remove|source_remove)\s*\(\s*' + re.escape(prop)
-            if not re.search(remove_pat, lookback):
-                violations.append(f"{rel}:{i + 1}")
-                break  # One per file
-
-    if violations:
-        for loc in violations:
-            result("WARN", "lifecycle/timeout-reassignment",
-                   f"{loc}: timeout/idle ID reassigned without prior "
-                   f"GLib.Source.remove() — may leak GLib sources")
-    else:
-        result("PASS", "lifecycle/timeout-reassignment",
-               "No timeout ID reassignment without removal detected")
-
-
-def check_subprocess_cancellation(ext_dir):
+            m = self.ASSIGN_TAIL_RE.match(content, pos + len(prop))
+            if m:
+                count += 1
+                end = m.end()
+        return count
+
+    def finish(self):
+        if not self.files_seen:
+            return
+
+        if self.violations:
+            for loc in self.violations:
+                result("WARN", "lifecycle/timeout-reassignment",
+                       f"{loc}: timeout/idle ID reassigned without prior "
+                       f"GLib.Source.remove() — may leak GLib sources")
+        else:
+            result("PASS", "lifecycle/timeout-reassignment",
+                   "No timeout ID reassignment without removal detected")
+
+
+class SubprocessCancellationCheck(LifecycleCheck):
     """GAP-012: Gio.Subprocess should have cancellation in disable()/destroy()."""
-    js_files = find_js_files(ext_dir, exclude_prefs=True)
-    if not js_files:
-        return
-
-    has_subprocess = False
-    has_cancel = False
-
-    for filepath in js_files:
-        content = strip_comments(read_file(filepath))
-        if (re.search(r'new\s+Gio\.Subprocess', content) or
-                re.search(r'Gio\.Subprocess\.new', content) or
-                re.search(r'Gio\.SubprocessLauncher', content)):
-            has_subprocess = True
-        if (re.search(r'\.force_exit\s*\(', content) or
-                re.search(r'\.send_signal\s*\(', content) or
-                re.search(r'cancellable.*\.cancel\s*\(', content, re.IGNORECASE)):
-            has_cancel = True
-
-    if has_subprocess and not has_cancel:
-        result("WARN", "lifecycle/subprocess-no-cancel",
-               "Gio.Subprocess created but no .force_exit(), .send_signal(), or "
-               "cancellable.cancel() found — subprocess may outlive disable()")
-    elif has_subprocess and has_cancel:
-        result("PASS", "lifecycle/subprocess-no-cancel",
-               "Subprocess with cancellation pattern detected")
-    # If no subprocess, skip silently
-
-
-def check_clipboard_network(ext_dir):
+
+    SUBPROCESS_RE = re.compile(r'new\s+Gio\.Subprocess|Gio\.Subprocess\.new|Gio\.SubprocessLauncher')
+    CANCEL_RE = re.compile(r'\.force_exit\s*\(|\.send_signal\s*\(')
+    CANCELLABLE_RE = re.compile(r'cancellable.*\.cancel\s*\(', re.IGNORECASE)
+
+    def __init__(self, ctx):
+        super().__init__(ctx)
+        self.has_subprocess = False
+        self.has_cancel = False
+
+    def visit_file(self, f):
+        content = f.code
+        if not self.has_subprocess and self.SUBPROCESS_RE.search(content):
+            self.has_subprocess = True
+        if not self.has_cancel and (self.CANCEL_RE.search(content)
+                                    or self.CANCELLABLE_RE.search(content)):
+            self.has_cancel = True
+
+    def finish(self):
+        if self.has_subprocess and not self.has_cancel:
+            result("WARN", "lifecycle/subprocess-no-cancel",
+                   "Gio.Subprocess created but no .force_exit(), .send_signal(), or "
+                   "cancellable.cancel() found — subprocess may outlive disable()")
+        elif self.has_subprocess and self.has_cancel:
+            result("PASS", "lifecycle/subprocess-no-cancel",
+                   "Subprocess with cancellation pattern detected")
+        # If no subprocess, skip silently
+
+
+class ClipboardNetworkCheck(LifecycleCheck):
     """GAP-025: Clipboard + network access cross-reference."""
-    js_files = find_js_files(ext_dir, exclude_prefs=True)
-    if not js_files:
-        return
-
-    has_clipboard = False
-    has_network = False
-
-    for filepath in js_files:
-        content = strip_comments(read_file(filepath))
-        if re.search(r'St\.Clipboard', content):
-            has_clipboard = True
-        if (re.search(r'Soup\.Session', content) or
-                re.search(r'Gio\.SocketClient', content) or
-                re.search(r'\bfetch\s*\(', content)):
-            has_network = True
-
-    if has_clipboard and has_network:
-        result("WARN", "lifecycle/clipboard-network",
-               "Extension accesses both St.Clipboard and network APIs — "
-               "manual review required to verify clipboard data is not exfiltrated")
-    # Skip silently if no co-occurrence
-
-
-def check_soup_session_abort(ext_dir):
+
+    NETWORK_RE = re.compile(r'Soup\.Session|Gio\.SocketClient|\bfetch\s*\(')
+
+    def __init__(self, ctx):
+        super().__init__(ctx)
+        self.has_clipboard = False
+        self.has_network = False
+
+    def visit_file(self, f):
+        content = f.code
+        if not self.has_clipboard and 'St.Clipboard' in content:
+            self.has_clipboard = True
+        if not self.has_network and self.NETWORK_RE.search(content):
+            self.has_network = True
+
+    def finish(self):
+        if self.has_clipboard and self.has_network:
+            result("WARN", "lifecycle/clipboard-network",
+                   "Extension accesses both St.Clipboard and network APIs — "
+                   "manual review required to verify clipboard data is not exfiltrated")
+        # Skip silently if no co-occurrence
+
+
+class SoupSessionAbortCheck(LifecycleCheck):
     """R-LIFE-15: Soup.Session should be aborted in disable()/destroy()."""
-    js_files = find_js_files(ext_dir, exclude_prefs=True)
-    if not js_files:
-        return
-
-    has_session = False
-    has_abort = False
-
-    for filepath in js_files:
-        content = strip_comments(read_file(filepath))
-        if (re.search(r'new\s+Soup\.Session', content) or
-                re.search(r'Soup\.Session\.new', content)):
-            has_session = True
-        if re.search(r'\.abort\s*\(', content):
-            has_abort = True
-
-    if has_session and not has_abort:
-        result("WARN", "lifecycle/soup-session-abort",
-               "Soup.Session created but no .abort() found — "
-               "pending requests will continue after disable()")
-    elif has_session and has_abort:
-        result("PASS", "lifecycle/soup-session-abort",
-               "Soup.Session with .abort() cleanup detected")
-    # If no session, skip silently
-
-
-def check_widget_lifecycle(ext_dir):
-    """Detect widgets created in enable() but not destroyed in disable()."""
-    ext_file = os.path.join(ext_dir, 'extension.js')
-    if not os.path.isfile(ext_file):
-        return
 
-    content = read_file(ext_file)
-    clean = strip_comments(content)
-    lines = clean.splitlines()
+    SESSION_RE = re.compile(r'new\s+Soup\.Session|Soup\.Session\.new')
+    ABORT_RE = re.compile(r'\.abort\s*\(')
+
+    def __init__(self, ctx):
+        super().__init__(ctx)
+        self.has_session = False
+        self.has_abort = False
+
+    def visit_file(self, f):
+        content = f.code
+        if not self.has_session and self.SESSION_RE.search(content):
+            self.has_session = True
+        if not self.has_abort and self.ABORT_RE.search(content):
+            self.has_abort = True
+
+    def finish(self):
+        if self.has_session and not self.has_abort:
+            result("WARN", "lifecycle/soup-session-abort",
+                   "Soup.Session created but no .abort() found — "
+                   "pending requests will continue after disable()")
+        elif self.has_session and self.has_abort:
+            result("PASS", "lifecycle/soup-session-abort",
+                   "Soup.Session with .abort() cleanup detected")
+        # If no session, skip silently
+
+
+class DestroyThenNullCheck(LifecycleCheck):
+    """GAP-004: destroy() calls should be followed by null assignment."""
+
+    trigger = re.compile(r'destroy')
+
+    # Match this._xxx.destroy() or this._xxx?.destroy()
+    DESTROY_RE = re.compile(r'(this\._\w+)\??\.\bdestroy\s*\(')
+
+    def __init__(self, ctx):
+        super().__init__(ctx)
+        self.violations = []
+
+    def visit_line(self, f, index):
+        stripped = f.lines[index].strip()
+        if stripped.startswith('//') or stripped.startswith('*'):
+            return
+        m = self.DESTROY_RE.search(stripped)
+        if not m:
+            return
+        prop = m.group(1)[len('this.'):]  # e.g. _widget
+        # Look ahead 5 lines for null assignment
+        starts = f.src.line_starts
+        start = starts[index]
+        end = starts[index + 6] if index + 6 < len(starts) else len(f.text)
+        resets = lifecycle.index(f.src).null_resets.get(prop, ())
+        if not any(start <= pos < end for pos in resets):
+            self.violations.append(f"{f.rel}:{index + 1}")
+            if len(self.violations) >= 5:
+                self.done = True
+
+    def finish(self):
+        if not self.files_seen:
+            return
+
+        if self.violations:
+            for loc in self.violations:
+                result("WARN", "lifecycle/destroy-no-null",
+                       f"{loc}: .destroy() without null assignment — "
+                       f"set reference to null after destroy to prevent stale access")
+        else:
+            result("PASS", "lifecycle/destroy-no-null",
+                   "All destroy() calls followed by null assignment")
+
+
+class WidgetLifecycleCheck(LifecycleCheck):
+    """Detect widgets created in enable() but not destroyed in disable()."""
 
     # Find widgets assigned to this._xxx in enable()
-    widget_re = re.compile(
+    WIDGET_RE = re.compile(
         r'this\.(_\w+)\s*=\s*new\s+'
         r'(St\.\w+|PanelMenu\.\w+|PopupMenu\.\w+|Clutter\.\w+)')
-    destroy_re_template = r'this\.{name}\.(destroy|remove_child|remove_all_children)\s*\('
-    null_re_template = r'this\.{name}\s*=\s*null'
-
-    in_enable = False
-    in_disable = False
-    brace_depth = 0
-    created_widgets = {}  # name -> line number
-
-    for i, line in enumerate(lines):
-        stripped = line.strip()
-        if re.search(r'\benable\s*\(', stripped):
-            in_enable = True
-            brace_depth = 0
-        if re.search(r'\bdisable\s*\(', stripped):
-            in_disable = True
-            brace_depth = 0
-
-        if in_enable:
-            brace_depth += stripped.count('{') - stripped.count('}')
-            m = widget_re.search(stripped)
-            if m:
-                created_widgets[m.group(1)] = i + 1
-            if brace_depth <= 0 and '{' in stripped:
-                in_enable = False
-
-        if in_disable:
-            brace_depth += stripped.count('{') - stripped.count('}')
-            if brace_depth <= 0 and '{' in stripped:
-                in_disable = False
-
-    if not created_widgets:
-        result("PASS", "lifecycle/widget-destroy", "No widgets tracked in enable()")
-        return
-
-    # Check if each widget is destroyed or nulled in disable()
-    leaked = []
-    for name, lineno in created_widgets.items():
-        destroy_pat = destroy_re_template.format(name=re.escape(name))
-        null_pat = null_re_template.format(name=re.escape(name))
-        if not re.search(destroy_pat, clean) and not re.search(null_pat, clean):
-            leaked.append(f"{name}(L{lineno})")
-
-    if leaked:
-        result("WARN", "lifecycle/widget-destroy",
-               f"Widget(s) created in enable() but not destroyed/nulled in disable(): "
-               f"{', '.join(leaked[:5])}")
-    else:
-        result("PASS", "lifecycle/widget-destroy",
-               f"All {len(created_widgets)} widget(s) properly cleaned up")
-
-
-def check_settings_cleanup(ext_dir):
+    CLEANUP_CALLS = frozenset({'destroy', 'remove_child', 'remove_all_children'})
+
+    def finish(self):
+        if self.ctx.extension is None:
+            return
+
+        index = self.ctx.lifecycle
+        src = index.src
+        created_widgets = {}  # name -> line number
+        enable = index.enable
+        if enable is not None:
+            for m in self.WIDGET_RE.finditer(src.code, enable.body[0] + 1, enable.body[1]):
+                created_widgets[m.group(1)] = src.line_of(m.start())
+
+        if not created_widgets:
+            result("PASS", "lifecycle/widget-destroy", "No widgets tracked in enable()")
+            return
+
+        # Check if each widget is destroyed or nulled in disable()
+        leaked = []
+        for name, lineno in created_widgets.items():
+            if (name not in index.null_resets
+                    and not self.CLEANUP_CALLS & index.field_calls.get(name, set())):
+                leaked.append(f"{name}(L{lineno})")
+
+        if leaked:
+            result("WARN", "lifecycle/widget-destroy",
+                   f"Widget(s) created in enable() but not destroyed/nulled in disable(): "
+                   f"{', '.join(leaked[:5])}")
+        else:
+            result("PASS", "lifecycle/widget-destroy",
+                   f"All {len(created_widgets)} widget(s) properly cleaned up")
+
+
+class SettingsCleanupCheck(LifecycleCheck):
     """Detect getSettings() without cleanup in disable()."""
-    ext_file = os.path.join(ext_dir, 'extension.js')
-    if not os.path.isfile(ext_file):
-        return
-
-    content = read_file(ext_file)
-    clean = strip_comments(content)
-
-    # Check for this._settings = this.getSettings() or similar
-    settings_assign = re.findall(
-        r'this\.(_\w+)\s*=\s*(?:this\.getSettings|new\s+Gio\.Settings)\s*\(', clean)
-    if not settings_assign:
-        result("PASS", "lifecycle/settings-cleanup", "No settings objects tracked")
-        return
-
-    leaked = []
-    for name in settings_assign:
-        null_pat = rf'this\.{re.escape(name)}\s*=\s*null'
-        if not re.search(null_pat, clean):
-            leaked.append(name)
-
-    if leaked:
-        result("WARN", "lifecycle/settings-cleanup",
-               f"Settings object(s) not nulled in disable(): {', '.join(leaked)}")
-    else:
-        result("PASS", "lifecycle/settings-cleanup",
-               f"All settings objects properly cleaned up")
+
+    SETTINGS_ASSIGN_RE = re.compile(
+        r'this\.(_\w+)\s*=\s*(?:this\.getSettings|new\s+Gio\.Settings)\s*\(')
+
+    def finish(self):
+        if self.ctx.extension is None:
+            return
+
+        # Check for this._settings = this.getSettings() or similar
+        settings_assign = self.SETTINGS_ASSIGN_RE.findall(self.ctx.extension.code)
+        if not settings_assign:
+            result("PASS", "lifecycle/settings-cleanup", "No settings objects tracked")
+            return
+
+        null_resets = self.ctx.lifecycle.null_resets
+        leaked = [name for name in settings_assign if name not in null_resets]
+
+        if leaked:
+            result("WARN", "lifecycle/settings-cleanup",
+                   f"Settings object(s) not nulled in disable(): {', '.join(leaked)}")
+        else:
+            result("PASS", "lifecycle/settings-cleanup",
+                   f"All settings objects properly cleaned up")
+
+
+# Output order; each check prints from finish() after the shared pass
+CHECKS = (
+    EnableDisableCheck,
+    DefaultExportCheck,
+    SignalBalanceCheck,
+    UntrackedTimeoutsCheck,
+    TimeoutRemovalInDisableCheck,
+    ConnectObjectMigrationCheck,
+    AsyncDestroyedGuardCheck,
+    TimeoutReturnValueCheck,
+    KeybindingCleanupCheck,
+    DbusProxyLifecycleCheck,
+    FileMonitorLifecycleCheck,
+    InjectionManagerCheck,
+    LockscreenSignalsCheck,
+    SelectiveDisableCheck,
+    UnlockDialogCommentCheck,
+    ClipboardKeybindingCheck,
+    PkexecUserWritableCheck,
+    DbusExportLifecycleCheck,
+    TimeoutReassignmentCheck,
+    SubprocessCancellationCheck,
+    ClipboardNetworkCheck,
+    SoupSessionAbortCheck,
+    DestroyThenNullCheck,
+    WidgetLifecycleCheck,
+    SettingsCleanupCheck,
+)
 
 
 def main():
@@ -975,31 +989,8 @@ def main():
 
     ext_dir = os.path.realpath(sys.argv[1])
 
-    check_enable_disable(ext_dir)
-    check_default_export(ext_dir)
-    check_signal_balance(ext_dir)
-    check_untracked_timeouts(ext_dir)
-    check_timeout_removal_in_disable(ext_dir)
-    check_connect_object_migration(ext_dir)
-    check_async_destroyed_guard(ext_dir)
-    check_timeout_return_value(ext_dir)
-    check_keybinding_cleanup(ext_dir)
-    check_dbus_proxy_lifecycle(ext_dir)
-    check_file_monitor_lifecycle(ext_dir)
-    check_injection_manager(ext_dir)
-    check_lockscreen_signals(ext_dir)
-    check_selective_disable(ext_dir)
-    check_unlock_dialog_comment(ext_dir)
-    check_clipboard_keybinding(ext_dir)
-    check_pkexec_user_writable(ext_dir)
-    check_dbus_export_lifecycle(ext_dir)
-    check_timeout_reassignment(ext_dir)
-    check_subprocess_cancellation(ext_dir)
-    check_clipboard_network(ext_dir)
-    check_soup_session_abort(ext_dir)
-    check_destroy_then_null(ext_dir)
-    check_widget_lifecycle(ext_dir)
-    check_settings_cleanup(ext_dir)
+    ctx = LifecycleContext(ext_dir)
+    run(find_js_files(ext_dir), [check(ctx) for check in CHECKS])
 
 
 if __name__ == '__main__':
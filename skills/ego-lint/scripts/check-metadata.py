@@ -6,11 +6,13 @@ Usage: check-metadata.py EXTENSION_DIR
 Output: one line per check in PIPE-delimited format: STATUS|check-name|detail
 """
 
-import json
 import os
 import re
 import sys
 
+from ego_lint import extfs, metadata
+from ego_lint.passes import find_js_files
+
 
 def result(status, check, detail):
     print(f"{status}|{check}|{detail}")
@@ -139,20 +141,17 @@ def main():
         sys.exit(1)
 
     ext_dir = os.path.realpath(sys.argv[1])
-    metadata_path = os.path.join(ext_dir, "metadata.json")
     dir_name = os.path.basename(ext_dir)
 
     # --- Existence and valid JSON ---
-    if not os.path.isfile(metadata_path):
+    model = metadata.load(ext_dir)
+    if not model.exists:
         result("FAIL", "metadata/exists", "metadata.json not found")
         return
-
-    try:
-        with open(metadata_path, "r", encoding="utf-8") as f:
-            meta = json.load(f)
-    except json.JSONDecodeError as e:
-        result("FAIL", "metadata/valid-json", f"Invalid JSON: {e}")
+    if not model.valid:
+        result("FAIL", "metadata/valid-json", f"Invalid JSON: {model.error}")
         return
+    meta = model.data
 
     result("PASS", "metadata/valid-json", "metadata.json is valid JSON")
 
@@ -172,8 +171,10 @@ def main():
         else:
             result("FAIL", "metadata/uuid-format", f"UUID contains invalid characters: {uuid}")
 
-        # UUID matches directory name
-        if uuid == dir_name:
+        # UUID matches directory name (a zip is installed under its UUID)
+        if extfs.is_zip(ext_dir):
+            result("SKIP", "metadata/uuid-matches-dir", "Linting a zip package — installed under its UUID")
+        elif uuid == dir_name:
             result("PASS", "metadata/uuid-matches-dir", f"UUID matches directory name")
         else:
             result("FAIL", "metadata/uuid-matches-dir", f"UUID '{uuid}' does not match directory '{dir_name}'")
@@ -242,10 +243,10 @@ def main():
 
     # --- Missing gettext-domain with locale/ ---
     locale_dir = os.path.join(ext_dir, 'locale')
-    if os.path.isdir(locale_dir) and 'gettext-domain' not in meta:
+    if extfs.isdir(locale_dir) and 'gettext-domain' not in meta:
         result("WARN", "metadata/missing-gettext-domain",
                "locale/ directory exists but gettext-domain not set in metadata.json")
-    elif os.path.isdir(locale_dir):
+    elif extfs.isdir(locale_dir):
         result("PASS", "metadata/gettext-domain", "gettext-domain set with locale/ directory")
 
     # --- Future shell-version ---
@@ -271,8 +272,9 @@ def main():
     check_url_field(meta)
     check_shell_version_dev_limit(meta)
     check_esm_version_floor(meta, ext_dir)
-    check_session_modes_consistency(meta, ext_dir)
-    check_gettext_domain_consistency(meta, ext_dir)
+    js_files = find_js_files(ext_dir)
+    check_session_modes_consistency(meta, js_files)
+    check_gettext_domain_consistency(meta, js_files)
 
 
 def check_gnome_trademark(meta):
@@ -346,7 +348,11 @@ def check_shell_version_dev_limit(meta):
                "shell-version has at most 1 development release")
 
 
-def check_session_modes_consistency(meta, ext_dir):
+SESSION_MODE_RE = re.compile(r"sessionMode\.(currentMode|isLocked)")
+DGETTEXT_RE = re.compile(r"dgettext\s*\(\s*['\"]([^'\"]+)['\"]")
+
+
+def check_session_modes_consistency(meta, js_files):
     """Warn if code references sessionMode but metadata doesn't declare unlock-dialog."""
     sm = meta.get("session-modes")
     if isinstance(sm, list) and "unlock-dialog" in sm:
@@ -354,24 +360,11 @@ def check_session_modes_consistency(meta, ext_dir):
                "session-modes includes 'unlock-dialog'")
         return
 
-    session_mode_re = re.compile(r"sessionMode\.(currentMode|isLocked)")
     found = []
-    for root, _dirs, files in os.walk(ext_dir):
-        for fname in files:
-            if not fname.endswith(".js"):
-                continue
-            fpath = os.path.join(root, fname)
-            rel = os.path.relpath(fpath, ext_dir)
-            try:
-                with open(fpath, encoding="utf-8", errors="replace") as f:
-                    for lineno, line in enumerate(f, 1):
-                        stripped = line.lstrip()
-                        if stripped.startswith("//") or stripped.startswith("*"):
-                            continue
-                        if session_mode_re.search(line):
-                            found.append(f"{rel}:{lineno}")
-            except OSError:
-                continue
+    for f in js_files:
+        for index in f.lines_matching(SESSION_MODE_RE):
+            if not f.lines[index].lstrip().startswith(("//", "*")):
+                found.append(f"{f.rel}:{index + 1}")
 
     if found:
         for loc in found:
@@ -399,36 +392,26 @@ def check_esm_version_floor(meta, ext_dir):
     if not pre_esm:
         return
     ext_js = os.path.join(ext_dir, "extension.js")
-    if os.path.isfile(ext_js):
-        with open(ext_js, encoding="utf-8", errors="replace") as f:
-            content = f.read()
+    if extfs.isfile(ext_js):
+        content = extfs.read_text(ext_js)
         if "import " in content and "from " in content:
             result("FAIL", "metadata/shell-version-esm-floor",
                    f"shell-version includes pre-ESM version(s) ({', '.join(pre_esm)}) "
                    "but extension uses ESM imports (GNOME 45+ only)")
 
-def check_gettext_domain_consistency(meta, ext_dir):
+def check_gettext_domain_consistency(meta, js_files):
     """WARN if gettext-domain in metadata doesn't match dgettext() calls in JS."""
     domain = meta.get("gettext-domain")
     if not domain:
         return
 
-    skip_dirs = {'node_modules', '.git', '__pycache__'}
     mismatches = []
-
-    for root, dirs, files in os.walk(ext_dir):
-        dirs[:] = [d for d in dirs if d not in skip_dirs]
-        for fn in files:
-            if not fn.endswith('.js'):
-                continue
-            fp = os.path.join(root, fn)
-            with open(fp, encoding='utf-8', errors='replace') as f:
-                for i, line in enumerate(f, 1):
-                    m = re.search(r"dgettext\s*\(\s*['\"]([^'\"]+)['\"]", line)
-                    if m and m.group(1) != domain:
-                        rel = os.path.relpath(fp, ext_dir)
-                        mismatches.append(
-                            f"{rel}:{i} uses '{m.group(1)}' instead of '{domain}'")
+    for f in js_files:
+        for index in f.lines_matching(DGETTEXT_RE):
+            m = DGETTEXT_RE.search(f.lines[index])
+            if m and m.group(1) != domain:
+                mismatches.append(
+                    f"{f.rel}:{index + 1} uses '{m.group(1)}' instead of '{domain}'")
 
     if mismatches:
         result("WARN", "metadata/gettext-domain-mismatch",
@@ -0,0 +1,531 @@
+#!/usr/bin/env python3
+"""check-package.py — Validate zip package contents for EGO compliance.
+
+Usage: check-package.py (EXTENSION_DIR | EXTENSION_ZIP)
+
+Checks that the extension zip (the first *.zip in EXTENSION_DIR, or the zip
+being linted) does not include forbidden files and does include required
+files, that no member is a decompression bomb, corrupt or a duplicate of
+another, and where the package's bytes go.
+
+The zip is opened and its central directory read once. Every entry is classified by one
+matcher built from FORBIDDEN_PATTERNS, and its compressed and uncompressed
+sizes come from the directory record. Members are then streamed once, in
+HASH_CHUNK pieces, through SHA-256 (zipfile verifies each CRC-32 on the way),
+so memory stays bounded whatever the member sizes; bombs are never inflated.
+
+The bomb limits also apply to the archive as a whole: thousands of members
+just under MIN_BOMB_SIZE, or large members just under the ratio, inflate to
+gigabytes without any one of them being flagged. When the declared sizes of
+the members that are not bombs themselves add up to more than
+MAX_UNCOMPRESSED_SIZE, or expand over MAX_COMPRESSION_RATIO together,
+nothing is inflated and the integrity and duplicate checks are skipped.
+zipfile never inflates a member past its declared size, so the declared
+total bounds the work. The limits are ego_lint/extfs.py's, which applies
+them to every other check reading the zip.
+
+Output: PIPE-delimited lines: STATUS|check-name|detail
+"""
+
+import hashlib
+import os
+import sys
+import zipfile
+import zlib
+
+from ego_lint import extfs, metadata
+
+
+def result(status, check, detail):
+    print(f"{status}|{check}|{detail}")
+
+
+MAX_PACKAGE_SIZE = 5 * 1024 * 1024
+# Shared with ego_lint/extfs.py, which holds every other check to them
+MAX_COMPRESSION_RATIO = extfs.MAX_COMPRESSION_RATIO
+MIN_BOMB_SIZE = extfs.MIN_BOMB_SIZE
+MAX_UNCOMPRESSED_SIZE = extfs.MAX_UNCOMPRESSED_SIZE
+LARGE_ENTRY_SIZE = 1024 * 1024
+# Identical members smaller than this (stub modules, empty translations) are
+# not worth reporting
+MIN_DUPLICATE_SIZE = 1024
+HASH_CHUNK = 64 * 1024
+# What zipfile raises for a member it cannot decompress
+MEMBER_ERRORS = (zipfile.BadZipFile, zlib.error, EOFError, NotImplementedError, RuntimeError)
+MAX_LISTED = 5
+LARGEST_LISTED = 3
+
+# Three kinds of pattern, as reviewers phrase them:
+#   'dir/'    any path containing it
+#   '.ext'    a file named exactly that, else any path ending with it
+#   'name'    a file with exactly that name, at any depth
+FORBIDDEN_PATTERNS = (
+    # Version control and AI tool artifacts
+    "node_modules/",
+    ".git/",
+    ".github/",
+    ".claude/",
+    "CLAUDE.md",
+    ".cursorrules",
+    ".cursor/",
+    ".windsurf/",
+    ".aider",
+    "cline_docs/",
+    ".github/copilot-instructions.md",
+    # Build artifacts
+    ".po",
+    ".pot",
+    ".pyc",
+    "__pycache__/",
+    # Secrets
+    ".env",
+    # Development files
+    ".gitignore",
+    "package.json",
+    "package-lock.json",
+    "eslint.config.mjs",
+    "eslint.config.js",
+    "eslint.config.cjs",
+    ".eslintrc",
+    ".eslintrc.js",
+    ".eslintrc.json",
+    ".eslintrc.yml",
+    "Makefile",
+    ".editorconfig",
+    ".prettierrc",
+    ".prettierrc.js",
+    ".prettierrc.json",
+    ".prettierrc.yml",
+    ".prettierignore",
+    ".vscode/",
+    ".idea/",
+    "webpack.config.js",
+    "webpack.config.mjs",
+    "rollup.config.js",
+    "rollup.config.mjs",
+    "jest.config.js",
+    "jest.config.ts",
+    "vitest.config.js",
+    "vitest.config.ts",
+    # CI/CD and containerization
+    ".gitlab-ci.yml",
+    "Dockerfile",
+    "docker-compose.yml",
+    "docker-compose.yaml",
+    # Documentation (not needed at runtime)
+    "CONTRIBUTING.md",
+    "CODE_OF_CONDUCT.md",
+    "README.md",
+    # Additional build/dev artifacts
+    "dist/",
+    "build/",
+    ".npmrc",
+    "yarn.lock",
+    "pnpm-lock.yaml",
+    "tsconfig.json",
+    "tsconfig.build.json",
+    ".babelrc",
+    # Source maps
+    ".map",
+    # Development artifacts
+    "env.d.ts",
+    "jsconfig.json",
+    ".old",
+    ".bak",
+    ".orig",
+    ".swp",
+    ".swo",
+    "meson.build",
+    "CHANGELOG.md",
+    "convenience.js",
+)
+
+REQUIRED_FILES = ('extension.js', 'metadata.json')
+
+
+class ForbiddenMatcher:
+    """All FORBIDDEN_PATTERNS as hash lookups, so each entry is matched once.
+
+    `match(name)` yields (pattern, exact) for every pattern the entry hits;
+    `exact` tells a '.ext' pattern naming the whole file from a suffix match.
+    """
+
+    def __init__(self, patterns):
+        self.dirs = {p for p in patterns if p.endswith('/')}
+        self.dir_lengths = sorted({len(p) for p in self.dirs})
+        self.suffixes = {p for p in patterns if p.startswith('.') and p not in self.dirs}
+        self.names = {p for p in patterns if p not in self.dirs and p not in self.suffixes}
+
+    def match(self, name):
+        # 'dir/' patterns end at one of the entry's slashes
+        hits = set()
+        slash = name.find('/')
+        while slash >= 0:
+            end = slash + 1
+            for length in self.dir_lengths:
+                if length <= end and name[end - length:end] in self.dirs:
+                    hits.add(name[end - length:end])
+            slash = name.find('/', end)
+        for pattern in hits:
+            yield pattern, True
+        # '.ext' patterns start at one of the entry's dots
+        dot = name.find('.')
+        while dot >= 0:
+            suffix = name[dot:]
+            if suffix in self.suffixes:
+                yield suffix, dot == 0 or name[dot - 1] == '/'
+            dot = name.find('.', dot + 1)
+        base = name.rsplit('/', 1)[-1]
+        if base in self.names:
+            yield base, True
+
+
+FORBIDDEN = ForbiddenMatcher(FORBIDDEN_PATTERNS)
+
+
+class Entry:
+    """One central-directory record of the package."""
+
+    __slots__ = ('info', 'name', 'size', 'compressed', 'forbidden', 'digest')
+
+    def __init__(self, info):
+        self.info = info
+        self.name = info.filename
+        self.size = info.file_size
+        self.compressed = info.compress_size
+        self.forbidden = list(FORBIDDEN.match(self.name))
+        self.digest = None
+
+    @property
+    def is_dir(self):
+        return self.name.endswith('/')
+
+    @property
+    def ratio(self):
+        if not self.size:
+            return 0.0
+        return self.size / self.compressed if self.compressed else float('inf')
+
+    @property
+    def is_bomb(self):
+        return extfs.expands_like_bomb(self.size, self.compressed)
+
+
+class Package:
+    """Every entry of a zip, classified in one pass over its central directory.
+
+    The zip stays open, for the members that are read, until close().
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.zip = zipfile.ZipFile(path)
+        self.entries = [Entry(info) for info in self.zip.infolist()]
+        self.names = {e.name for e in self.entries}
+        self.basenames = {e.name.rsplit('/', 1)[-1] for e in self.entries}
+        self.schemas = any(e.name.endswith('.gschema.xml') for e in self.entries)
+        self.compiled_schemas = any('gschemas.compiled' in e.name for e in self.entries)
+        self.nested_zips = [e.name for e in self.entries if e.name.endswith('.zip')]
+        # Bomb members are never inflated; the whole-archive limits bound the rest
+        self.inflated = [e for e in self.entries if not e.is_bomb]
+        self.total_size = sum(e.size for e in self.inflated)
+        self.total_compressed = sum(e.compressed for e in self.inflated)
+        self.corrupt = []  # (name, reason)
+        self._hashed = False
+
+    def close(self):
+        self.zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def ratio(self):
+        """How many times over the whole archive expands."""
+        if not self.total_size:
+            return 0.0
+        if not self.total_compressed:
+            return float('inf')
+        return self.total_size / self.total_compressed
+
+    @property
+    def too_large(self):
+        return self.total_size > MAX_UNCOMPRESSED_SIZE
+
+    @property
+    def is_bomb(self):
+        """Whether the archive as a whole expands like a zip bomb."""
+        return extfs.expands_like_bomb(self.total_size, self.total_compressed)
+
+    @property
+    def inflatable(self):
+        """Whether members may be decompressed at all."""
+        return not (self.too_large or self.is_bomb)
+
+    def forbidden_counts(self):
+        """{pattern: matching entries}, in FORBIDDEN_PATTERNS order.
+
+        A '.ext' pattern counts the entries it names exactly when there are
+        any, and the entries merely ending with it otherwise.
+        """
+        exact = {}
+        loose = {}
+        for entry in self.entries:
+            for pattern, is_exact in entry.forbidden:
+                counts = exact if is_exact else loose
+                counts[pattern] = counts.get(pattern, 0) + 1
+        counts = {}
+        for pattern in FORBIDDEN_PATTERNS:
+            count = exact.get(pattern, 0) or loose.get(pattern, 0)
+            if count:
+                counts[pattern] = count
+        return counts
+
+    def hash_members(self):
+        """Stream every member through SHA-256 once, recording corrupt ones.
+
+        Does nothing for a package over the whole-archive bomb limits.
+        """
+        if self._hashed or not self.inflatable:
+            return
+        self._hashed = True
+        for entry in self.entries:
+            if entry.is_dir or entry.is_bomb:
+                continue
+            digest = hashlib.sha256()
+            try:
+                with self.zip.open(entry.info) as f:
+                    for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+                        digest.update(chunk)
+            except MEMBER_ERRORS as e:
+                self.corrupt.append((entry.name, str(e)))
+                continue
+            entry.digest = digest.hexdigest()
+
+    def duplicates(self):
+        """Groups of members with identical content, most bytes wasted first."""
+        self.hash_members()
+        groups = {}
+        for entry in self.entries:
+            if entry.digest is not None and entry.size >= MIN_DUPLICATE_SIZE:
+                groups.setdefault((entry.size, entry.digest), []).append(entry)
+        return sorted((g for g in groups.values() if len(g) > 1),
+                      key=lambda g: -g[0].size * (len(g) - 1))
+
+    def largest(self, count=LARGEST_LISTED):
+        """The biggest members by uncompressed size."""
+        files = [e for e in self.entries if not e.is_dir]
+        return sorted(files, key=lambda e: -e.size)[:count]
+
+    def read_metadata(self):
+        """Metadata of the metadata.json at the zip root (empty when absent).
+
+        Held to the same limits as hash_members(): a metadata.json that must
+        not or cannot be decompressed gives Metadata with an error.
+        """
+        entry = next((e for e in self.entries if e.name == 'metadata.json'), None)
+        if entry is None:
+            return metadata.Metadata('metadata.json', False)
+        if entry.is_bomb or not self.inflatable:
+            return metadata.Metadata('metadata.json', True, 'Not decompressed: zip bomb limits')
+        try:
+            with self.zip.open(entry.info) as f:
+                text = f.read().decode('utf-8', errors='replace')
+        except MEMBER_ERRORS as e:
+            return metadata.Metadata('metadata.json', True, str(e))
+        return metadata.Metadata.parse(text)
+
+
+def megabytes(size):
+    """Size in MB with one (truncated) decimal, e.g. '5.7MB'."""
+    tenths = size * 10 // (1024 * 1024)
+    return f"{tenths // 10}.{tenths % 10}MB"
+
+
+def human_size(size):
+    """Size in bytes, KB or MB, whichever reads best."""
+    if size < 1024:
+        return f"{size}B"
+    if size < 1024 * 1024:
+        return f"{size / 1024:.1f}KB"
+    return megabytes(size)
+
+
+def find_package(target):
+    """The zip to check: the target itself, or the first *.zip in the directory."""
+    if os.path.isfile(target):
+        return os.path.abspath(target)
+    try:
+        with os.scandir(target) as it:
+            for entry in it:
+                if entry.name.endswith('.zip') and entry.is_file():
+                    return entry.path
+    except OSError:
+        pass
+    return None
+
+
+def check_forbidden(package):
+    counts = package.forbidden_counts()
+    for pattern, count in counts.items():
+        result("FAIL", "package/no-forbidden",
+               f"Found forbidden content: {pattern} ({count} match(es))")
+    if not counts:
+        result("PASS", "package/no-forbidden", "No forbidden files found in package")
+
+
+def check_required(package):
+    for name in REQUIRED_FILES:
+        if name in package.basenames:
+            result("PASS", f"package/has-{name}", f"{name} found in package")
+        else:
+            result("FAIL", f"package/has-{name}", f"{name} missing from package")
+
+
+def check_nested_structure(package):
+    # extension.js should be at root, not inside a subdirectory
+    nested = any(name.count('/') == 1 and name.endswith('/extension.js') and name[0] != '/'
+                 for name in package.names)
+    if nested and 'extension.js' not in package.names:
+        result("FAIL", "package/nested-structure",
+               "extension.js is inside a subdirectory — files must be at zip root")
+
+
+def check_compiled_schemas(package):
+    # Unnecessary for GNOME 44+, forbidden for 45+
+    if not package.schemas:
+        return
+    if not package.compiled_schemas:
+        result("PASS", "package/compiled-schemas", "No unnecessary gschemas.compiled")
+    elif any(v >= 45 for v in package.read_metadata().shell_versions):
+        result("FAIL", "package/compiled-schemas-forbidden",
+               "gschemas.compiled must not be included for GNOME 45+ (auto-compiled by Shell)")
+    else:
+        result("WARN", "package/compiled-schemas-unnecessary",
+               "gschemas.compiled is unnecessary for GNOME 44+ (auto-compiled by Shell)")
+
+
+def check_nested_zips(package):
+    if package.nested_zips:
+        result("WARN", "package/nested-zip", "Found nested zip file(s) in package")
+
+
+def check_compression_ratio(package):
+    bombs = [e for e in package.entries if e.is_bomb]
+    if bombs:
+        listed = ', '.join(f"{e.name} ({human_size(e.compressed)} -> {human_size(e.size)})"
+                           for e in bombs[:MAX_LISTED])
+        result("FAIL", "package/compression-ratio",
+               f"{len(bombs)} member(s) expand over {MAX_COMPRESSION_RATIO}x — "
+               f"possible zip bomb: {listed}")
+    sizes = f"{human_size(package.total_compressed)} -> {human_size(package.total_size)}"
+    if package.too_large:
+        result("FAIL", "package/compression-ratio",
+               f"Package expands to more than {megabytes(MAX_UNCOMPRESSED_SIZE)} "
+               f"({sizes} in {len(package.inflated)} entries) — possible zip bomb")
+    if package.is_bomb:
+        result("FAIL", "package/compression-ratio",
+               f"Package expands {int(package.ratio)}x overall ({sizes}) — possible zip bomb")
+    if not bombs and package.inflatable:
+        result("PASS", "package/compression-ratio",
+               f"Nothing expands over {MAX_COMPRESSION_RATIO}x, per member or overall")
+
+
+def list_largest(package):
+    total = sum(e.size for e in package.entries) or 1
+    return ', '.join(f"{e.name} ({human_size(e.size)}, {100 * e.size // total}%)"
+                     for e in package.largest() if e.size)
+
+
+def check_size(zip_path, package):
+    zip_size = os.path.getsize(zip_path)
+    if zip_size <= MAX_PACKAGE_SIZE:
+        result("PASS", "package/size", "Package size OK")
+        return
+    detail = f"Package is {megabytes(zip_size)} — consider reducing (recommended: under 5MB)"
+    if package is not None:
+        detail += f"; largest members: {list_largest(package)}"
+    result("WARN", "package/size", detail)
+
+
+def check_largest_members(package):
+    large = sum(1 for e in package.entries if e.size > LARGE_ENTRY_SIZE)
+    listed = list_largest(package)
+    if large:
+        result("WARN", "package/largest-members",
+               f"{large} member(s) over {megabytes(LARGE_ENTRY_SIZE)} uncompressed — "
+               f"largest: {listed}")
+    elif listed:
+        result("PASS", "package/largest-members", f"Largest: {listed}")
+
+
+def skip_uninflatable(package, check):
+    """Report `check` as skipped when the package must not be decompressed."""
+    if package.inflatable:
+        return False
+    result("SKIP", check, "Members not decompressed: package exceeds the zip bomb limits")
+    return True
+
+
+def check_integrity(package):
+    if skip_uninflatable(package, "package/integrity"):
+        return
+    package.hash_members()
+    if package.corrupt:
+        listed = ', '.join(f"{name} ({reason})" for name, reason in package.corrupt[:MAX_LISTED])
+        result("FAIL", "package/integrity",
+               f"{len(package.corrupt)} member(s) cannot be read back intact: {listed}")
+    else:
+        result("PASS", "package/integrity", "Every member decompresses and matches its CRC-32")
+
+
+def check_duplicate_content(package):
+    if skip_uninflatable(package, "package/duplicate-content"):
+        return
+    groups = package.duplicates()
+    if not groups:
+        result("PASS", "package/duplicate-content", "No duplicated members")
+        return
+    wasted = sum(g[0].size * (len(g) - 1) for g in groups)
+    listed = '; '.join(f"{' = '.join(e.name for e in g)} ({human_size(g[0].size)})"
+                       for g in groups[:MAX_LISTED])
+    result("WARN", "package/duplicate-content",
+           f"{len(groups)} blob(s) stored more than once, wasting {human_size(wasted)}: {listed}")
+
+
+def main():
+    if len(sys.argv) < 2:
+        result("FAIL", "package/args", "No extension directory provided")
+        sys.exit(1)
+
+    zip_path = find_package(sys.argv[1])
+    if zip_path is None:
+        result("SKIP", "package/exists", "No zip package found in extension directory")
+        return
+    result("PASS", "package/exists", f"Found package: {os.path.basename(zip_path)}")
+
+    try:
+        package = Package(zip_path)
+    except (OSError, zipfile.BadZipFile) as e:
+        check_size(zip_path, None)
+        result("FAIL", "package/contents", f"Cannot read zip: {e}")
+        return
+    with package:
+        check_size(zip_path, package)
+
+        check_forbidden(package)
+        check_required(package)
+        check_nested_structure(package)
+        check_compiled_schemas(package)
+        check_nested_zips(package)
+        check_compression_ratio(package)
+        check_integrity(package)
+        check_duplicate_content(package)
+        check_largest_members(package)
+
+
+if __name__ == '__main__':
+    main()
@@ -17,17 +17,13 @@ import os
 import re
 import sys
 
+from ego_lint import extfs, jstokens
+
 
 def result(status, check, detail):
     print(f"{status}|{check}|{detail}")
 
 
-def strip_comments(content):
-    content = re.sub(r'/\*.*?\*/', '', content, flags=re.DOTALL)
-    content = re.sub(r'//.*$', '', content, flags=re.MULTILINE)
-    return content
-
-
 def main():
     if len(sys.argv) < 2:
         result("FAIL", "prefs/args", "No extension directory provided")
@@ -36,14 +32,13 @@ def main():
     ext_dir = os.path.realpath(sys.argv[1])
     prefs_path = os.path.join(ext_dir, 'prefs.js')
 
-    if not os.path.isfile(prefs_path):
+    if not extfs.isfile(prefs_path):
         result("SKIP", "prefs/exists", "No prefs.js found")
         return
 
-    with open(prefs_path, encoding='utf-8', errors='replace') as f:
-        raw_content = f.read()
-
-    content = strip_comments(raw_content)
+    src = jstokens.load(prefs_path)
+    raw_content = src.text
+    content = src.code
 
     # Dual prefs pattern check
     has_widget = bool(re.search(r'\bgetPreferencesWidget\b', content))
@@ -26,6 +26,8 @@ import os
 import subprocess
 import sys
 
+from ego_lint import extfs
+
 
 def result(status, check, detail):
     print(f"{status}|{check}|{detail}")
@@ -74,7 +76,7 @@ def main():
         sys.exit(1)
 
     ext_dir = os.path.realpath(sys.argv[1])
-    if not os.path.isdir(ext_dir):
+    if not extfs.isdir(ext_dir):
         print(f"Error: {ext_dir} is not a directory", file=sys.stderr)
         sys.exit(1)
 
@@ -90,7 +92,7 @@ def main():
     # Run the graph builder as a subprocess
     try:
         proc = subprocess.run(
-            [sys.executable, graph_builder, ext_dir],
+            [sys.executable, graph_builder, '--compact', ext_dir],
             capture_output=True,
             text=True,
             timeout=30,
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""check-schema.py — Validate GSettings schemas for EGO compliance.
+
+Usage: check-schema.py (EXTENSION_DIR | EXTENSION_ZIP)
+
+Checks:
+  - Schema files present when metadata.json declares settings-schema
+  - Schema id matches settings-schema, and names the file (<id>.gschema.xml)
+  - Schema path under /org/gnome/shell/extensions/, ending with /
+  - No GNOME trademark in the extension part of the id
+  - glib-compile-schemas --strict --dry-run (cached by content hash)
+  - Keys read, written, bound or watched from JS exist in the schema, and
+    typed accessors (get_int, set_strv, get_enum, ...) match the key type
+
+Schemas are parsed once into a key index (ego_lint/gschema.py); the JS is
+scanned once, and each call site costs one dict lookup. Only Gio.Settings
+objects known to use the extension's own schemas are checked: receivers
+assigned from getSettings() / getSettings('id') / new Gio.Settings({schema_id:
+'id'}) in the same file, and getSettings() chained directly. A receiver bound
+to several schemas in one file keeps them all, and a key passes when any of
+them has it. Files with neither are not scanned for calls.
+
+Output: PIPE-delimited lines: STATUS|check-name|detail
+"""
+
+import os
+import re
+import sys
+from collections import namedtuple
+
+from ego_lint import gschema, metadata
+from ego_lint.passes import find_js_files
+
+
+def result(status, check, detail):
+    print(f"{status}|{check}|{detail}")
+
+
+SCHEMA_ID_PREFIX = 'org.gnome.shell.extensions.'
+SCHEMA_PATH_PREFIX = '/org/gnome/shell/extensions/'
+
+
+def check_ids(files, settings_schema):
+    for sf in files:
+        schema_id = sf.schema_id
+        if schema_id == settings_schema:
+            result("PASS", "schema/id-matches",
+                   f"Schema ID '{schema_id}' matches metadata.json settings-schema")
+        else:
+            result("FAIL", "schema/id-matches",
+                   f"Schema ID '{schema_id}' does not match metadata.json "
+                   f"settings-schema '{settings_schema}'")
+
+
+def check_filenames(files):
+    # <schema-id>.gschema.xml
+    for sf in files:
+        if not sf.schema_id:
+            continue
+        expected = sf.schema_id + gschema.SCHEMA_SUFFIX
+        if sf.name == expected:
+            result("PASS", "schema/filename-convention", f"Schema filename matches ID: {sf.name}")
+        else:
+            result("FAIL", "schema/filename-convention",
+                   f"Schema filename '{sf.name}' MUST be '{expected}'")
+
+
+def check_paths(files):
+    for sf in files:
+        path = sf.schema_path
+        if not path:
+            continue
+        if path.startswith(SCHEMA_PATH_PREFIX):
+            result("PASS", "schema/path", f"Schema path is correct: {path}")
+        else:
+            result("FAIL", "schema/path",
+                   f"Schema path should start with {SCHEMA_PATH_PREFIX}, got: {path}")
+        if path.endswith('/'):
+            result("PASS", "schema/path-trailing-slash", "Schema path ends with /")
+        else:
+            result("FAIL", "schema/path-trailing-slash",
+                   f"Schema path must end with /, got: {path}")
+
+
+def check_trademark(files):
+    for sf in files:
+        schema_id = sf.schema_id
+        ext_part = schema_id[len(SCHEMA_ID_PREFIX):] if schema_id.startswith(SCHEMA_ID_PREFIX) \
+            else schema_id
+        if 'gnome' in ext_part.lower():
+            result("FAIL", "schema/gnome-trademark",
+                   f"GNOME trademark must not appear in schema ID extension part: {schema_id}")
+
+
+def check_compile(ext_dir):
+    outcome = gschema.compile_check(ext_dir)
+    if outcome is None:
+        result("SKIP", "schema/compile", "glib-compile-schemas not available")
+        return
+    exit_code, output = outcome
+    if exit_code == 0:
+        result("PASS", "schema/compile", "glib-compile-schemas --strict --dry-run passed")
+    else:
+        result("FAIL", "schema/compile",
+               f"glib-compile-schemas failed: {'; '.join(output.splitlines())}")
+
+
+# Accessor -> GVariant type of the key it reads or writes
+TYPED_ACCESSORS = {
+    'boolean': 'b', 'int': 'i', 'uint': 'u', 'int64': 'x', 'uint64': 't',
+    'double': 'd', 'string': 's', 'strv': 'as',
+}
+# Methods whose first argument is a key name, type-agnostic
+KEY_METHODS = (
+    'get_value', 'set_value', 'get_user_value', 'get_default_value', 'reset',
+    'is_writable', 'get_range', 'range_check', 'bind', 'bind_writable', 'create_action',
+)
+_ACCESSORS = '|'.join([f'[gs]et_{name}' for name in list(TYPED_ACCESSORS) + ['enum', 'flags']]
+                      + list(KEY_METHODS))
+
+# `recv = [this.|obj.]getSettings(['id'])` and `recv = new Gio.Settings({schema_id: 'id'})`
+# The lookbehind starts a match only at the start of an identifier, not at
+# every character of every identifier; the matches are the same (a match
+# inside an identifier implies one from its first character)
+_RECEIVER = r'(?<![\w$])((?:this\.)?[\w$]+(?:\.[\w$]+)*)'
+SETTINGS_ASSIGN_RE = re.compile(
+    _RECEIVER + r'\s*=\s*(?:'
+    r'(?:[\w$]+\s*\.\s*)*getSettings\(\s*(?:([\'"])([^\'"\n]+)\2)?\s*\)'
+    r'|new\s+Gio\.Settings\(\s*\{[^}]*?\b(?:schema_id|schemaId|schema)\s*:\s*'
+    r'([\'"])([^\'"\n]+)\4[^}]*\}\s*\))')
+# `recv.method('key'` and `recv.connect('changed::key'`; recv may be a getSettings() call
+SETTINGS_CALL_RE = re.compile(
+    r'(?<![\w$])((?:this\.)?[\w$]+(?:\.[\w$]+)*(?:\s*\.\s*getSettings\(\s*\))?)\s*\.\s*'
+    r'(?:(' + _ACCESSORS + r')|connect(?:_after)?)\(\s*'
+    r'([\'"])(?(2)|changed::)([\w-]+)\3')
+# `getSettings().method(...` — a call site with no receiver variable
+CHAINED_SETTINGS_RE = re.compile(r'getSettings\(\s*\)\s*\.')
+
+
+KeyUse = namedtuple('KeyUse', 'rel line method schema_ids key')
+
+
+def settings_receivers(code, settings_schema):
+    """{receiver expression: [schema id, ...]} of the Gio.Settings objects in one file.
+
+    A receiver assigned more than once (`this._settings` bound to one schema
+    in a constructor and another in a method) keeps every schema, in order.
+    """
+    receivers = {}
+    if 'getSettings' not in code and 'Gio.Settings' not in code:
+        return receivers
+    for m in SETTINGS_ASSIGN_RE.finditer(code):
+        schema_id = m.group(3) or m.group(5) or settings_schema
+        if schema_id:
+            schema_ids = receivers.setdefault(m.group(1), [])
+            if schema_id not in schema_ids:
+                schema_ids.append(schema_id)
+    return receivers
+
+
+def key_uses(js_files, settings_schema):
+    """Yield a KeyUse per settings key referenced from JS, in file order."""
+    for f in js_files:
+        code = f.code
+        if 'ettings' not in code:
+            continue
+        receivers = settings_receivers(code, settings_schema)
+        if not receivers and not (settings_schema and CHAINED_SETTINGS_RE.search(code)):
+            continue
+        for m in SETTINGS_CALL_RE.finditer(code):
+            receiver = m.group(1)
+            if receiver.endswith(')'):
+                schema_ids = [settings_schema] if settings_schema else None
+            else:
+                schema_ids = receivers.get(receiver)
+            if schema_ids:
+                yield KeyUse(f.rel, f.src.line_of(m.start()), m.group(2) or 'connect',
+                             schema_ids, m.group(4))
+
+
+def type_mismatch(method, key):
+    """Why `method` cannot be used on `key`, or None."""
+    kind = method[4:] if method[:4] in ('get_', 'set_') else ''
+    if kind == 'enum':
+        return None if key.enum else "is not an enum key"
+    if kind == 'flags':
+        return None if key.flags else "is not a flags key"
+    expected = TYPED_ACCESSORS.get(kind)
+    if expected is None or key.type == expected:
+        return None
+    if expected == 's' and key.enum:
+        # get_string/set_string work on enum keys by nick
+        return None
+    return f"has type '{key.type or ('enum' if key.enum else 'flags')}', not '{expected}'"
+
+
+def check_key_usage(ext_dir, index, settings_schema):
+    keys_by_schema = {}
+    uses = 0
+    missing = []
+    mismatched = []
+    for use in key_uses(find_js_files(ext_dir), settings_schema):
+        # Candidate schemas that are the extension's own
+        schemas = []
+        for schema_id in use.schema_ids:
+            keys = keys_by_schema.get(schema_id)
+            if keys is None:
+                keys = keys_by_schema[schema_id] = index.keys(schema_id)
+            if keys:
+                schemas.append((schema_id, keys))
+        if not schemas:
+            continue
+        uses += 1
+        found = [keys[use.key] for _, keys in schemas if use.key in keys]
+        where = f"{use.rel}:{use.line}"
+        if not found:
+            names = ' or '.join(schema_id for schema_id, _ in schemas)
+            missing.append(f"{where}: '{use.key}' is not a key of {names}")
+            continue
+        reasons = [type_mismatch(use.method, key) for key in found]
+        if all(reasons):
+            mismatched.append(f"{where}: {use.method}('{use.key}') — key {reasons[0]}")
+
+    if not uses:
+        return
+    for detail in missing:
+        result("FAIL", "schema/key-exists", detail)
+    if not missing:
+        result("PASS", "schema/key-exists",
+               f"All {uses} settings key reference(s) exist in the schema")
+    for detail in mismatched:
+        result("FAIL", "schema/key-type", detail)
+    if not mismatched:
+        result("PASS", "schema/key-type", "Typed settings accessors match the key types")
+
+
+def main():
+    if len(sys.argv) < 2:
+        result("FAIL", "schema/args", "No extension directory provided")
+        sys.exit(1)
+
+    ext_dir = os.path.realpath(sys.argv[1])
+    settings_schema = metadata.load(ext_dir).settings_schema
+    index = gschema.load(ext_dir)
+
+    if not index.files:
+        if settings_schema:
+            result("FAIL", "schema/exists",
+                   f"settings-schema '{settings_schema}' in metadata.json "
+                   "but no .gschema.xml files found")
+        else:
+            result("SKIP", "schema/exists", "No schemas defined (not all extensions use schemas)")
+        return
+
+    result("PASS", "schema/exists", f"Found {len(index.files)} schema file(s)")
+    if settings_schema:
+        check_ids(index.files, settings_schema)
+    check_filenames(index.files)
+    check_paths(index.files)
+    check_trademark(index.files)
+    check_compile(ext_dir)
+    check_key_usage(ext_dir, index, settings_schema)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,11 @@
 #!/usr/bin/env bash
 # ego-lint.sh — Orchestrator for GNOME Shell extension EGO compliance checks
 #
-# Usage: ego-lint.sh [EXTENSION_DIR]
-#   EXTENSION_DIR defaults to the current working directory.
+# Usage: ego-lint.sh [--verbose] [--timings] [--trace FILE] [EXTENSION_DIR | EXTENSION_ZIP]
+#        ego-lint.sh --corpus [OPTIONS] PATH...
+#   EXTENSION_DIR defaults to the current working directory. A submission zip
+#   is linted in place: the checks read its members through ego_lint/extfs.py.
+#   --corpus lints many extensions in a worker pool (ego_lint/corpus.py).
 #
 # Runs all checks and outputs structured results. Exit code 0 if no FAILs, 1 otherwise.
 
@@ -16,7 +19,8 @@ SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 
 show_help() {
     cat <<'HELPEOF'
-Usage: ego-lint [OPTIONS] [EXTENSION_DIR]
+Usage: ego-lint [OPTIONS] [EXTENSION_DIR | EXTENSION_ZIP]
+       ego-lint --corpus [-j N] [-o FILE] PATH...
 
 GNOME Shell extension compliance checker for EGO (extensions.gnome.org)
 submission. Runs deterministic checks — bash + python only, no AI, no
@@ -25,8 +29,17 @@ network access.
 Options:
   -h, --help       Show this help message and exit
   -v, --verbose    Show verbose report with grouped results and verdict
-
-Checks (113 pattern rules + 13 structural scripts):
+  --timings        Print wall time, CPU time and peak memory of each stage,
+                   and the slowest functions inside the Python checks
+  --trace FILE     Write a Chrome trace-event JSON of the run (stages and
+                   the functions inside them) for Perfetto or chrome://tracing
+  --corpus PATH... Lint many extensions (directories, zips, or directories
+                   of them) in a pool of workers; results stream as JSON
+                   lines or to SQLite (-o FILE.db) with per-check hit
+                   counts. See ego-lint --corpus --help
+
+Checks (113 pattern rules + 14 structural scripts):
+  files            File structure, license, binaries, scripts, minified JS
   metadata         UUID, required fields, shell-version, session-modes, GNOME trademark
   imports          GTK/Shell import segregation, transitive dependency analysis
   schema           Schema ID, path format, glib-compile-schemas dry-run
@@ -39,7 +52,7 @@ Checks (113 pattern rules + 13 structural scripts):
   version-compat   GNOME 44-50 migration rules (version-gated)
   css              Unscoped classes, !important, Shell theme overrides
   quality          AI slop detection, code provenance scoring, obfuscation
-  package          Forbidden/required files, compiled schemas
+  package          Forbidden/required files, compiled schemas, zip bombs, duplicates
   preferences      ExtensionPreferences base class, GTK4/Adwaita, memory leaks
 
 Exit codes:
@@ -49,7 +62,21 @@ HELPEOF
     exit 0
 }
 
+# --corpus: the whole run is ego_lint/corpus.py, given the other arguments
+for arg in "$@"; do
+    if [[ "$arg" == --corpus ]]; then
+        corpus_args=()
+        for arg in "$@"; do
+            [[ "$arg" == --corpus ]] || corpus_args+=("$arg")
+        done
+        PYTHONPATH="$SCRIPT_DIR" exec python3 -m ego_lint.corpus \
+            ${corpus_args[@]+"${corpus_args[@]}"}
+    fi
+done
+
 VERBOSE=false
+TIMINGS=false
+TRACE_FILE=""
 EXT_DIR=""
 while [[ $# -gt 0 ]]; do
     case "$1" in
@@ -60,6 +87,22 @@ while [[ $# -gt 0 ]]; do
             VERBOSE=true
             shift
             ;;
+        --timings)
+            TIMINGS=true
+            shift
+            ;;
+        --trace)
+            if [[ -z "${2:-}" ]]; then
+                echo "ego-lint: --trace needs a FILE argument" >&2
+                exit 2
+            fi
+            TRACE_FILE="$2"
+            shift 2
+            ;;
+        --trace=*)
+            TRACE_FILE="${1#*=}"
+            shift
+            ;;
         *)
             EXT_DIR="$1"
             shift
@@ -67,10 +110,45 @@ while [[ $# -gt 0 ]]; do
     esac
 done
 EXT_DIR="${EXT_DIR:-.}"
-EXT_DIR="$(cd "$EXT_DIR" && pwd)"
+if [[ -f "$EXT_DIR" ]]; then
+    EXT_DIR="$(cd "$(dirname "$EXT_DIR")" && pwd)/$(basename "$EXT_DIR")"
+else
+    EXT_DIR="$(cd "$EXT_DIR" && pwd)"
+fi
 
 RESULTS_FILE="$(mktemp)"
-trap 'rm -f "$RESULTS_FILE"' EXIT
+TRACE_DIR=""
+# The first check to read metadata.json saves the parsed model here and the
+# later ones load it (see ego_lint/metadata.py)
+EGO_LINT_METADATA_FILE="$(mktemp)"
+export EGO_LINT_METADATA_FILE
+trap 'rm -f "$RESULTS_FILE" "$EGO_LINT_METADATA_FILE"; [[ -z "$TRACE_DIR" ]] || rm -rf "$TRACE_DIR"' EXIT
+
+# --timings / --trace: every stage runs through ego_lint/trace.py, which
+# records its wall/CPU time, peak RSS and the functions inside Python checks
+if [[ "$TIMINGS" == true || -n "$TRACE_FILE" ]]; then
+    if command -v python3 > /dev/null 2>&1; then
+        TRACE_DIR="$(mktemp -d)"
+        if [[ -n "$TRACE_FILE" && "$TRACE_FILE" != /* ]]; then
+            TRACE_FILE="$PWD/$TRACE_FILE"
+        fi
+    else
+        echo "ego-lint: --timings/--trace need python3; ignoring" >&2
+        TIMINGS=false
+        TRACE_FILE=""
+    fi
+fi
+
+# Run one stage (a check script, the pattern rules, eslint)
+run_stage() {
+    if [[ -n "$TRACE_DIR" ]]; then
+        EGO_LINT_STAGE_START="${EPOCHREALTIME:-}" PYTHONPATH="$SCRIPT_DIR" \
+            python3 -m ego_lint.trace run "$TRACE_DIR" -- "$@"
+    else
+        "$@"
+    fi
+}
+
 
 FAIL_COUNT=0
 WARN_COUNT=0
@@ -111,7 +189,7 @@ run_subscript() {
     fi
 
     # Run sub-script; capture output, allow non-zero exit
-    output="$("$script" "$EXT_DIR" 2>&1)" || true
+    output="$(run_stage "$script" "$EXT_DIR" 2>&1)" || true
 
     while IFS='|' read -r status check detail; do
         # Skip empty lines
@@ -143,7 +221,7 @@ run_pattern_rules() {
     fi
 
     local output
-    output="$(python3 "$helper" "$rules_file" "$EXT_DIR" 2>&1)" || true
+    output="$(run_stage python3 "$helper" "$rules_file" "$EXT_DIR" 2>&1)" || true
 
     while IFS='|' read -r status check detail; do
         [[ -z "$status" ]] && continue
@@ -169,262 +247,15 @@ echo "Extension: $EXT_DIR"
 echo ""
 
 # ---------------------------------------------------------------------------
-# File structure checks
+# File checks: file structure, license, console.log, deprecated modules,
+# binaries, non-GJS scripts, script permissions, polkit files, minified JS
+# (delegated to check-files.py)
 # ---------------------------------------------------------------------------
 
-if [[ -f "$EXT_DIR/extension.js" ]]; then
-    print_result "PASS" "file-structure/extension.js" "extension.js exists"
+if [[ -f "$SCRIPT_DIR/check-files.py" ]]; then
+    run_subscript "$SCRIPT_DIR/check-files.py"
 else
-    print_result "FAIL" "file-structure/extension.js" "extension.js is missing"
-fi
-
-if [[ -f "$EXT_DIR/metadata.json" ]]; then
-    print_result "PASS" "file-structure/metadata.json" "metadata.json exists"
-else
-    print_result "FAIL" "file-structure/metadata.json" "metadata.json is missing"
-fi
-
-# ---------------------------------------------------------------------------
-# License check
-# ---------------------------------------------------------------------------
-
-if [[ -f "$EXT_DIR/LICENSE" ]] || [[ -f "$EXT_DIR/COPYING" ]]; then
-    license_file=""
-    [[ -f "$EXT_DIR/LICENSE" ]] && license_file="$EXT_DIR/LICENSE"
-    [[ -f "$EXT_DIR/COPYING" ]] && license_file="$EXT_DIR/COPYING"
-    head_content=$(head -5 "$license_file" 2>/dev/null || true)
-    if echo "$head_content" | grep -qiE '(GPL|LGPL|MIT|BSD|Apache|MPL|ISC|Artistic)'; then
-        print_result "PASS" "license" "License file found (appears GPL-compatible)"
-    else
-        print_result "WARN" "license" "License file found but could not confirm GPL-compatibility"
-    fi
-else
-    print_result "FAIL" "license" "No LICENSE or COPYING file — MUST use GPL-compatible license"
-fi
-
-# ---------------------------------------------------------------------------
-# console.log check
-# ---------------------------------------------------------------------------
-
-# Search for console.log( in JS files (extension code), excluding comments.
-# console.debug, console.warn, console.error are OK.
-
-console_log_hits=""
-if compgen -G "$EXT_DIR/*.js" > /dev/null 2>&1 || \
-   compgen -G "$EXT_DIR/lib/**/*.js" > /dev/null 2>&1; then
-
-    # Build file list
-    js_files=()
-    for f in "$EXT_DIR"/*.js; do
-        [[ -f "$f" ]] && js_files+=("$f")
-    done
-    if [[ -d "$EXT_DIR/lib" ]]; then
-        while IFS= read -r -d '' f; do
-            js_files+=("$f")
-        done < <(find "$EXT_DIR/lib" -name '*.js' -print0 2>/dev/null)
-    fi
-
-    for f in "${js_files[@]}"; do
-        # Match console.log( but skip lines that are comments (// or *)
-        while IFS= read -r line; do
-            # Strip leading whitespace for comment detection
-            stripped="${line#"${line%%[![:space:]]*}"}"
-            # Skip single-line comments
-            [[ "$stripped" == //* ]] && continue
-            # Skip block comment continuation lines
-            [[ "$stripped" == \** ]] && continue
-            rel_path="${f#"$EXT_DIR/"}"
-            console_log_hits+="  $rel_path: $stripped"$'\n'
-        done < <(grep -n 'console\.log(' "$f" 2>/dev/null || true)
-    done
-fi
-
-if [[ -n "$console_log_hits" ]]; then
-    # Count number of hits
-    hit_count=$(echo -n "$console_log_hits" | grep -c '.' || true)
-    print_result "FAIL" "no-console-log" "Found $hit_count console.log() call(s)"
-else
-    print_result "PASS" "no-console-log" "No console.log() calls found"
-fi
-
-# ---------------------------------------------------------------------------
-# Deprecated module imports
-# ---------------------------------------------------------------------------
-
-deprecated_hits=""
-if compgen -G "$EXT_DIR/*.js" > /dev/null 2>&1 || \
-   compgen -G "$EXT_DIR/lib/**/*.js" > /dev/null 2>&1; then
-
-    js_files=()
-    for f in "$EXT_DIR"/*.js; do
-        [[ -f "$f" ]] && js_files+=("$f")
-    done
-    if [[ -d "$EXT_DIR/lib" ]]; then
-        while IFS= read -r -d '' f; do
-            js_files+=("$f")
-        done < <(find "$EXT_DIR/lib" -name '*.js' -print0 2>/dev/null)
-    fi
-
-    # Match both ESM and legacy import patterns for deprecated modules
-    # ESM: import ... from 'mainloop' / 'bytearray' / 'lang'
-    # Legacy: const X = imports.misc.mainloop / imports.lang / imports.byteArray
-    deprecated_pattern="(from ['\"]mainloop['\"]|from ['\"]bytearray['\"]|from ['\"]lang['\"]|imports\.misc\.mainloop|imports\.lang|imports\.byteArray|from ['\"]ByteArray['\"]|from ['\"]Lang['\"]|from ['\"]Mainloop['\"])"
-
-    for f in "${js_files[@]}"; do
-        while IFS= read -r match; do
-            rel_path="${f#"$EXT_DIR/"}"
-            deprecated_hits+="  $rel_path: $match"$'\n'
-        done < <(grep -nE "$deprecated_pattern" "$f" 2>/dev/null || true)
-    done
-fi
-
-if [[ -n "$deprecated_hits" ]]; then
-    hit_count=$(echo -n "$deprecated_hits" | grep -c '.' || true)
-    print_result "FAIL" "no-deprecated-modules" "Found $hit_count deprecated module import(s)"
-else
-    print_result "PASS" "no-deprecated-modules" "No deprecated module imports found"
-fi
-
-# ---------------------------------------------------------------------------
-# Binary files check
-# ---------------------------------------------------------------------------
-
-binary_files=""
-# Check by file extension
-while IFS= read -r -d '' f; do
-    rel_path="${f#"$EXT_DIR/"}"
-    binary_files+="  $rel_path"$'\n'
-done < <(find "$EXT_DIR" -type f \( \
-    -name '*.so' -o -name '*.o' -o -name '*.a' -o \
-    -name '*.exe' -o -name '*.bin' -o -name '*.dll' -o \
-    -name '*.dylib' -o -name '*.wasm' \
-    \) -not -path '*/node_modules/*' -not -path '*/.git/*' -print0 2>/dev/null)
-
-# Check for ELF binaries without known extensions
-while IFS= read -r -d '' f; do
-    rel_path="${f#"$EXT_DIR/"}"
-    # Skip files already caught by extension
-    case "$rel_path" in
-        *.so|*.o|*.a|*.exe|*.bin|*.dll|*.dylib|*.wasm) continue ;;
-    esac
-    # Check ELF magic bytes
-    if head -c4 "$f" 2>/dev/null | grep -q $'\x7fELF'; then
-        binary_files+="  $rel_path (ELF binary)"$'\n'
-    fi
-done < <(find "$EXT_DIR" -type f -not -path '*/node_modules/*' -not -path '*/.git/*' -not -name '*.js' -not -name '*.json' -not -name '*.xml' -not -name '*.css' -not -name '*.mo' -not -name '*.po' -not -name '*.pot' -not -name '*.md' -not -name '*.txt' -not -name '*.yml' -not -name '*.yaml' -not -name '*.sh' -not -name '*.py' -not -name '*.svg' -not -name '*.png' -not -name '*.jpg' -not -name '*.zip' -not -name '*.ui' -not -name '*.policy' -not -name '*.rules' -not -name 'LICENSE' -not -name 'COPYING' -print0 2>/dev/null)
-
-if [[ -n "$binary_files" ]]; then
-    hit_count=$(echo -n "$binary_files" | grep -c '.' || true)
-    print_result "FAIL" "no-binary-files" "Found $hit_count binary file(s) — extensions MUST NOT include binaries"
-else
-    print_result "PASS" "no-binary-files" "No binary files found"
-fi
-
-# ---------------------------------------------------------------------------
-# Non-GJS script detection
-# ---------------------------------------------------------------------------
-
-non_gjs_scripts=""
-while IFS= read -r -d '' f; do
-    rel_path="${f#"$EXT_DIR/"}"
-    non_gjs_scripts+="  $rel_path"$'\n'
-done < <(find "$EXT_DIR" -type f \( -name '*.py' -o -name '*.sh' -o -name '*.rb' -o -name '*.pl' \) \
-    -not -path '*/node_modules/*' -not -path '*/.git/*' -print0 2>/dev/null)
-
-if [[ -n "$non_gjs_scripts" ]]; then
-    hit_count=$(echo -n "$non_gjs_scripts" | grep -c '.' || true)
-    # Upgrade to FAIL if no pkexec justification exists (pkexec helpers are the main exception)
-    has_pkexec=false
-    while IFS= read -r -d '' f; do
-        if grep -q 'pkexec' "$f" 2>/dev/null; then
-            has_pkexec=true
-            break
-        fi
-    done < <(find "$EXT_DIR" -name '*.js' -not -path '*/node_modules/*' -not -path '*/.git/*' -print0 2>/dev/null)
-    if [[ "$has_pkexec" == true ]]; then
-        print_result "PASS" "non-gjs-scripts" "Found $hit_count non-GJS script(s) — pkexec helper detected, scripts support privileged operations"
-    else
-        print_result "FAIL" "non-gjs-scripts" "Found $hit_count non-GJS script(s) — scripts MUST be written in GJS; no pkexec/privileged helper justification found"
-    fi
-else
-    print_result "PASS" "non-gjs-scripts" "No non-GJS scripts found"
-fi
-
-# ---------------------------------------------------------------------------
-# Helper script permission check
-# ---------------------------------------------------------------------------
-
-non_exec_scripts=""
-while IFS= read -r -d '' f; do
-    if [[ ! -x "$f" ]]; then
-        rel_path="${f#"$EXT_DIR/"}"
-        non_exec_scripts+="  $rel_path"$'\n'
-    fi
-done < <(find "$EXT_DIR" -type f -name '*.sh' \
-    -not -path '*/node_modules/*' -not -path '*/.git/*' -print0 2>/dev/null)
-
-if [[ -n "$non_exec_scripts" ]]; then
-    hit_count=$(echo -n "$non_exec_scripts" | grep -c '.' || true)
-    print_result "WARN" "script-permissions" "Found $hit_count shell script(s) without execute permission — packaging tools may strip permissions"
-else
-    print_result "PASS" "script-permissions" "All shell scripts have execute permission (or no shell scripts found)"
-fi
-
-# ---------------------------------------------------------------------------
-# Polkit policy file check
-# ---------------------------------------------------------------------------
-
-polkit_files=""
-while IFS= read -r -d '' f; do
-    rel_path="${f#"$EXT_DIR/"}"
-    polkit_files+="  $rel_path"$'\n'
-done < <(find "$EXT_DIR" -type f \( -name '*.policy' -o -name '*.rules' \) -not -path '*/node_modules/*' -not -path '*/.git/*' -print0 2>/dev/null)
-
-if [[ -n "$polkit_files" ]]; then
-    hit_count=$(echo -n "$polkit_files" | grep -c '.' || true)
-    print_result "WARN" "polkit-files" "Found $hit_count polkit policy/rules file(s) — requires security review"
-else
-    print_result "PASS" "polkit-files" "No polkit policy files found"
-fi
-
-# ---------------------------------------------------------------------------
-# Minified/bundled JavaScript check
-# ---------------------------------------------------------------------------
-
-minified_files=""
-for f in "$EXT_DIR"/*.js; do
-    [[ -f "$f" ]] || continue
-    rel_path="${f#"$EXT_DIR/"}"
-
-    # Check for webpack boilerplate
-    if grep -q '__webpack_require__' "$f" 2>/dev/null; then
-        minified_files+="  $rel_path (webpack bundle)"$'\n'
-        continue
-    fi
-
-    # Check for any line > 500 chars (strong minification signal)
-    if awk 'length > 500 { found=1; exit } END { exit !found }' "$f" 2>/dev/null; then
-        minified_files+="  $rel_path (lines > 500 chars)"$'\n'
-    fi
-done
-if [[ -d "$EXT_DIR/lib" ]]; then
-    while IFS= read -r -d '' f; do
-        rel_path="${f#"$EXT_DIR/"}"
-        if grep -q '__webpack_require__' "$f" 2>/dev/null; then
-            minified_files+="  $rel_path (webpack bundle)"$'\n'
-            continue
-        fi
-        if awk 'length > 500 { found=1; exit } END { exit !found }' "$f" 2>/dev/null; then
-            minified_files+="  $rel_path (lines > 500 chars)"$'\n'
-        fi
-    done < <(find "$EXT_DIR/lib" -name '*.js' -print0 2>/dev/null)
-fi
-
-if [[ -n "$minified_files" ]]; then
-    hit_count=$(echo -n "$minified_files" | grep -c '.' || true)
-    print_result "FAIL" "minified-js" "Found $hit_count minified/bundled JS file(s) — reviewers cannot review minified code"
-else
-    print_result "PASS" "minified-js" "No minified or bundled JavaScript detected"
+    print_result "SKIP" "files" "check-files.py not found"
 fi
 
 # ---------------------------------------------------------------------------
@@ -450,7 +281,7 @@ run_pattern_rules
 if [[ -f "$EXT_DIR/eslint.config.mjs" ]] && [[ -x "$EXT_DIR/node_modules/.bin/eslint" ]]; then
     eslint_output=""
     eslint_exit=0
-    eslint_output="$("$EXT_DIR/node_modules/.bin/eslint" "$EXT_DIR" 2>&1)" || eslint_exit=$?
+    eslint_output="$(run_stage "$EXT_DIR/node_modules/.bin/eslint" "$EXT_DIR" 2>&1)" || eslint_exit=$?
 
     if [[ $eslint_exit -eq 0 ]]; then
         print_result "PASS" "eslint" "No errors"
@@ -485,8 +316,10 @@ else
     print_result "SKIP" "metadata" "check-metadata.py not found"
 fi
 
-# check-schema.sh
-run_subscript "$SCRIPT_DIR/check-schema.sh"
+# check-schema.py (GSettings schemas, cached glib-compile-schemas)
+if [[ -f "$SCRIPT_DIR/check-schema.py" ]]; then
+    run_subscript "$SCRIPT_DIR/check-schema.py"
+fi
 
 # check-imports.sh
 run_subscript "$SCRIPT_DIR/check-imports.sh"
@@ -526,8 +359,10 @@ if [[ -f "$SCRIPT_DIR/check-resources.py" ]]; then
     run_subscript "$SCRIPT_DIR/check-resources.py"
 fi
 
-# check-package.sh
-run_subscript "$SCRIPT_DIR/check-package.sh"
+# check-package.py (zip contents, compression ratios)
+if [[ -f "$SCRIPT_DIR/check-package.py" ]]; then
+    run_subscript "$SCRIPT_DIR/check-package.py"
+fi
 
 # ---------------------------------------------------------------------------
 # Summary
@@ -595,6 +430,17 @@ if [[ "$VERBOSE" == true ]]; then
     echo "================================================================"
 fi
 
+if [[ "$TIMINGS" == true ]]; then
+    echo ""
+    echo "--- TIMINGS ---"
+    PYTHONPATH="$SCRIPT_DIR" python3 -m ego_lint.trace report "$TRACE_DIR"
+fi
+if [[ -n "$TRACE_FILE" ]]; then
+    PYTHONPATH="$SCRIPT_DIR" python3 -m ego_lint.trace write "$TRACE_DIR" "$TRACE_FILE" \
+        "ego-lint $EXT_DIR"
+    echo "Trace written to $TRACE_FILE (open in https://ui.perfetto.dev)"
+fi
+
 if [[ $FAIL_COUNT -gt 0 ]]; then
     exit 1
 else
@@ -0,0 +1,5 @@
+"""ego_lint — shared analysis modules for the ego-lint check scripts.
+
+The check scripts run with this directory's parent as sys.path[0], so they
+import from here directly (``from ego_lint.importgraph import ImportGraph``).
+"""
@@ -0,0 +1,114 @@
+"""cache.py — On-disk cache shared by the checks.
+
+Results that depend only on file contents are stored as small JSON files
+keyed by a content hash, so repeated lint runs (a CI job, a reviewer
+re-running after a fix) skip work whose inputs have not changed:
+
+    cache_dir = cache.default_cache_dir()        # None when caching is off
+    path = cache.entry_path(cache_dir, 'schema-compile', digest)
+    cached = cache.load_json(path)               # None on a miss
+    cache.store_json(path, {'exit': 0, 'output': ''})
+
+The cache lives in $EGO_LINT_CACHE_DIR (default: $XDG_CACHE_HOME/ego-lint)
+and is disabled by EGO_LINT_NO_CACHE=1. Entries are written atomically and
+every failure is ignored, since the cache is only an optimization.
+
+No namespace stops growing on its own: one keyed by directory gains an entry
+per linted directory, and a content-keyed one an entry per version of every
+file ever linted. prune() bounds a directory of entries by dropping the least
+recently used; prune_fanout() bounds a namespace of entry_path() entries:
+
+    cached = cache.load_json(path)
+    if cached is not None:
+        cache.touch(path)                        # a hit counts as a use
+    ...
+    cache.store_json(path, value)
+    cache.prune_fanout(path, MAX_ENTRIES)
+"""
+
+import json
+import os
+
+
+def default_cache_dir():
+    """Return the on-disk cache root, or None when caching is disabled."""
+    if os.environ.get('EGO_LINT_NO_CACHE'):
+        return None
+    base = os.environ.get('EGO_LINT_CACHE_DIR')
+    if not base:
+        xdg = os.environ.get('XDG_CACHE_HOME') or \
+            os.path.join(os.path.expanduser('~'), '.cache')
+        base = os.path.join(xdg, 'ego-lint')
+    return base
+
+
+# entry_path() spreads a namespace over this many directories
+FANOUT = 256
+
+
+def entry_path(cache_dir, namespace, digest):
+    """Cache file for a hex digest, fanned out by its first two characters."""
+    return os.path.join(cache_dir, namespace, digest[:2], digest + '.json')
+
+
+def load_json(path):
+    """The JSON stored at path, or None on a miss or unreadable entry."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def store_json(path, value):
+    """Write value to path atomically; failures are ignored."""
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(value, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+def touch(path):
+    """Mark an entry as just used, for prune(); failures are ignored."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def prune(directory, keep):
+    """Delete all but the `keep` most recently used entries in directory.
+
+    Recency is the file mtime, which store_json() and touch() refresh.
+    """
+    try:
+        with os.scandir(directory) as it:
+            entries = [(e.stat().st_mtime, e.path) for e in it
+                       if e.name.endswith('.json') and e.is_file()]
+    except OSError:
+        return
+    if len(entries) <= keep:
+        return
+    entries.sort(reverse=True)
+    for _, path in entries[keep:]:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def prune_fanout(path, limit):
+    """Bound the namespace of entry `path` to about `limit` entries.
+
+    Digests spread evenly over the FANOUT directories, so keeping the most
+    recently used limit // FANOUT in the directory just stored to bounds the
+    whole namespace while only ever listing one small directory.
+    """
+    prune(os.path.dirname(path), max(1, limit // FANOUT))
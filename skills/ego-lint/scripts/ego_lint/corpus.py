@@ -0,0 +1,441 @@
+"""corpus.py — Lint many extensions in one run, in a pool of long-lived workers.
+
+`ego-lint --corpus PATH...` hands its arguments to this module:
+
+    python3 -m ego_lint.corpus [-j N] [-o FILE] [--format jsonl|sqlite]
+                               [--from LIST] [--timeout SECONDS] PATH...
+
+Each PATH is an extension (a directory with metadata.json, or a zip), or a
+directory of them, such as a mirror of extensions.gnome.org: every
+subdirectory and .zip in it is linted. `--from LIST` reads more paths, one
+per line ('-' for stdin).
+
+Every worker loads the checks once. The check scripts are compiled and
+their top-level code run once, then each extension calls their main() with
+its output captured. The pattern rules are parsed and their regexes
+compiled once (apply-patterns.py load_rules()). check-imports.sh and
+eslint still run as child processes. An extension runs the same stages in
+the same order as ego-lint.sh (STAGES), so its results are the lines
+ego-lint.sh would report. Extensions are handed out one at a time, so
+throughput grows with -j (default: one worker per CPU).
+
+Results stream to FILE (default: stdout) as each extension finishes, in
+completion order:
+
+  jsonl    one {"type": "extension", ...} record per extension (path, uuid,
+           exit, pass/fail/warn/skip counts, ms, errors, results), then one
+           {"type": "stats", ...} record
+  sqlite   tables extensions, results (one row per result) and check_stats;
+           chosen for FILE ending in .db, .sqlite or .sqlite3
+
+The stats give, per check or rule that fired at least once, the number of
+extensions it failed and warned on and its total findings; with the
+extension count, that is its hit rate across the corpus. A summary with
+the most frequent checks is printed to stderr.
+
+An extension whose stages crash or run past --timeout (default 600 s)
+keeps the results it got so far and lists the problem in "errors". The
+exit code is 1 if any extension has errors, else 0: FAIL results do not
+change it.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import re
+import signal
+import sqlite3
+import subprocess
+import sys
+import time
+import traceback
+
+from ego_lint import extfs, metadata
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RULES_FILE = os.path.normpath(os.path.join(SCRIPTS_DIR, '..', '..', '..', 'rules',
+                                           'patterns.yaml'))
+PATTERNS = 'apply-patterns.py'
+ESLINT = 'eslint'
+# ego-lint.sh's stages, in its order
+STAGES = (
+    'check-files.py', 'check-css.py', PATTERNS, ESLINT, 'check-metadata.py',
+    'check-schema.py', 'check-imports.sh', 'check-quality.py', 'check-lifecycle.py',
+    'check-gobject.py', 'check-async.py', 'check-prefs.py', 'check-init.py',
+    'check-resources.py', 'check-package.py',
+)
+STATUSES = ('PASS', 'FAIL', 'WARN', 'SKIP')
+# eslint's stylish summary: "X problems (Y errors, Z warnings)"
+ESLINT_ERRORS_RE = re.compile(r'(\d+) error')
+ESLINT_WARNINGS_RE = re.compile(r'(\d+) warning')
+
+DEFAULT_TIMEOUT = 600
+SQLITE_SUFFIXES = ('.db', '.sqlite', '.sqlite3')
+# A worker is replaced after this many extensions, so a leak in one check
+# cannot grow it without bound; loading the checks again takes well under 1 s
+RECYCLE_AFTER = 500
+PROGRESS_EVERY = 100
+# Checks listed in the summary
+TOP_CHECKS = 20
+
+
+class Timeout(BaseException):
+    """An extension ran past --timeout (a BaseException, so checks that
+    catch Exception cannot swallow it)."""
+
+
+def parse_results(output):
+    """(status, check, detail) of each result line, split as ego-lint.sh does."""
+    results = []
+    for line in output.split('\n'):
+        status, check, detail = (line.split('|', 2) + ['', ''])[:3]
+        if detail.endswith('|') and '|' not in detail[:-1]:
+            # bash `read` drops one trailing delimiter from the last field
+            detail = detail[:-1]
+        status = status.strip()
+        if status:
+            results.append((status, check.strip(), detail.strip()))
+    return results
+
+
+def _load_script(path):
+    """A check script's namespace, its top-level code run but not main()."""
+    with open(path, encoding='utf-8') as f:
+        code = compile(f.read(), path, 'exec')
+    namespace = {'__name__': '__ego_lint_corpus__', '__file__': path}
+    exec(code, namespace)
+    return namespace
+
+
+class Engine:
+    """The checks of one worker, loaded once and run on any number of
+    extensions."""
+
+    def __init__(self, scripts_dir=SCRIPTS_DIR, rules_file=RULES_FILE):
+        if scripts_dir not in sys.path:
+            sys.path.insert(0, scripts_dir)
+        self.scripts_dir = scripts_dir
+        self.mains = {}     # in-process stage -> main()
+        self.rules = None
+        for stage in STAGES:
+            path = os.path.join(scripts_dir, stage)
+            if stage == PATTERNS:
+                if os.path.isfile(path) and os.path.isfile(rules_file):
+                    patterns = _load_script(path)
+                    self.rules = patterns['load_rules'](rules_file)
+                    self.apply_rules = patterns['apply_rules']
+            elif stage.endswith('.py') and os.access(path, os.X_OK):
+                self.mains[stage] = _load_script(path)['main']
+
+    def _call(self, func, argv, errors, stage):
+        """Output (stdout and stderr) of an in-process call."""
+        out = io.StringIO()
+        saved_argv = sys.argv
+        sys.argv = argv
+        try:
+            with contextlib.redirect_stdout(out), contextlib.redirect_stderr(out):
+                try:
+                    func()
+                except SystemExit:
+                    pass
+                except Exception as e:
+                    traceback.print_exc()
+                    errors.append(f"{stage}: {type(e).__name__}: {e}")
+        finally:
+            sys.argv = saved_argv
+        return out.getvalue()
+
+    def _run(self, argv, errors, stage):
+        """Output (stdout and stderr) of a child process."""
+        try:
+            proc = subprocess.run(argv, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                  stdin=subprocess.DEVNULL, text=True, errors='replace')
+        except OSError as e:
+            errors.append(f"{stage}: {e}")
+            return '', 127
+        return proc.stdout, proc.returncode
+
+    def _eslint(self, ext_dir, errors):
+        eslint = os.path.join(ext_dir, 'node_modules', '.bin', 'eslint')
+        if not (os.path.isfile(os.path.join(ext_dir, 'eslint.config.mjs'))
+                and os.access(eslint, os.X_OK)):
+            return [('SKIP', 'eslint', 'No eslint.config.mjs or node_modules/.bin/eslint found')]
+        output, code = self._run([eslint, ext_dir], errors, ESLINT)
+        if code == 0:
+            return [('PASS', 'eslint', 'No errors')]
+        if code == 2:
+            return [('WARN', 'eslint', 'ESLint configuration error (exit code 2)')]
+        errors_found = ESLINT_ERRORS_RE.findall(output)
+        warnings_found = ESLINT_WARNINGS_RE.findall(output)
+        errors_count = int(errors_found[-1]) if errors_found else 0
+        warnings_count = int(warnings_found[-1]) if warnings_found else 0
+        if errors_count:
+            return [('FAIL', 'eslint', f"{errors_count} error(s), {warnings_count} warning(s)")]
+        return [('WARN', 'eslint', f"{warnings_count} warning(s)")]
+
+    def lint(self, ext_dir, timeout=DEFAULT_TIMEOUT):
+        """The record of one extension: its results, counts and errors."""
+        start = time.perf_counter()
+        results = []
+        errors = []
+        signal.alarm(timeout)
+        try:
+            for stage in STAGES:
+                if stage == PATTERNS:
+                    if self.rules is None:
+                        results.append(('SKIP', 'pattern-rules', 'rules/patterns.yaml not found'))
+                        continue
+                    output = self._call(lambda: self.apply_rules(self.rules, ext_dir),
+                                        [PATTERNS], errors, stage)
+                elif stage == ESLINT:
+                    results += self._eslint(ext_dir, errors)
+                    continue
+                elif stage in self.mains:
+                    path = os.path.join(self.scripts_dir, stage)
+                    output = self._call(self.mains[stage], [path, ext_dir], errors, stage)
+                else:
+                    path = os.path.join(self.scripts_dir, stage)
+                    if not os.path.isfile(path):
+                        continue
+                    if not os.access(path, os.X_OK):
+                        results.append(('SKIP', stage[:-3] if stage.endswith('.sh') else stage,
+                                        'Script not found or not executable'))
+                        continue
+                    output, _code = self._run([path, ext_dir], errors, stage)
+                results += parse_results(output)
+        except Timeout:
+            errors.append(f"timed out after {timeout} s")
+        finally:
+            signal.alarm(0)
+
+        counts = {status: 0 for status in STATUSES}
+        for status, _check, _detail in results:
+            if status in counts:
+                counts[status] += 1
+        return {
+            'type': 'extension',
+            'path': ext_dir,
+            'uuid': metadata.load(ext_dir).uuid,
+            'exit': 1 if counts['FAIL'] else 0,
+            **{status.lower(): count for status, count in counts.items()},
+            'ms': round((time.perf_counter() - start) * 1000, 1),
+            'errors': errors,
+            'results': [{'status': s, 'check': c, 'detail': d} for s, c, d in results],
+        }
+
+
+
+def extension_paths(paths):
+    """Yield the extensions named by paths (see the module docstring)."""
+    for path in paths:
+        path = os.path.realpath(path)
+        if extfs.is_zip(path) or os.path.isfile(os.path.join(path, 'metadata.json')):
+            yield path
+        elif os.path.isdir(path):
+            for entry in sorted(os.scandir(path), key=lambda e: e.name):
+                if entry.name.startswith('.'):
+                    continue
+                if entry.is_dir() or extfs.is_zip(entry.path):
+                    yield entry.path
+        else:
+            print(f"ego-lint --corpus: {path}: not an extension or a directory",
+                  file=sys.stderr)
+
+
+def read_list(path):
+    """Paths listed one per line in a file ('-' for stdin)."""
+    f = sys.stdin if path == '-' else open(path, encoding='utf-8')
+    with f:
+        return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+
+class Stats:
+    """Per-check hit counts over the records seen so far."""
+
+    def __init__(self):
+        self.extensions = 0
+        self.failed = 0
+        self.errors = 0
+        self.checks = {}    # check -> [extensions failed, extensions warned, findings]
+
+    def add(self, record):
+        self.extensions += 1
+        self.failed += record['exit']
+        self.errors += bool(record['errors'])
+        seen = set()
+        for r in record['results']:
+            if r['status'] not in ('FAIL', 'WARN'):
+                continue
+            counts = self.checks.setdefault(r['check'], [0, 0, 0])
+            counts[2] += 1
+            if (r['check'], r['status']) not in seen:
+                seen.add((r['check'], r['status']))
+                counts[0 if r['status'] == 'FAIL' else 1] += 1
+
+    def ranked(self):
+        """(check, [failed, warned, findings]), most extensions hit first."""
+        return sorted(self.checks.items(), key=lambda item: (-max(item[1][:2]), item[0]))
+
+    def record(self, seconds):
+        return {
+            'type': 'stats',
+            'extensions': self.extensions,
+            'failed': self.failed,
+            'errors': self.errors,
+            'seconds': round(seconds, 1),
+            'checks': {check: {'fail': f, 'warn': w, 'findings': n}
+                       for check, (f, w, n) in self.ranked()},
+        }
+
+
+class JsonlWriter:
+    """Records as JSON lines."""
+
+    def __init__(self, path):
+        self.file = sys.stdout if path in (None, '-') else open(path, 'w', encoding='utf-8')
+
+    def write(self, record):
+        self.file.write(json.dumps(record) + '\n')
+        self.file.flush()
+
+    def close(self, stats_record):
+        self.write(stats_record)
+        if self.file is not sys.stdout:
+            self.file.close()
+
+
+class SqliteWriter:
+    """Records as rows of a new SQLite database (an existing one is replaced)."""
+
+    SCHEMA = '''
+        CREATE TABLE extensions (
+            id INTEGER PRIMARY KEY, path TEXT, uuid TEXT, exit INTEGER,
+            pass INTEGER, fail INTEGER, warn INTEGER, skip INTEGER,
+            ms REAL, errors TEXT);
+        CREATE TABLE results (
+            extension INTEGER REFERENCES extensions(id),
+            status TEXT, check_name TEXT, detail TEXT);
+        CREATE INDEX results_check ON results (check_name, status);
+        CREATE TABLE check_stats (
+            check_name TEXT PRIMARY KEY, fail INTEGER, warn INTEGER, findings INTEGER);
+    '''
+
+    def __init__(self, path):
+        if os.path.exists(path):
+            os.remove(path)
+        self.db = sqlite3.connect(path)
+        self.db.executescript(self.SCHEMA)
+
+    def write(self, record):
+        with self.db:
+            cursor = self.db.execute(
+                'INSERT INTO extensions (path, uuid, exit, pass, fail, warn, skip, ms, errors)'
+                ' VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (record['path'], record['uuid'], record['exit'], record['pass'],
+                 record['fail'], record['warn'], record['skip'], record['ms'],
+                 '\n'.join(record['errors']) or None))
+            self.db.executemany(
+                'INSERT INTO results VALUES (?, ?, ?, ?)',
+                [(cursor.lastrowid, r['status'], r['check'], r['detail'])
+                 for r in record['results']])
+
+    def close(self, stats_record):
+        with self.db:
+            self.db.executemany(
+                'INSERT INTO check_stats VALUES (?, ?, ?, ?)',
+                [(check, c['fail'], c['warn'], c['findings'])
+                 for check, c in stats_record['checks'].items()])
+        self.db.close()
+
+
+# The Engine of this worker process
+_engine = None
+
+
+def _on_alarm(_signum, _frame):
+    raise Timeout()
+
+
+def _init_worker():
+    global _engine
+    signal.signal(signal.SIGALRM, _on_alarm)
+    # Ctrl-C is handled once, by the parent
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _engine = Engine()
+
+
+def _lint(job):
+    path, timeout = job
+    return _engine.lint(path, timeout)
+
+
+def print_summary(stats, seconds, jobs):
+    rate = stats.extensions / seconds if seconds else 0
+    print(f"Linted {stats.extensions} extension(s) in {seconds:.1f} s "
+          f"({rate:.1f}/s, {jobs} worker(s)): {stats.failed} with failures, "
+          f"{stats.errors} with errors", file=sys.stderr)
+    ranked = stats.ranked()[:TOP_CHECKS]
+    if not ranked:
+        return
+    print(f"  {'check':<40} {'failed':>8} {'warned':>8} {'findings':>9}", file=sys.stderr)
+    for check, (failed, warned, findings) in ranked:
+        print(f"  {check:<40} {failed:>8} {warned:>8} {findings:>9}", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='ego-lint --corpus',
+        description='Lint many extensions in a pool of long-lived workers.')
+    parser.add_argument('paths', nargs='*', metavar='PATH',
+                        help='extension directory or zip, or a directory of them')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help='worker processes (default: one per CPU)')
+    parser.add_argument('-o', '--output', metavar='FILE',
+                        help='results file (default: JSON lines on stdout)')
+    parser.add_argument('--format', choices=('jsonl', 'sqlite'),
+                        help='output format (default: from the FILE suffix, else jsonl)')
+    parser.add_argument('--from', dest='lists', action='append', default=[], metavar='LIST',
+                        help="read more paths from LIST, one per line ('-': stdin)")
+    parser.add_argument('--timeout', type=int, default=DEFAULT_TIMEOUT, metavar='SECONDS',
+                        help=f'per-extension time limit (default: {DEFAULT_TIMEOUT})')
+    args = parser.parse_args(argv)
+
+    paths = list(args.paths)
+    try:
+        for listing in args.lists:
+            paths += read_list(listing)
+    except OSError as e:
+        parser.error(str(e))
+    if not paths:
+        parser.error('no extensions given')
+    if args.jobs < 1 or args.timeout < 1:
+        parser.error('--jobs and --timeout must be at least 1')
+    output_format = args.format or (
+        'sqlite' if args.output and args.output.endswith(SQLITE_SUFFIXES) else 'jsonl')
+    if output_format == 'sqlite' and args.output in (None, '-'):
+        parser.error('--format sqlite needs --output FILE')
+
+    extensions = list(extension_paths(paths))
+    jobs = max(1, min(args.jobs, len(extensions)))
+    writer = (SqliteWriter if output_format == 'sqlite' else JsonlWriter)(args.output)
+    stats = Stats()
+    start = time.perf_counter()
+    with multiprocessing.Pool(jobs, initializer=_init_worker,
+                              maxtasksperchild=RECYCLE_AFTER) as pool:
+        # One extension per task: sizes vary too much for larger chunks
+        for record in pool.imap_unordered(_lint, [(path, args.timeout) for path in extensions]):
+            writer.write(record)
+            stats.add(record)
+            if stats.extensions % PROGRESS_EVERY == 0:
+                print(f"[{stats.extensions}/{len(extensions)}]", file=sys.stderr)
+    seconds = time.perf_counter() - start
+    writer.close(stats.record(seconds))
+    print_summary(stats, seconds, jobs)
+    return 1 if stats.errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
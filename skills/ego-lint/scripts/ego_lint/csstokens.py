@@ -0,0 +1,240 @@
+"""csstokens.py — Single-pass CSS tokenizer and selector index for stylesheets.
+
+One left-to-right scan per stylesheet finds every comment, string and
+`{`/`}`/`;`, and a Stylesheet exposes the rules it delimits:
+
+    sheet = csstokens.load(path)
+    for rule in sheet.rules:
+        rule.selectors       # Selectors of the rule's selector list
+        rule.declarations    # Declarations, with `!important` flags
+        rule.at_rules        # enclosing at-rule preludes, e.g. ('@media (...)',)
+    selector.compounds       # ('.my-ext-panel', '.panel-button:hover', ...)
+    selector.classes         # (('my-ext-panel',), ('panel-button',), ...)
+
+Selectors and declarations are read across line breaks, so multi-line
+selector lists and rules nested in `@media` blocks index like any other.
+Comments never count, and braces and semicolons inside strings do not end
+a rule.
+
+`load(path)` caches per file and `load_stylesheets(ext_dir)` returns every
+stylesheet an extension ships, so checks in one process parse each file
+once.
+"""
+
+import os
+import re
+from bisect import bisect_right
+from collections import namedtuple
+
+from ego_lint import extfs
+
+
+# The stylesheets GNOME Shell loads for an extension, in load order
+STYLESHEETS = ('stylesheet.css', 'stylesheet-dark.css', 'stylesheet-light.css')
+
+_SKIP_RE = re.compile(r'/\*|["\']')
+_COMMENT_END_RE = re.compile(r'\*/')
+_STRING_RE = {
+    "'": re.compile(r"'(?:[^'\\\n]|\\[\s\S])*'?"),
+    '"': re.compile(r'"(?:[^"\\\n]|\\[\s\S])*"?'),
+}
+_STRUCTURAL_RE = re.compile(r'[{};]')
+_NOT_LINE_BREAK_RE = re.compile(r'[^\n]')
+
+# Top-level separators inside a selector: list commas and combinators
+_SELECTOR_SPLIT_RE = re.compile(r'[(),]|\s*[>+~]\s*|\s+')
+_CLASS_RE = re.compile(r'\.([\w-]+)')
+_IMPORTANT_RE = re.compile(r'\s*!\s*important\s*$', re.IGNORECASE)
+
+Selector = namedtuple('Selector', 'text compounds classes')
+Declaration = namedtuple('Declaration', 'property value important line')
+# `line` is the 1-based line of the selector text; declarations fill in as
+# the scan reaches them
+Rule = namedtuple('Rule', 'selectors declarations at_rules line')
+
+
+def _blank(segment):
+    return _NOT_LINE_BREAK_RE.sub(' ', segment)
+
+
+def _split_selectors(prelude):
+    """Selectors of a selector list, each split into compound selectors."""
+    selectors = []
+    compounds = []
+    compound_start = 0
+    selector_start = 0
+    depth = 0
+    for m in _SELECTOR_SPLIT_RE.finditer(prelude):
+        sep = m.group()
+        if sep == '(':
+            depth += 1
+            continue
+        if sep == ')':
+            depth = max(depth - 1, 0)
+            continue
+        if depth:
+            continue
+        compound = prelude[compound_start:m.start()]
+        if compound:
+            compounds.append(compound)
+        compound_start = m.end()
+        if sep == ',':
+            selectors.append((prelude[selector_start:m.start()].strip(), compounds))
+            compounds = []
+            selector_start = m.end()
+    compound = prelude[compound_start:]
+    if compound:
+        compounds.append(compound)
+    selectors.append((prelude[selector_start:].strip(), compounds))
+    return tuple(
+        Selector(text, tuple(compounds),
+                 tuple(tuple(_CLASS_RE.findall(_outside_parens(c))) for c in compounds))
+        for text, compounds in selectors if text)
+
+
+def _outside_parens(compound):
+    """A compound selector without its parenthesized arguments (:not(.x))."""
+    if '(' not in compound:
+        return compound
+    out = []
+    depth = 0
+    for ch in compound:
+        if ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth = max(depth - 1, 0)
+        elif not depth:
+            out.append(ch)
+    return ''.join(out)
+
+
+class Stylesheet:
+    """Parsed view of one stylesheet; see the module docstring."""
+
+    def __init__(self, text, name='stylesheet.css'):
+        self.text = text
+        self.name = name
+        self._code = None
+        self._masked = None
+        self._rules = None
+        self._line_starts = None
+
+    def _strip(self):
+        text = self.text
+        code = []
+        masked = []
+        pos = 0
+        n = len(text)
+        while pos < n:
+            m = _SKIP_RE.search(text, pos)
+            if m is None:
+                break
+            start = m.start()
+            chunk = text[pos:start]
+            code.append(chunk)
+            masked.append(chunk)
+            if m.group() == '/*':
+                end_m = _COMMENT_END_RE.search(text, start + 2)
+                end = end_m.end() if end_m else n
+                blank = _blank(text[start:end])
+                code.append(blank)
+                masked.append(blank)
+            else:
+                end = _STRING_RE[m.group()].match(text, start).end()
+                literal = text[start:end]
+                code.append(literal)
+                masked.append(literal[0] + _blank(literal[1:-1]) + literal[-1]
+                              if len(literal) > 1 else literal)
+            pos = end
+        code.append(text[pos:])
+        masked.append(text[pos:])
+        self._code = ''.join(code)
+        self._masked = ''.join(masked)
+
+    @property
+    def code(self):
+        """Text with comments blanked (line breaks kept)."""
+        if self._code is None:
+            self._strip()
+        return self._code
+
+    @property
+    def masked(self):
+        """code with string contents blanked too."""
+        if self._masked is None:
+            self._strip()
+        return self._masked
+
+    def line_of(self, pos):
+        """1-based line number of offset `pos`."""
+        if self._line_starts is None:
+            self._line_starts = [0] + [m.end() for m in re.finditer('\n', self.text)]
+        return bisect_right(self._line_starts, pos)
+
+    @property
+    def rules(self):
+        """Style rules in source order, nested ones after their parent."""
+        if self._rules is None:
+            self._rules = self._parse()
+        return self._rules
+
+    def _parse(self):
+        code = self.code
+        rules = []
+        stack = []  # open blocks: a Rule, or an at-rule prelude string
+        start = 0
+        for m in _STRUCTURAL_RE.finditer(self.masked):
+            ch = m.group()
+            segment = code[start:m.start()]
+            if ch == '{':
+                prelude = segment.strip()
+                if prelude.startswith('@'):
+                    stack.append(' '.join(prelude.split()))
+                else:
+                    at_rules = tuple(b for b in stack if isinstance(b, str))
+                    line = self.line_of(start + len(segment) - len(segment.lstrip()))
+                    rule = Rule(_split_selectors(prelude), [], at_rules, line)
+                    rules.append(rule)
+                    stack.append(rule)
+            else:
+                if stack and not isinstance(stack[-1], str):
+                    self._declaration(stack[-1], segment, start)
+                if ch == '}' and stack:
+                    stack.pop()
+            start = m.end()
+        return rules
+
+    def _declaration(self, rule, segment, start):
+        stripped = segment.strip()
+        prop, colon, value = stripped.partition(':')
+        if not colon:
+            return
+        m = _IMPORTANT_RE.search(value)
+        if m:
+            value = value[:m.start()]
+        line = self.line_of(start + len(segment) - len(segment.lstrip()))
+        rule.declarations.append(
+            Declaration(prop.strip().lower(), value.strip(), m is not None, line))
+
+
+_CACHE_LIMIT = 64
+_by_path = {}
+
+
+def load(path):
+    """Return the Stylesheet for a file, reading it only when it changed."""
+    key = extfs.stat_key(path)
+    cached = _by_path.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    sheet = Stylesheet(extfs.read_text(path), os.path.basename(path))
+    if len(_by_path) >= _CACHE_LIMIT:
+        _by_path.clear()
+    _by_path[path] = (key, sheet)
+    return sheet
+
+
+def load_stylesheets(ext_dir):
+    """Stylesheets (see STYLESHEETS) present in an extension directory."""
+    return [load(path) for path in (os.path.join(ext_dir, name) for name in STYLESHEETS)
+            if extfs.isfile(path)]
@@ -0,0 +1,288 @@
+"""extfs.py — Read an extension from its directory or straight from its zip.
+
+Usage: python3 -m ego_lint.extfs list ROOT [SUBDIR]
+       python3 -m ego_lint.extfs cat PATH
+       python3 -m ego_lint.extfs grep PATTERN ROOT REL...
+
+ego-lint lints either an extracted extension directory or the .zip a
+reviewer was sent. Zip members are addressed as paths under the zip file
+itself (/tmp/x.zip/lib/util.js), so checks keep joining, splitting and
+printing paths as they always have and only send the reads through here:
+
+    extfs.walk(root)                  # os.walk, also inside a zip
+    extfs.isfile(path), extfs.isdir(path)
+    extfs.read_bytes(path, size=-1)   # size bytes, or everything
+    extfs.read_text(path)             # utf-8, undecodable bytes replaced
+    extfs.stat_key(path)              # changes whenever the content may have
+    extfs.is_executable(path)
+
+Paths outside a zip fall through to os and open(). A zip's central
+directory is read once per process; members are decompressed one at a time,
+only when read, and nothing is extracted to disk. A zip whose files all sit
+in one top-level directory is rooted at that directory.
+
+Every check reads the zip before check-package.py gets to report on it, so
+the zip bomb limits are applied here, when the central directory is read: a
+member that expands_like_bomb() is never decompressed, and neither is any
+member when the others add up to more than MAX_UNCOMPRESSED_SIZE or expand
+like a bomb together. Reading such a member, or a corrupt or encrypted one,
+raises MemberError, an OSError. read_text() reads it as empty text, so the
+source checks pass over it; check-package.py reports what is wrong with it.
+"""
+
+import errno
+import os
+import posixpath
+import re
+import sys
+
+# zipfile is imported on first use, by is_zip() and ZipTree: it costs about
+# 20 ms per process, and most lint runs read a directory with no zip in it.
+
+# A member that inflates more than this many times over is a likely zip bomb
+MAX_COMPRESSION_RATIO = 100
+# ... once it is big enough to matter; tiny padded files compress that well too
+MIN_BOMB_SIZE = 1024 * 1024
+# Uncompressed size of a whole zip past which nothing is inflated
+MAX_UNCOMPRESSED_SIZE = 100 * 1024 * 1024
+
+
+def expands_like_bomb(size, compressed):
+    """Whether `compressed` bytes inflating to `size` look like a zip bomb."""
+    if size < MIN_BOMB_SIZE:
+        return False
+    return not compressed or size / compressed > MAX_COMPRESSION_RATIO
+
+
+class MemberError(OSError):
+    """A zip member that is not decompressed: a likely bomb, or unreadable."""
+
+
+def is_zip(path):
+    """Whether path names a zip file ego-lint should read as an extension."""
+    if not path.lower().endswith('.zip'):
+        return False
+    import zipfile
+    return zipfile.is_zipfile(path)
+
+
+class ZipTree:
+    """Files and directories of one zip, by member path relative to its root."""
+
+    def __init__(self, path):
+        import zipfile
+        import zlib
+        self.path = path
+        self.zip = zipfile.ZipFile(path)
+        # What zipfile raises for corrupt, truncated, encrypted or oddly
+        # compressed members; read() turns them into OSError
+        self.errors = (zipfile.BadZipFile, zlib.error, EOFError,
+                       NotImplementedError, RuntimeError)
+        members = self.zip.infolist()
+        # Bombs are refused one by one; the rest are bounded together
+        self.bombs = {info for info in members
+                      if expands_like_bomb(info.file_size, info.compress_size)}
+        rest = [info for info in members if info not in self.bombs]
+        total = sum(info.file_size for info in rest)
+        if total > MAX_UNCOMPRESSED_SIZE or expands_like_bomb(
+                total, sum(info.compress_size for info in rest)):
+            self.refused = 'the zip exceeds the zip bomb limits'
+        else:
+            self.refused = None
+        infos = {}
+        for info in members:
+            name = posixpath.normpath(info.filename)
+            if info.is_dir() or name.startswith(('/', '../')) or name in ('.', '..'):
+                continue
+            infos.setdefault(name, info)
+        self.prefix = _common_root(infos)
+        if self.prefix:
+            cut = len(self.prefix) + 1
+            infos = {name[cut:]: info for name, info in infos.items()}
+        self.infos = infos
+        # dir -> ([subdirs], [files]) in central-directory order
+        self.children = {'': ([], [])}
+        for name in infos:
+            parent, base = posixpath.split(name)
+            self._add_dir(parent)
+            self.children[parent][1].append(base)
+
+    def _add_dir(self, rel):
+        if rel in self.children:
+            return
+        self.children[rel] = ([], [])
+        parent, base = posixpath.split(rel)
+        self._add_dir(parent)
+        self.children[parent][0].append(base)
+
+    def info(self, rel):
+        return self.infos.get(rel)
+
+    def isdir(self, rel):
+        return rel in self.children
+
+    def read(self, rel, size=-1):
+        info = self.infos.get(rel)
+        if info is None:
+            raise FileNotFoundError(os.path.join(self.path, rel))
+        if info in self.bombs:
+            raise MemberError(errno.EFBIG, 'Not decompressed: the member expands like a '
+                              'zip bomb', os.path.join(self.path, rel))
+        if self.refused:
+            raise MemberError(errno.EFBIG, f'Not decompressed: {self.refused}',
+                              os.path.join(self.path, rel))
+        try:
+            with self.zip.open(info) as f:
+                return f.read(size)
+        except self.errors as e:
+            raise MemberError(errno.EIO, f'Cannot read zip member: {e}',
+                              os.path.join(self.path, rel)) from e
+
+    def walk(self, rel):
+        if rel not in self.children:
+            return
+        subdirs, files = self.children[rel]
+        subdirs = list(subdirs)
+        top = os.path.join(self.path, rel) if rel else self.path
+        yield top, subdirs, list(files)
+        for name in subdirs:
+            yield from self.walk(posixpath.join(rel, name))
+
+
+def _common_root(infos):
+    """The one top-level directory holding every file and metadata.json, or ''."""
+    if 'metadata.json' in infos:
+        return ''
+    tops = {name.split('/', 1)[0] for name in infos}
+    if len(tops) != 1:
+        return ''
+    top = tops.pop()
+    return top if top + '/metadata.json' in infos else ''
+
+
+# Bounded like the jstokens caches; a dropped ZipTree closes its zip
+_CACHE_LIMIT = 64
+_trees = {}
+
+
+def _split(path):
+    """(ZipTree, member) for a path at or under a zip file, else (None, None)."""
+    lower = path.lower()
+    pos = lower.find('.zip')
+    while pos >= 0:
+        end = pos + 4
+        if end == len(path) or path[end] == os.sep:
+            archive = path[:end]
+            tree = _trees.get(archive)
+            if tree is None and archive not in _trees:
+                if len(_trees) >= _CACHE_LIMIT:
+                    _trees.clear()
+                tree = _trees[archive] = ZipTree(archive) if is_zip(archive) else None
+            if tree is not None:
+                return tree, path[end + 1:]
+        pos = lower.find('.zip', end)
+    return None, None
+
+
+def walk(root):
+    """os.walk(root), also when root is a zip or a directory inside one."""
+    tree, rel = _split(root)
+    if tree is None:
+        return os.walk(root)
+    return tree.walk(rel)
+
+
+def isfile(path):
+    tree, rel = _split(path)
+    if tree is None or not rel:
+        return os.path.isfile(path)
+    return tree.info(rel) is not None
+
+
+def isdir(path):
+    tree, rel = _split(path)
+    if tree is None:
+        return os.path.isdir(path)
+    return tree.isdir(rel)
+
+
+def read_bytes(path, size=-1):
+    tree, rel = _split(path)
+    if tree is None:
+        with open(path, 'rb') as f:
+            return f.read(size)
+    return tree.read(rel, size)
+
+
+def read_text(path):
+    """Text of a file as open(path, encoding='utf-8', errors='replace') reads it.
+
+    A zip member that is not decompressed (see MemberError) reads as ''.
+    """
+    try:
+        text = read_bytes(path).decode('utf-8', errors='replace')
+    except MemberError:
+        return ''
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def stat_key(path):
+    """(size, mtime or CRC) of a file, for content caches."""
+    tree, rel = _split(path)
+    if tree is None:
+        st = os.stat(path)
+        return (st.st_size, st.st_mtime_ns)
+    info = tree.info(rel)
+    if info is None:
+        raise FileNotFoundError(path)
+    return (info.file_size, info.CRC)
+
+
+def is_executable(path):
+    """Whether a file has an execute bit (zip members without Unix modes count)."""
+    tree, rel = _split(path)
+    if tree is None:
+        return os.access(path, os.X_OK)
+    info = tree.info(rel)
+    mode = info.external_attr >> 16 if info is not None else 0
+    return not mode or bool(mode & 0o111)
+
+
+def files(root, subdir=''):
+    """Paths of the files under root (or root/subdir), relative to root."""
+    start = os.path.join(root, subdir) if subdir else root
+    for dirpath, _dirs, filenames in walk(start):
+        for name in filenames:
+            yield os.path.relpath(os.path.join(dirpath, name), root)
+
+
+def main():
+    args = sys.argv[1:]
+    if args[:1] == ['list'] and len(args) in (2, 3):
+        for rel in files(*args[1:]):
+            print(rel)
+    elif args[:1] == ['cat'] and len(args) == 2:
+        try:
+            sys.stdout.buffer.write(read_bytes(args[1]))
+        except OSError as e:
+            print(f"extfs: {e}", file=sys.stderr)
+            sys.exit(1)
+    elif args[:1] == ['grep'] and len(args) >= 4:
+        pattern = re.compile(args[1])
+        for rel in args[3:]:
+            try:
+                text = read_text(os.path.join(args[2], rel))
+            except OSError:
+                continue
+            for lineno, line in enumerate(text.split('\n'), 1):
+                if pattern.search(line):
+                    print(f"{rel}:{lineno}:{line}")
+    else:
+        print(__doc__.split('\n\n')[1], file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,239 @@
+"""gschema.py — GSettings schemas of an extension, parsed once into a key index.
+
+Every schemas/**/*.gschema.xml is read with one streaming pass
+(xml.etree.ElementTree.iterparse) into schemas and their keys:
+
+    index = gschema.load(ext_dir)
+    index.files                  # SchemaFile per schema file, in walk order
+    sf.schemas, sf.error         # Schemas it defines; parse error or None
+    sf.schema_id, sf.schema_path # first <schema> id/path ('' if none)
+    index.schemas                # {'org.gnome.shell.extensions.x': Schema}
+    schema.keys                  # {'panel-position': Key('panel-position', 's', ...)}
+    index.keys('org.gnome...')   # keys of a schema, `extends` chain included
+    index.key_names              # every key name of every schema (a set)
+
+`load(ext_dir)` caches per extension, so checks in one process share it.
+
+`compile_check(ext_dir)` runs `glib-compile-schemas --strict --dry-run` on
+schemas/ and returns its (exit code, output). Results are cached on disk
+(ego_lint/cache.py) by the content hash of every file the compiler reads
+plus the compiler binary itself, so unchanged schemas never re-run the
+external tool; the MAX_COMPILE_ENTRIES most recently used results are kept. Paths in the output are relative (`schemas/x.gschema.xml`),
+which keeps cached results valid for any checkout and for zips, whose
+schema files are copied to a temporary directory for the compiler.
+"""
+
+import hashlib
+import io
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+from collections import namedtuple
+from xml.etree.ElementTree import ParseError, iterparse
+
+from ego_lint import cache, extfs
+
+
+SCHEMAS_DIR = 'schemas'
+SCHEMA_SUFFIX = '.gschema.xml'
+# Files glib-compile-schemas reads from the (top level of the) schemas dir
+COMPILER_INPUTS = (SCHEMA_SUFFIX, '.gschema.override')
+# Bump when the cached compile entry changes shape
+COMPILE_CACHE_VERSION = 1
+# Each new set of schema files adds an entry; the least recently used go
+# past this many
+MAX_COMPILE_ENTRIES = 2048
+
+Key = namedtuple('Key', 'name type enum flags default')
+Schema = namedtuple('Schema', 'id path extends keys children')
+
+# Attribute fallback for files the XML parser rejects
+_ID_RE = re.compile(r'\bid="([^"]*)"')
+_PATH_RE = re.compile(r'\bpath="([^"]*)"')
+
+
+class SchemaFile:
+    """One .gschema.xml: the schemas it defines, or why it could not be parsed."""
+
+    def __init__(self, path, data):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.schemas = []
+        self.error = None
+        try:
+            self.schemas = _parse(data)
+        except ParseError as e:
+            self.error = str(e)
+            text = data.decode('utf-8', errors='replace')
+            m = _ID_RE.search(text)
+            self._fallback_id = m.group(1) if m else ''
+            m = _PATH_RE.search(text)
+            self._fallback_path = m.group(1) if m else ''
+
+    @property
+    def schema_id(self):
+        if self.error:
+            return self._fallback_id
+        return self.schemas[0].id if self.schemas else ''
+
+    @property
+    def schema_path(self):
+        if self.error:
+            return self._fallback_path
+        return self.schemas[0].path if self.schemas else ''
+
+
+def _parse(data):
+    """Schemas of one file, streamed; each element is dropped once consumed."""
+    schemas = []
+    schema = None
+    key = None
+    for event, elem in iterparse(io.BytesIO(data), events=('start', 'end')):
+        tag = elem.tag
+        if event == 'start':
+            if tag == 'schema':
+                schema = Schema(elem.get('id', ''), elem.get('path', ''),
+                                elem.get('extends', ''), {}, {})
+            elif tag == 'key' and schema is not None:
+                key = elem
+            continue
+        if tag == 'key' and schema is not None and key is elem:
+            name = elem.get('name', '')
+            default = elem.find('default')
+            schema.keys.setdefault(name, Key(
+                name, elem.get('type', ''), elem.get('enum', ''), elem.get('flags', ''),
+                default.text.strip() if default is not None and default.text else ''))
+            key = None
+            elem.clear()
+        elif tag == 'child' and schema is not None:
+            schema.children[elem.get('name', '')] = elem.get('schema', '')
+        elif tag == 'schema':
+            if schema is not None:
+                schemas.append(schema)
+            schema = None
+            elem.clear()
+    return schemas
+
+
+def schema_paths(ext_dir):
+    """Every schemas/**/*.gschema.xml of an extension, in walk order."""
+    paths = []
+    for dirpath, _dirs, files in extfs.walk(os.path.join(ext_dir, SCHEMAS_DIR)):
+        paths.extend(os.path.join(dirpath, name) for name in files
+                     if name.endswith(SCHEMA_SUFFIX))
+    return paths
+
+
+class SchemaIndex:
+    """All schemas of an extension; see the module docstring."""
+
+    def __init__(self, ext_dir):
+        self.ext_dir = ext_dir
+        self.files = []
+        for path in schema_paths(ext_dir):
+            try:
+                data = extfs.read_bytes(path)
+            except OSError:
+                continue
+            self.files.append(SchemaFile(path, data))
+        self.schemas = {}
+        for sf in self.files:
+            for schema in sf.schemas:
+                self.schemas.setdefault(schema.id, schema)
+        self.key_names = {name for schema in self.schemas.values() for name in schema.keys}
+
+    def keys(self, schema_id):
+        """{name: Key} of a schema, including those of the schemas it extends."""
+        keys = {}
+        seen = set()
+        while schema_id in self.schemas and schema_id not in seen:
+            seen.add(schema_id)
+            schema = self.schemas[schema_id]
+            for name, key in schema.keys.items():
+                keys.setdefault(name, key)
+            schema_id = schema.extends
+        return keys
+
+
+# Bounded like the jstokens caches
+_CACHE_LIMIT = 64
+_by_dir = {}
+
+
+def load(ext_dir):
+    """Return the (cached) SchemaIndex of an extension."""
+    ext_dir = os.path.realpath(ext_dir)
+    index = _by_dir.get(ext_dir)
+    if index is None:
+        if len(_by_dir) >= _CACHE_LIMIT:
+            _by_dir.clear()
+        index = _by_dir[ext_dir] = SchemaIndex(ext_dir)
+    return index
+
+
+def _compiler_inputs(schemas_dir):
+    """(name, path) of the files glib-compile-schemas reads, sorted by name."""
+    for _dirpath, _dirs, files in extfs.walk(schemas_dir):
+        return sorted((name, os.path.join(schemas_dir, name)) for name in files
+                      if name.endswith(COMPILER_INPUTS))
+    return []
+
+
+def compile_check(ext_dir, compiler=None, cache_dir=None):
+    """(exit code, output) of `glib-compile-schemas --strict --dry-run schemas/`.
+
+    Returns None when the compiler is not installed. Pass cache_dir=None to
+    use default_cache_dir(), or False to bypass the cache.
+    """
+    compiler = compiler or shutil.which('glib-compile-schemas')
+    if not compiler:
+        return None
+    if cache_dir is None:
+        cache_dir = cache.default_cache_dir()
+    schemas_dir = os.path.join(ext_dir, SCHEMAS_DIR)
+    inputs = []
+    for name, path in _compiler_inputs(schemas_dir):
+        try:
+            inputs.append((name, extfs.read_bytes(path)))
+        except OSError:
+            continue  # left out, as SchemaIndex leaves it out
+
+    entry = None
+    if cache_dir:
+        st = os.stat(compiler)
+        h = hashlib.sha256(f'{COMPILE_CACHE_VERSION}\0{compiler}\0{st.st_size}\0'
+                           f'{st.st_mtime_ns}\0'.encode())
+        for name, data in inputs:
+            h.update(f'{name}\0{len(data)}\0'.encode())
+            h.update(data)
+        entry = cache.entry_path(cache_dir, 'schema-compile', h.hexdigest())
+        cached = cache.load_json(entry)
+        if isinstance(cached, list) and len(cached) == 2:
+            cache.touch(entry)
+            return tuple(cached)
+
+    if extfs.isdir(schemas_dir) and not os.path.isdir(schemas_dir):
+        # A zip: the compiler needs the files on disk
+        with tempfile.TemporaryDirectory(prefix='ego-lint-schemas-') as tmp:
+            for name, data in inputs:
+                with open(os.path.join(tmp, name), 'wb') as f:
+                    f.write(data)
+            outcome = _run_compiler(compiler, tmp)
+    else:
+        outcome = _run_compiler(compiler, schemas_dir)
+
+    if entry:
+        cache.store_json(entry, list(outcome))
+        cache.prune_fanout(entry, MAX_COMPILE_ENTRIES)
+    return outcome
+
+
+def _run_compiler(compiler, directory):
+    proc = subprocess.run([compiler, '--strict', '--dry-run', directory],
+                          stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                          stdin=subprocess.DEVNULL)
+    output = proc.stdout.decode('utf-8', errors='replace').strip()
+    output = output.replace(directory.rstrip(os.sep) + os.sep, SCHEMAS_DIR + '/')
+    return proc.returncode, output
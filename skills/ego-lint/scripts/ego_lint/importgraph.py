@@ -0,0 +1,165 @@
+"""importgraph.py — ESM import graph for a GNOME extension.
+
+Each module's import/export-from statements are parsed once, relative
+specifiers are resolved once per (directory, specifier) pair, and
+reachability from any entry point (prefs.js, extension.js) is a BFS over the
+memoized edges.
+
+Usage:
+    graph = ImportGraph(ext_dir)
+    graph.reachable('prefs.js')       # ['prefs.js', 'lib/settings.js', ...]
+    graph.bindings('extension.js')    # {'Manager': 'lib/manager.js', ...}
+"""
+
+import os
+import re
+from collections import deque, namedtuple
+
+from ego_lint import extfs
+
+
+# import X from '...' / import {A, B as C} from '...' / import * as NS from '...'
+# import X, {A} from '...' / import '...' / export {A} from '...' / export * from '...'
+IMPORT_RE = re.compile(
+    r'''\b(?P<kind>import|export)\s+'''
+    r'''(?:(?P<clause>(?:[\w$]+\s*,\s*)?(?:\{[^{}]*\}|\*(?:\s*as\s+[\w$]+)?)'''
+    r'''|[\w$]+)\s*\bfrom\s*)?'''
+    r'''(?P<quote>['"])(?P<spec>[^'"\n]+)(?P=quote)'''
+)
+
+ImportStatement = namedtuple('ImportStatement', 'line kind spec names')
+
+
+def _clause_names(clause):
+    """Local names bound by an import clause, in source order."""
+    names = []
+    rest = clause.strip()
+    # Default import first: `Foo` or `Foo, {...}` / `Foo, * as NS`
+    m = re.match(r'([\w$]+)\s*(?:,|$)', rest)
+    if m:
+        names.append(m.group(1))
+        rest = rest[m.end():].strip()
+    m = re.match(r'\*\s*as\s+([\w$]+)', rest)
+    if m:
+        names.append(m.group(1))
+    elif rest.startswith('{'):
+        for part in rest.strip('{} \n\t').split(','):
+            name = part.strip().split(' as ')[-1].strip()
+            if name:
+                names.append(name)
+    return names
+
+
+def parse_imports(content):
+    """Return the ImportStatements in `content`, in source order.
+
+    `names` holds the local bindings of an import; export-from and bare
+    side-effect imports bind nothing.
+    """
+    statements = []
+    line = 1
+    pos = 0
+    for m in IMPORT_RE.finditer(content):
+        line += content.count('\n', pos, m.start())
+        pos = m.start()
+        clause = m.group('clause')
+        kind = m.group('kind')
+        if kind == 'export' and clause is None:
+            continue  # `export 'x'` is not a statement
+        names = _clause_names(clause) if kind == 'import' and clause else []
+        statements.append(ImportStatement(line, kind, m.group('spec'), names))
+    return statements
+
+
+def _read(path):
+    return extfs.read_text(path)
+
+
+class ImportGraph:
+    """Lazily parsed, memoized import graph rooted at an extension directory.
+
+    Module keys are paths relative to ext_dir. Only relative specifiers
+    (./, ../) produce edges; resource:// and gi:// imports are ignored.
+    """
+
+    def __init__(self, ext_dir):
+        self.ext_dir = ext_dir
+        self._statements = {}
+        self._resolved = {}
+        self._deps = {}
+
+    def statements(self, rel, content=None):
+        """ImportStatements of module `rel`; `content` skips the file read."""
+        cached = self._statements.get(rel)
+        if cached is None:
+            if content is None:
+                try:
+                    content = _read(os.path.join(self.ext_dir, rel))
+                except OSError:
+                    content = ''
+            cached = self._statements[rel] = parse_imports(content)
+        return cached
+
+    def resolve(self, from_rel, spec):
+        """Resolve a relative specifier to a module path, or None.
+
+        A specifier without a matching file resolves to `spec` + '.js' when
+        that exists, otherwise to the normalized path as written.
+        """
+        if not spec.startswith('.'):
+            return None
+        key = (os.path.dirname(from_rel), spec)
+        target = self._resolved.get(key)
+        if target is None:
+            target = os.path.normpath(os.path.join(key[0], spec))
+            path = os.path.join(self.ext_dir, target)
+            if not extfs.isfile(path) and extfs.isfile(path + '.js'):
+                target += '.js'
+            self._resolved[key] = target
+        return target
+
+    def binding_specs(self, rel, content=None):
+        """Map each name imported from a local module to its specifier."""
+        return {name: stmt.spec
+                for stmt in self.statements(rel, content) if stmt.spec.startswith('.')
+                for name in stmt.names}
+
+    def bindings(self, rel, content=None):
+        """Map each name imported from a local module to that module's path."""
+        return {name: self.resolve(rel, spec)
+                for name, spec in self.binding_specs(rel, content).items()}
+
+    def dependencies(self, rel):
+        """Existing local modules imported or re-exported by `rel`."""
+        deps = self._deps.get(rel)
+        if deps is None:
+            deps = []
+            for stmt in self.statements(rel):
+                target = self.resolve(rel, stmt.spec)
+                if (target is not None and target not in deps
+                        and extfs.isfile(os.path.join(self.ext_dir, target))):
+                    deps.append(target)
+            self._deps[rel] = deps
+        return deps
+
+    def reachable(self, *entries):
+        """Modules reachable from the given entry points, in BFS order.
+
+        Entries that do not exist are skipped; existing ones are included.
+        """
+        seen = set()
+        order = []
+        queue = deque()
+        for entry in entries:
+            entry = os.path.normpath(entry)
+            if entry not in seen and extfs.isfile(os.path.join(self.ext_dir, entry)):
+                seen.add(entry)
+                queue.append(entry)
+        while queue:
+            rel = queue.popleft()
+            order.append(rel)
+            for dep in self.dependencies(rel):
+                if dep not in seen:
+                    seen.add(dep)
+                    queue.append(dep)
+        return order
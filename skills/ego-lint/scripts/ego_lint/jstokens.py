@@ -0,0 +1,414 @@
+"""jstokens.py — Single-pass JavaScript tokenizer shared by the Tier 2 checks.
+
+One left-to-right scan per file finds every comment, string literal,
+template literal (including nested `${...}` substitutions), regex literal,
+and curly brace, which is everything regex-based stripping and line-based
+brace counting get wrong. From that scan a JSSource exposes:
+
+    code         text with comments blanked
+    masked       code with literal contents blanked too, for brace matching
+                 and for patterns that must not fire inside strings
+    kinds/starts/ends
+                 compact token arrays for the structural tokens (literals
+                 and braces) in source order
+    match()      offset of the bracket matching the one at a given offset
+    line_depths  `{}` depth at the start of each line
+    try_blocks   every try statement with its catch/finally clauses, paired
+                 through matched braces
+
+Blanking replaces characters with spaces and keeps line breaks, so an offset
+or line number found in `code` or `masked` is valid in the original text, and
+text.splitlines() and masked.splitlines() line up.
+
+The scan runs on first use, and `load(path)` caches per file, so the checks
+in one process read and tokenize each file at most once.
+"""
+
+import re
+from array import array
+from bisect import bisect_right
+from collections import namedtuple
+
+from ego_lint import extfs
+
+
+# Token kinds (stored in a bytearray)
+STRING, TEMPLATE, REGEX, BRACE = range(4)
+
+# Everything between two matches of this is plain code the scan skips over.
+# Parens and brackets are paired lazily from `masked` (see match()).
+_STRUCTURAL_RE = re.compile(r"""//|/\*|['"`/{}]""")
+
+_STRING_RE = {
+    "'": re.compile(r"'(?:[^'\\\n]|\\[\s\S])*'?"),
+    '"': re.compile(r'"(?:[^"\\\n]|\\[\s\S])*"?'),
+}
+
+# Template text up to the closing backtick or the next substitution
+_TEMPLATE_CHUNK_RE = re.compile(r'(?:[^`\\$]|\\[\s\S]|\$(?!\{))*')
+
+_REGEX_BODY_RE = re.compile(r'/(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[A-Za-z]*')
+
+_WORD_BEFORE_RE = re.compile(r'[\w$]+$')
+
+# After these keywords a `/` starts a regex literal, not a division
+_REGEX_PREFIX_KEYWORDS = frozenset({
+    'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+    'throw', 'case', 'do', 'else', 'yield', 'await',
+})
+
+_BRACKET_RE = re.compile(r'[()\[\]]')
+
+_TRY_RE = re.compile(r'\btry\s*\{')
+_CATCH_RE = re.compile(r'\s*catch\b\s*(?:\([^()]*\)\s*)?\{')
+_FINALLY_RE = re.compile(r'\s*finally\s*\{')
+
+# One try statement. `start` is the offset of `try`; body/catch_body/
+# finally_body are (open, close) offsets of the braces, and catch/finally_
+# hold the keyword offsets (None when the clause is absent).
+TryBlock = namedtuple(
+    'TryBlock', 'start body catch catch_body finally_ finally_body')
+_BRACKET_PAIRS = {')': '(', ']': '['}
+
+# Characters str.splitlines() breaks on; blanking keeps them so that
+# text.splitlines() and masked.splitlines() stay aligned
+_LINE_BREAK_RE = re.compile(r'[\n\r\x0b\x0c\x1c-\x1e\x85\u2028\u2029]')
+_NOT_LINE_BREAK_RE = re.compile(r'[^\n\r\x0b\x0c\x1c-\x1e\x85\u2028\u2029]')
+
+
+def _blanked(segment):
+    """Spaces for every character of `segment` except line breaks."""
+    if _LINE_BREAK_RE.search(segment) is None:
+        return ' ' * len(segment)
+    return _NOT_LINE_BREAK_RE.sub(' ', segment)
+
+
+class JSSource:
+    """Tokenized view of one JS file; see the module docstring."""
+
+    __slots__ = ('text', '_code', '_masked', '_kinds', '_starts', '_ends',
+                 '_braces', '_brackets', '_line_starts', '_line_depths',
+                 '_try_blocks')
+
+    def __init__(self, text):
+        self.text = text
+        self._code = None
+        self._masked = None
+        self._kinds = None
+        self._starts = None
+        self._ends = None
+        self._braces = None
+        self._brackets = None
+        self._line_starts = None
+        self._line_depths = None
+        self._try_blocks = None
+
+    # -- scanning ----------------------------------------------------------
+
+    def _scan(self):
+        text = self.text
+        n = len(text)
+        kinds = bytearray()
+        starts = array('i')
+        ends = array('i')
+        braces = {}
+        # Output is assembled from slices of text plus blanked spans
+        code_parts = []
+        masked_parts = []
+        code_pos = 0
+        masked_pos = 0
+        # Open braces; a template substitution pushes -(offset + 1) so its
+        # closing brace resumes the template instead of closing code
+        stack = []
+        pos = 0
+
+        def blank(start, end, in_code):
+            nonlocal code_pos, masked_pos
+            if end <= start:
+                return
+            spaces = _blanked(text[start:end])
+            if in_code:
+                code_parts.append(text[code_pos:start])
+                code_parts.append(spaces)
+                code_pos = end
+            masked_parts.append(text[masked_pos:start])
+            masked_parts.append(spaces)
+            masked_pos = end
+
+        def template_chunk(start):
+            # Template text from start; returns the offset after it
+            end = _TEMPLATE_CHUNK_RE.match(text, start).end()
+            if text.startswith('${', end):
+                blank(start, end + 2, False)
+                stack.append(-(end + 1) - 1)
+                return end + 2
+            blank(start, end, False)
+            return min(end + 1, n)
+
+        search = _STRUCTURAL_RE.search
+        while True:
+            m = search(text, pos)
+            if m is None:
+                break
+            pos = m.start()
+            tok = m.group()
+
+            if tok == '{':
+                stack.append(pos)
+                kinds.append(BRACE)
+                starts.append(pos)
+                ends.append(pos + 1)
+                pos += 1
+            elif tok == '}':
+                end = pos + 1
+                kind = BRACE
+                if stack:
+                    open_pos = stack.pop()
+                    if open_pos < 0:
+                        # End of a substitution: back into template text
+                        open_pos = -open_pos - 1
+                        blank(pos, end, False)
+                        end = template_chunk(end)
+                        kind = TEMPLATE
+                    braces[open_pos] = pos
+                    braces[pos] = open_pos
+                kinds.append(kind)
+                starts.append(pos)
+                ends.append(end)
+                pos = end
+            elif tok == "'" or tok == '"':
+                end = _STRING_RE[tok].match(text, pos).end()
+                blank(pos + 1, end - 1, False)
+                kinds.append(STRING)
+                starts.append(pos)
+                ends.append(end)
+                pos = end
+            elif tok == '`':
+                end = template_chunk(pos + 1)
+                kinds.append(TEMPLATE)
+                starts.append(pos)
+                ends.append(end)
+                pos = end
+            elif tok == '//':
+                end = text.find('\n', pos)
+                end = n if end < 0 else end
+                blank(pos, end, True)
+                pos = end
+            elif tok == '/*':
+                end = text.find('*/', pos + 2)
+                end = n if end < 0 else end + 2
+                blank(pos, end, True)
+                pos = end
+            else:  # '/'
+                regex = self._regex_allowed(pos) and _REGEX_BODY_RE.match(text, pos)
+                if regex:
+                    end = regex.end()
+                    blank(pos + 1, end, False)
+                    kinds.append(REGEX)
+                    starts.append(pos)
+                    ends.append(end)
+                    pos = end
+                else:
+                    pos += 1
+
+        code_parts.append(text[code_pos:])
+        masked_parts.append(text[masked_pos:])
+        self._code = ''.join(code_parts)
+        self._masked = ''.join(masked_parts)
+        self._kinds = kinds
+        self._starts = starts
+        self._ends = ends
+        self._braces = braces
+
+    def _regex_allowed(self, pos):
+        """Whether a `/` at pos starts a regex literal rather than dividing."""
+        text = self.text
+        j = pos - 1
+        while j >= 0 and text[j] in ' \t\r\n':
+            j -= 1
+        if j < 0:
+            return True
+        ch = text[j]
+        if ch in ')]}':
+            return False
+        if ch in '+-' and j > 0 and text[j - 1] == ch:
+            # `i++ / 2`: a postfix ++ or -- ends an operand, so this divides
+            k = j - 2
+            while k >= 0 and text[k] in ' \t':
+                k -= 1
+            return not (k >= 0 and (text[k].isalnum() or text[k] in '_$)]'))
+        if ch.isalnum() or ch in '_$':
+            word = _WORD_BEFORE_RE.search(text, max(0, j - 16), j + 1)
+            return word is not None and word.group() in _REGEX_PREFIX_KEYWORDS
+        return True
+
+    def _pair_brackets(self):
+        pairs = {}
+        stack = []
+        for m in _BRACKET_RE.finditer(self.masked):
+            ch = m.group()
+            pos = m.start()
+            if ch == '(' or ch == '[':
+                stack.append((ch, pos))
+            elif stack and stack[-1][0] == _BRACKET_PAIRS[ch]:
+                open_pos = stack.pop()[1]
+                pairs[open_pos] = pos
+                pairs[pos] = open_pos
+        self._brackets = pairs
+
+    # -- views -------------------------------------------------------------
+
+    @property
+    def code(self):
+        if self._code is None:
+            self._scan()
+        return self._code
+
+    @property
+    def masked(self):
+        if self._masked is None:
+            self._scan()
+        return self._masked
+
+    @property
+    def kinds(self):
+        if self._kinds is None:
+            self._scan()
+        return self._kinds
+
+    @property
+    def starts(self):
+        if self._starts is None:
+            self._scan()
+        return self._starts
+
+    @property
+    def ends(self):
+        if self._ends is None:
+            self._scan()
+        return self._ends
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def token_text(self, i):
+        return self.text[self.starts[i]:self.ends[i]]
+
+    def match(self, pos):
+        """Offset of the bracket matching the one at `pos`, or None.
+
+        Works for `{}`, `()` and `[]`; brackets inside comments and literals
+        never match anything.
+        """
+        if self._braces is None:
+            self._scan()
+        other = self._braces.get(pos)
+        if other is None:
+            if self._brackets is None:
+                self._pair_brackets()
+            other = self._brackets.get(pos)
+        return other
+
+    @property
+    def line_starts(self):
+        if self._line_starts is None:
+            starts = array('i', [0])
+            find = self.text.find
+            i = find('\n')
+            while i >= 0:
+                starts.append(i + 1)
+                i = find('\n', i + 1)
+            self._line_starts = starts
+        return self._line_starts
+
+    def line_of(self, pos):
+        """1-based line number of offset `pos`."""
+        return bisect_right(self.line_starts, pos)
+
+    @property
+    def line_depths(self):
+        """`{}` nesting depth at the start of each line (index 0 = line 1).
+
+        Only code braces count; depth never drops below zero.
+        """
+        if self._line_depths is None:
+            depths = array('i')
+            depth = 0
+            for line in self.masked.split('\n'):
+                depths.append(depth)
+                depth += line.count('{') - line.count('}')
+                if depth < 0:
+                    depth = 0
+            self._line_depths = depths
+        return self._line_depths
+
+    @property
+    def try_blocks(self):
+        """TryBlocks in source order, nested ones after their parent.
+
+        Keywords in comments and literals are ignored. A try whose braces do
+        not balance is left out; clauses are matched only when they follow
+        the closing brace of the previous one.
+        """
+        if self._try_blocks is None:
+            masked = self.masked
+            match = self.match
+            blocks = []
+            for m in _TRY_RE.finditer(masked):
+                open_pos = m.end() - 1
+                close = match(open_pos)
+                if close is None:
+                    continue
+                catch = catch_body = finally_ = finally_body = None
+                end = close + 1
+                c = _CATCH_RE.match(masked, end)
+                if c:
+                    catch_close = match(c.end() - 1)
+                    if catch_close is not None:
+                        catch = masked.index('catch', end)
+                        catch_body = (c.end() - 1, catch_close)
+                        end = catch_close + 1
+                f = _FINALLY_RE.match(masked, end)
+                if f:
+                    finally_close = match(f.end() - 1)
+                    if finally_close is not None:
+                        finally_ = masked.index('finally', end)
+                        finally_body = (f.end() - 1, finally_close)
+                blocks.append(TryBlock(m.start(), (open_pos, close), catch,
+                                       catch_body, finally_, finally_body))
+            self._try_blocks = blocks
+        return self._try_blocks
+
+
+# Bounded so long-running callers (corpus mode) do not hold every file
+_CACHE_LIMIT = 256
+_by_text = {}
+_by_path = {}
+
+
+def source(text):
+    """Return the (cached) JSSource for `text`."""
+    src = _by_text.get(text)
+    if src is None:
+        if len(_by_text) >= _CACHE_LIMIT:
+            _by_text.clear()
+        src = _by_text[text] = JSSource(text)
+    return src
+
+
+def load(path):
+    """Return the JSSource for a file, reading it only when it changed."""
+    key = extfs.stat_key(path)
+    cached = _by_path.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    src = source(extfs.read_text(path))
+    if len(_by_path) >= _CACHE_LIMIT:
+        _by_path.clear()
+    _by_path[path] = (key, src)
+    return src
+
+
+def strip_comments(text):
+    """Blank comments, leaving strings and line numbers intact."""
+    return source(text).code
@@ -0,0 +1,150 @@
+"""lifecycle.py — enable()/disable()/destroy() bodies of a JS file, indexed once.
+
+Lifecycle checks ask the same questions of the same few method bodies: is
+Source.remove() called in disable(), which widgets does enable() create, is
+this._x reset to null anywhere. A LifecycleIndex answers them from one scan
+per file instead of each check re-finding the body with its own regex:
+
+    index = lifecycle.load(path)
+    disable = index.disable          # LifecycleMethod or None
+    disable.calls                    # (callee, offset) pairs: 'GLib.Source.remove', ...
+    disable.assigned                 # {'_timeoutId': offset, ...} this._x = ...
+    disable.nulled                   # {'_timeoutId', ...} this._x = null
+    index.text(disable)              # comment-free body text
+    index.null_resets                # {'_x': [offsets]} across the whole file
+    index.field_calls                # {'_x': {'destroy', ...}} this._x.method(...)
+
+Each method is the first `name() {` in the file, as the checks have always
+looked for it; its body ends at the brace the tokenizer matches (or at the
+end of the file when unbalanced). Fields, calls and resets are read from the
+masked view, so text inside strings and comments never counts.
+"""
+
+import re
+from collections import namedtuple
+
+from ego_lint import jstokens
+
+
+# Literal-first so the regex engine can skip ahead; the word boundary before
+# the name is checked by hand
+METHOD_RES = {
+    name: re.compile(name + r'\s*\(\s*\)\s*\{')
+    for name in ('enable', 'disable', 'destroy')
+}
+_IDENT_CHAR_RE = re.compile(r'[\w$]')
+ASSIGN_RE = re.compile(r'this\.([\w$]+)\s*=(?![=>])\s*(null\b)?')
+# Consumes every identifier chain, so no match restarts mid-name; calls are
+# the chains with a `(` after them
+CHAIN_RE = re.compile(r'([\w$]+(?:\??\.[\w$]+)*)(\s*\()?')
+# this._x = null, or this._x.method( / this._x?.method(
+FIELD_USE_RE = re.compile(r'this\.([\w$]+)(?:\s*=\s*(null)\b|\??\.([\w$]+)\s*\()')
+_NOT_CALLS = frozenset({'if', 'for', 'while', 'switch', 'catch', 'with',
+                        'function', 'return', 'typeof', 'await', 'new'})
+
+# `start` is the offset of the name; `body` the (open, close) braces, with
+# close at len(text) for an unbalanced body
+LifecycleMethod = namedtuple('LifecycleMethod', 'name start body assigned calls nulled')
+
+
+def _find_method(src, name):
+    masked = src.masked
+    for m in METHOD_RES[name].finditer(masked):
+        if m.start() and _IDENT_CHAR_RE.match(masked, m.start() - 1):
+            continue  # `_disable() {`, `onEnable() {`, ...
+        open_pos = m.end() - 1
+        close = src.match(open_pos)
+        if close is None:
+            close = len(masked)
+        assigned = {}
+        nulled = set()
+        for a in ASSIGN_RE.finditer(masked, open_pos + 1, close):
+            assigned.setdefault(a.group(1), a.start())
+            if a.group(2):
+                nulled.add(a.group(1))
+        calls = tuple(
+            (c.group(1).replace('?.', '.'), c.start())
+            for c in CHAIN_RE.finditer(masked, open_pos + 1, close)
+            if c.group(2) and c.group(1) not in _NOT_CALLS)
+        return LifecycleMethod(name, m.start(), (open_pos, close), assigned, calls, nulled)
+    return None
+
+
+class LifecycleIndex:
+    """Lifecycle methods and this._x field uses of one file.
+
+    Each table is built on first use.
+    """
+
+    def __init__(self, src):
+        self.src = src
+        self._methods = {}
+        self._null_resets = None
+        self._field_calls = None
+
+    def method(self, name):
+        """The first `name() {` method ('enable', 'disable' or 'destroy'), or None."""
+        if name not in self._methods:
+            self._methods[name] = _find_method(self.src, name)
+        return self._methods[name]
+
+    @property
+    def enable(self):
+        return self.method('enable')
+
+    @property
+    def disable(self):
+        return self.method('disable')
+
+    @property
+    def destroy(self):
+        return self.method('destroy')
+
+    def text(self, method, view='code'):
+        """Body text of a method, between its braces."""
+        return getattr(self.src, view)[method.body[0] + 1:method.body[1]]
+
+    @property
+    def null_resets(self):
+        """Offsets of each `this._x = null`, by field name."""
+        if self._null_resets is None:
+            self._scan_fields()
+        return self._null_resets
+
+    @property
+    def field_calls(self):
+        """Names of the methods called on each `this._x`, by field name."""
+        if self._field_calls is None:
+            self._scan_fields()
+        return self._field_calls
+
+    def _scan_fields(self):
+        resets = {}
+        calls = {}
+        for m in FIELD_USE_RE.finditer(self.src.masked):
+            if m.group(2):
+                resets.setdefault(m.group(1), []).append(m.start())
+            else:
+                calls.setdefault(m.group(1), set()).add(m.group(3))
+        self._null_resets = resets
+        self._field_calls = calls
+
+
+# Bounded like the jstokens caches; keyed by the (cached) JSSource
+_CACHE_LIMIT = 256
+_by_src = {}
+
+
+def index(src):
+    """Return the (cached) LifecycleIndex for a JSSource."""
+    cached = _by_src.get(id(src))
+    if cached is None or cached.src is not src:
+        if len(_by_src) >= _CACHE_LIMIT:
+            _by_src.clear()
+        cached = _by_src[id(src)] = LifecycleIndex(src)
+    return cached
+
+
+def load(path):
+    """Return the LifecycleIndex of a file (see jstokens.load)."""
+    return index(jstokens.load(path))
@@ -0,0 +1,201 @@
+"""metadata.py — One parsed, normalized metadata.json model per run.
+
+Usage: python3 -m ego_lint.metadata --field NAME (EXTENSION_DIR | -)
+
+Every check that needs metadata.json asks this module instead of opening
+and parsing the file itself:
+
+    meta = metadata.load(ext_dir)
+    meta.exists, meta.error          # missing file / unreadable or invalid JSON
+    meta.data                        # the raw JSON object ({} unless valid)
+    meta.shell_versions              # [45, 46, 47] — leading digits of each entry
+    meta.session_modes               # ['user', 'unlock-dialog'], or None
+    meta.settings_schema             # 'org.gnome.shell.extensions.x', or ''
+    meta.gettext_domain              # 'x', or ''
+
+ego-lint.sh names a per-run model file in $EGO_LINT_METADATA_FILE. The first
+check to call `load()` parses metadata.json and writes the model there; the
+checks after it read the file back instead, as long as it was built for the
+same metadata.json. Without the variable, or if the file is missing, stale
+or unwritable, `load()` falls back to `read()`, so every script also runs
+on its own. `--field NAME -` parses a metadata.json from stdin (a packaged
+copy, say) and prints one field.
+"""
+
+import json
+import os
+import re
+import sys
+
+from ego_lint import extfs
+
+
+# Leading major version of a shell-version entry: '45', '46.beta', 47
+_MAJOR_RE = re.compile(r'(\d+)')
+
+ENV_MODEL_FILE = 'EGO_LINT_METADATA_FILE'
+FIELDS = ('shell_versions', 'session_modes', 'settings_schema', 'gettext_domain',
+          'uuid', 'name', 'description')
+
+
+class Metadata:
+    """Parsed metadata.json of one extension; see the module docstring."""
+
+    def __init__(self, path, exists, error=None, data=None):
+        self.path = path
+        self.exists = exists
+        self.error = error
+        self.data = data if data is not None else {}
+
+    @classmethod
+    def parse(cls, text, path='metadata.json'):
+        """Metadata from the text of a metadata.json."""
+        try:
+            data = json.loads(text)
+        except ValueError as e:
+            return cls(path, True, str(e))
+        if not isinstance(data, dict):
+            return cls(path, True, f"expected a JSON object, got {type(data).__name__}")
+        return cls(path, True, data=data)
+
+    @property
+    def valid(self):
+        """Whether metadata.json exists and holds a JSON object."""
+        return self.exists and self.error is None
+
+    @property
+    def shell_versions(self):
+        """Major version of each shell-version entry, in order, as ints."""
+        versions = self.data.get('shell-version')
+        if not isinstance(versions, list):
+            return []
+        majors = []
+        for v in versions:
+            m = _MAJOR_RE.match(str(v))
+            if m:
+                majors.append(int(m.group(1)))
+        return majors
+
+    @property
+    def session_modes(self):
+        """session-modes as a list of strings, or None when absent or not a list."""
+        modes = self.data.get('session-modes')
+        if not isinstance(modes, list):
+            return None
+        return [m for m in modes if isinstance(m, str)]
+
+    def _string(self, key):
+        value = self.data.get(key)
+        return value if isinstance(value, str) else ''
+
+    @property
+    def settings_schema(self):
+        return self._string('settings-schema')
+
+    @property
+    def gettext_domain(self):
+        return self._string('gettext-domain')
+
+    @property
+    def uuid(self):
+        return self._string('uuid')
+
+    @property
+    def name(self):
+        return self._string('name')
+
+    @property
+    def description(self):
+        return self._string('description')
+
+    def to_json(self):
+        return json.dumps({'path': self.path, 'exists': self.exists,
+                           'error': self.error, 'data': self.data})
+
+
+def read(ext_dir):
+    """Read and parse metadata.json of an extension directory (uncached)."""
+    path = os.path.join(ext_dir, 'metadata.json')
+    if not extfs.isfile(path):
+        return Metadata(path, False)
+    try:
+        text = extfs.read_bytes(path).decode('utf-8')
+    except (OSError, ValueError) as e:
+        return Metadata(path, True, str(e))
+    return Metadata.parse(text, path)
+
+
+def _from_model_file(path):
+    """The model an earlier check of this run saved, if built for `path`."""
+    model_file = os.environ.get(ENV_MODEL_FILE)
+    if not model_file:
+        return None
+    try:
+        with open(model_file, encoding='utf-8') as f:
+            fields = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(fields, dict) or fields.get('path') != path:
+        return None
+    return Metadata(path, bool(fields.get('exists')), fields.get('error'),
+                    fields.get('data') or {})
+
+
+def _save_model_file(meta):
+    """Hand the model to the checks after this one; failures are ignored."""
+    model_file = os.environ.get(ENV_MODEL_FILE)
+    if not model_file:
+        return
+    tmp_path = f'{model_file}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(meta.to_json())
+        os.replace(tmp_path, model_file)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+# Bounded like the jstokens caches
+_CACHE_LIMIT = 64
+_by_dir = {}
+
+
+def load(ext_dir):
+    """Return the (cached) Metadata of an extension directory."""
+    ext_dir = os.path.realpath(ext_dir)
+    cached = _by_dir.get(ext_dir)
+    if cached is None:
+        if len(_by_dir) >= _CACHE_LIMIT:
+            _by_dir.clear()
+        path = os.path.join(ext_dir, 'metadata.json')
+        cached = _from_model_file(path)
+        if cached is None:
+            cached = read(ext_dir)
+            _save_model_file(cached)
+        _by_dir[ext_dir] = cached
+    return cached
+
+
+def main():
+    args = sys.argv[1:]
+    if len(args) == 3 and args[0] == '--field' and args[1] in FIELDS:
+        if args[2] == '-':
+            meta = Metadata.parse(sys.stdin.read(), '-')
+        else:
+            meta = read(args[2])
+        value = getattr(meta, args[1])
+        if isinstance(value, list):
+            for item in value:
+                print(item)
+        elif value:
+            print(value)
+    else:
+        print(__doc__.split('\n\n')[1], file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
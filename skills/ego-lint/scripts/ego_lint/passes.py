@@ -0,0 +1,176 @@
+"""passes.py — Drive many checks through one pass over an extension's JS files.
+
+A check script builds its checks as Check subclasses and hands them to
+run(). Each file is read and tokenized once (through jstokens) and every
+check sees it in turn:
+
+    visit_file(f)         once per file, for whole-file patterns
+    visit_line(f, index)  once per line matching the check's `trigger`
+    finish()              after the last file, in the order the checks
+                          were given, which is where results are printed
+
+A trigger is a compiled regex searched over the whole file (or its
+comment-free `code` view with trigger_view = 'code'); only the lines it
+hits are dispatched, so a check that cares about `timeout_add` lines never
+runs a Python loop over the others. Triggers should be literal keywords
+the check's own per-line patterns require, so a line the check would act
+on is never skipped.
+
+A check sets `done` to stop receiving events, e.g. after its first report.
+"""
+
+import os
+import re
+from bisect import bisect_right
+
+from ego_lint import extfs, jstokens
+
+
+SKIP_DIRS = frozenset({'node_modules', '.git', '__pycache__'})
+
+# Line breaks exactly as str.splitlines() sees them
+_SPLITLINES_RE = re.compile('\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]')
+
+
+class JSFile:
+    """One JS file with lazily computed views shared by every check."""
+
+    __slots__ = ('path', 'rel', 'name', '_src', '_lines', '_code_lines',
+                 '_line_starts', '_non_blank', '_comment_lines')
+
+    def __init__(self, path, root):
+        self.path = path
+        self.rel = os.path.relpath(path, root)
+        self.name = os.path.basename(path)
+        self._src = None
+        self._lines = None
+        self._code_lines = None
+        self._line_starts = None
+        self._non_blank = None
+        self._comment_lines = None
+
+    @property
+    def src(self):
+        if self._src is None:
+            self._src = jstokens.load(self.path)
+        return self._src
+
+    @property
+    def text(self):
+        return self.src.text
+
+    @property
+    def code(self):
+        return self.src.code
+
+    @property
+    def is_prefs(self):
+        return self.name == 'prefs.js'
+
+    @property
+    def lines(self):
+        """text.splitlines()"""
+        if self._lines is None:
+            self._lines = self.text.splitlines()
+        return self._lines
+
+    @property
+    def code_lines(self):
+        """code.splitlines(); index-aligned with `lines`."""
+        if self._code_lines is None:
+            self._code_lines = self.code.splitlines()
+        return self._code_lines
+
+    @property
+    def non_blank_lines(self):
+        """Number of lines with anything but whitespace."""
+        if self._non_blank is None:
+            self._count_lines()
+        return self._non_blank
+
+    @property
+    def comment_lines(self):
+        """Number of lines starting (after indentation) with // or *."""
+        if self._comment_lines is None:
+            self._count_lines()
+        return self._comment_lines
+
+    def _count_lines(self):
+        non_blank = 0
+        comments = 0
+        for line in self.lines:
+            stripped = line.lstrip()
+            if stripped:
+                non_blank += 1
+                if stripped.startswith(('//', '*')):
+                    comments += 1
+        self._non_blank = non_blank
+        self._comment_lines = comments
+
+    @property
+    def line_starts(self):
+        """Offset in text of each line in `lines`."""
+        if self._line_starts is None:
+            self._line_starts = [0] + [m.end() for m in _SPLITLINES_RE.finditer(self.text)]
+        return self._line_starts
+
+    def lines_matching(self, regex, view='text'):
+        """Yield the index of each line `regex` matches, once per line."""
+        starts = self.line_starts
+        last = -1
+        for m in regex.finditer(self.code if view == 'code' else self.text):
+            index = bisect_right(starts, m.start()) - 1
+            if index != last:
+                last = index
+                yield index
+
+
+def walk_files(root):
+    """Path of every file under root in os.walk order, skipping SKIP_DIRS."""
+    for dirpath, dirs, filenames in extfs.walk(root):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        for name in filenames:
+            yield os.path.join(dirpath, name)
+
+
+def find_js_files(root):
+    """JSFiles under root in os.walk order, skipping vendored/VCS dirs."""
+    return [JSFile(path, root) for path in walk_files(root) if path.endswith('.js')]
+
+
+class Check:
+    """Base class for a check driven by run(); override what you need."""
+
+    skip_prefs = False      # do not visit prefs.js
+    trigger = None          # compiled regex selecting lines for visit_line()
+    trigger_view = 'text'   # or 'code' to match comment-free text
+
+    def __init__(self):
+        self.done = False
+        self.files_seen = 0
+
+    def visit_file(self, f):
+        pass
+
+    def visit_line(self, f, index):
+        pass
+
+    def finish(self):
+        pass
+
+
+def run(files, checks):
+    """Feed every file to every check, then finish the checks in order."""
+    for f in files:
+        for check in checks:
+            if check.done or (check.skip_prefs and f.is_prefs):
+                continue
+            check.files_seen += 1
+            check.visit_file(f)
+            if check.trigger is not None and not check.done:
+                for index in f.lines_matching(check.trigger, check.trigger_view):
+                    check.visit_line(f, index)
+                    if check.done:
+                        break
+    for check in checks:
+        check.finish()
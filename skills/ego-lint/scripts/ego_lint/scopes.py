@@ -0,0 +1,281 @@
+"""scopes.py — Class, method and registerClass spans for a JS file.
+
+Built once per file from the jstokens brace table, so checks ask for "the
+body of this class's _init()" or "the arguments of this registerClass call"
+instead of slicing fixed-size windows or the rest of the file:
+
+    index = scopes.load(path)
+    for cls in index.classes:
+        init = index.methods(cls).get('_init')   # Method or None
+        if index.registered(cls): ...
+    for call in index.register_calls:
+        call.metadata                        # (open, close) of {GTypeName...}
+    index.line_scopes[lineno - 1]            # MODULE, CLASS_BODY, CONSTRUCTOR, ...
+
+All offsets are into the original text; spans are (open, close) offsets of
+the bracket pair, matched by the tokenizer, so braces and parens inside
+strings, template literals and comments are never miscounted.
+"""
+
+import re
+from bisect import bisect_right
+from collections import namedtuple
+
+from ego_lint import jstokens
+
+
+# Literal-first patterns let the regex engine skip ahead to candidates; the
+# word boundary before `class` is checked by hand
+CLASS_RE = re.compile(r'class\b(?:\s+([\w$]+))?(?:\s+extends\s+([\w$.]+))?\s*\{')
+REGISTER_CLASS_RE = re.compile(r'GObject\.registerClass\s*\(')
+_IDENT_CHAR_RE = re.compile(r'[\w$]')
+_SPACE_RE = re.compile(r'\s*')
+# Keywords whose `(...) {` looks like a method head inside a class body
+_NOT_METHODS = frozenset({'if', 'for', 'while', 'switch', 'catch', 'with', 'function'})
+
+# Line scopes, from the scope a line starts in (see ScopeIndex.line_scopes)
+MODULE = 'module'
+CLASS_BODY = 'class'
+CONSTRUCTOR = 'constructor'
+REGISTER_CLASS = 'registerClass'
+FUNCTION = 'function'
+
+# `start` is the offset of the keyword/name; `body` the (open, close) braces
+ClassScope = namedtuple('ClassScope', 'name base start body')
+Method = namedtuple('Method', 'name start params body')
+# `args` is the (open, close) parens; `metadata` the leading {...} argument or None
+RegisterCall = namedtuple('RegisterCall', 'start args metadata')
+
+
+def child_braces(src, open_pos, close):
+    """(open, close) of each brace pair directly inside the pair at open_pos."""
+    masked = src.masked
+    children = []
+    pos = open_pos + 1
+    while True:
+        child = masked.find('{', pos, close)
+        if child < 0:
+            return children
+        end = src.match(child)
+        if end is None or end > close:
+            return children
+        children.append((child, end))
+        pos = end + 1
+
+
+def close_paren(masked, open_pos):
+    """Offset of the `)` matching the `(` at open_pos in masked text, or None.
+
+    Scans only the parenthesized text, so a file's parens are never paired
+    wholesale just to find one call's arguments.
+    """
+    depth = 0
+    pos = open_pos + 1
+    find = masked.find
+    while True:
+        close = find(')', pos)
+        if close < 0:
+            return None
+        opening = find('(', pos, close)
+        if opening >= 0:
+            depth += 1
+            pos = opening + 1
+        elif depth:
+            depth -= 1
+            pos = close + 1
+        else:
+            return close
+
+
+def _open_paren(masked, close, floor):
+    """Offset of the `(` matching the `)` at close, not before floor, or None."""
+    depth = 0
+    pos = close
+    rfind = masked.rfind
+    while True:
+        opening = rfind('(', floor, pos)
+        if opening < 0:
+            return None
+        closing = rfind(')', opening, pos)
+        if closing >= 0:
+            depth += 1
+            pos = closing
+        elif depth:
+            depth -= 1
+            pos = opening
+        else:
+            return opening
+
+
+def _skip_space_back(text, pos, floor):
+    """Offset of the last non-space character at or before pos (not below floor)."""
+    while pos > floor and text[pos].isspace():
+        pos -= 1
+    return pos
+
+
+def _methods(src, body):
+    """Methods defined directly in a class body, by name (first wins)."""
+    masked = src.masked
+    floor = body[0]
+    methods = {}
+    for open_pos, close in child_braces(src, *body):
+        j = _skip_space_back(masked, open_pos - 1, floor)
+        if masked[j] != ')':
+            continue
+        params_open = _open_paren(masked, j, floor)
+        if params_open is None:
+            continue
+        end = _skip_space_back(masked, params_open - 1, floor) + 1
+        start = end
+        while start > floor + 1 and _IDENT_CHAR_RE.match(masked, start - 1):
+            start -= 1
+        name = masked[start:end]
+        if not name or name in _NOT_METHODS:
+            continue
+        methods.setdefault(name, Method(name, start, (params_open, j), (open_pos, close)))
+    return methods
+
+
+class ScopeIndex:
+    """Classes and GObject.registerClass calls of one file, in source order.
+
+    Each table is built on first use.
+    """
+
+    def __init__(self, src):
+        self.src = src
+        self._register_calls = None
+        self._call_starts = None
+        self._call_parents = None
+        self._classes = None
+        self._methods = {}
+        self._line_scopes = None
+
+    @property
+    def register_calls(self):
+        if self._register_calls is None:
+            src = self.src
+            calls = []
+            # Files without the call are never tokenized for it
+            masked = src.masked if 'registerClass' in src.text else ''
+            for m in REGISTER_CLASS_RE.finditer(masked):
+                open_pos = m.end() - 1
+                close = close_paren(masked, open_pos)
+                if close is None:
+                    continue
+                metadata = None
+                meta_open = _SPACE_RE.match(masked, open_pos + 1).end()
+                if masked.startswith('{', meta_open):
+                    meta_close = src.match(meta_open)
+                    if meta_close is not None:
+                        metadata = (meta_open, meta_close)
+                calls.append(RegisterCall(m.start(), (open_pos, close), metadata))
+            self._register_calls = calls
+
+            # Calls nest (registerClass inside registerClass), so each call's
+            # enclosing call is enough to walk outwards from any offset
+            self._call_starts = [call.args[0] for call in calls]
+            self._call_parents = []
+            stack = []
+            for k, call in enumerate(calls):
+                while stack and calls[stack[-1]].args[1] < call.start:
+                    stack.pop()
+                self._call_parents.append(stack[-1] if stack else None)
+                stack.append(k)
+        return self._register_calls
+
+    @property
+    def classes(self):
+        if self._classes is None:
+            src = self.src
+            masked = src.masked
+            classes = []
+            for m in CLASS_RE.finditer(masked):
+                if m.start() and _IDENT_CHAR_RE.match(masked, m.start() - 1):
+                    continue  # `subclass`, `$class`, ...
+                open_pos = m.end() - 1
+                close = src.match(open_pos)
+                if close is None:
+                    continue
+                classes.append(ClassScope(m.group(1), m.group(2), m.start(), (open_pos, close)))
+            self._classes = classes
+        return self._classes
+
+    def methods(self, cls):
+        """Methods defined directly in the body of `cls`, by name (first wins)."""
+        methods = self._methods.get(cls.start)
+        if methods is None:
+            methods = self._methods[cls.start] = _methods(self.src, cls.body)
+        return methods
+
+    def registered(self, cls):
+        """The innermost RegisterCall whose arguments contain `cls`, or None."""
+        calls = self.register_calls
+        k = bisect_right(self._call_starts, cls.start) - 1
+        while k is not None and k >= 0:
+            if calls[k].args[1] > cls.start:
+                return calls[k]
+            k = self._call_parents[k]
+        return None
+
+    @property
+    def line_scopes(self):
+        """Scope of each line (index 0 = line 1), by where the line starts.
+
+        MODULE          brace depth 0 (module scope)
+        REGISTER_CLASS  inside GObject.registerClass(...) arguments
+        CONSTRUCTOR     a constructor() method, from its name line through `}`
+        CLASS_BODY      directly inside a class body, outside its methods
+        FUNCTION        anything else: method, function and block bodies
+
+        Module scope wins over everything and registerClass arguments over
+        the classes inside them (a constructor there is REGISTER_CLASS);
+        otherwise the innermost class or method decides.
+        """
+        if self._line_scopes is None:
+            src = self.src
+            line_of = src.line_of
+            scopes = [FUNCTION] * len(src.line_depths)
+
+            def fill(first, last, scope):
+                scopes[first - 1:last] = [scope] * (last - first + 1)
+
+            # Outer classes come first, so nested ones overwrite their spans
+            for cls in self.classes:
+                open_pos, close = cls.body
+                fill(line_of(open_pos) + 1, line_of(close), CLASS_BODY)
+                for method in self.methods(cls).values():
+                    fill(line_of(method.start), line_of(method.body[1]),
+                         CONSTRUCTOR if method.name == 'constructor' else FUNCTION)
+            for call in self.register_calls:
+                fill(line_of(call.args[0]) + 1, line_of(call.args[1]), REGISTER_CLASS)
+            for k, depth in enumerate(src.line_depths):
+                if depth == 0:
+                    scopes[k] = MODULE
+            self._line_scopes = scopes
+        return self._line_scopes
+
+    def text(self, span, view='code'):
+        """Text strictly between the brackets of a span."""
+        return getattr(self.src, view)[span[0] + 1:span[1]]
+
+
+# Bounded like the jstokens caches; keyed by the (cached) JSSource
+_CACHE_LIMIT = 256
+_by_src = {}
+
+
+def index(src):
+    """Return the (cached) ScopeIndex for a JSSource."""
+    cached = _by_src.get(id(src))
+    if cached is None or cached.src is not src:
+        if len(_by_src) >= _CACHE_LIMIT:
+            _by_src.clear()
+        cached = _by_src[id(src)] = ScopeIndex(src)
+    return cached
+
+
+def load(path):
+    """Return the ScopeIndex of a file (see jstokens.load)."""
+    return index(jstokens.load(path))
@@ -0,0 +1,331 @@
+"""trace.py — Per-stage timings and Chrome trace events for a lint run.
+
+`ego-lint.sh --timings` and `--trace FILE` run every stage (each check
+script, the pattern rules, eslint) through this module:
+
+    python3 -m ego_lint.trace run TRACE_DIR -- COMMAND [ARG...]
+    python3 -m ego_lint.trace report TRACE_DIR       # stage table, slowest functions
+    python3 -m ego_lint.trace write TRACE_DIR FILE   # Chrome trace-event JSON
+
+One of ego-lint's Python checks (TRACED_SCRIPTS, run as `x.py ...` or
+`python3 x.py ...`) runs in this process. Its top-level code runs with
+`__name__` other than '__main__', so its main() guard does not fire. Then every
+function and method it defines, and every ego_lint function it imported
+(find_js_files, walk_files, ...), is wrapped to record a span, and main()
+runs. Spans nest by time, so a stage shows its file walk, its checks and the
+helpers below them. Code can add spans of its own with
+`with trace.span(name):`, a no-op outside a traced run; apply-patterns.py
+records one per rule. Any other command runs as a child process. Either way
+the stage records its wall time, CPU time (user + system, children
+included) and peak RSS.
+
+Events are appended as JSON lines to TRACE_DIR/events.jsonl. They are
+stamped in wall-clock microseconds, so the stages of one run share a
+timeline. A stage starts when ego-lint.sh launched it
+($EGO_LINT_STAGE_START), so its wall time includes interpreter startup, as
+its CPU time does. Spans shorter than MIN_SPAN_US are left out of the trace,
+which keeps the trace of a large extension small. Their time still counts in
+the per-function totals (calls, total and self time) kept on each stage
+event. `write` wraps the events in {"traceEvents": [...]} for Perfetto
+(ui.perfetto.dev) or chrome://tracing.
+"""
+
+import builtins
+import inspect
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+import traceback
+import types
+from contextlib import contextmanager
+
+EVENTS_FILE = 'events.jsonl'
+ENV_STAGE_START = 'EGO_LINT_STAGE_START'
+# Spans shorter than this are only counted, not written
+MIN_SPAN_US = 100
+# Functions listed per stage (by total time) and in the report
+TOP_FUNCTIONS = 10
+# Everything is drawn on one track of one process, so stages nest in the run
+PID = 1
+TID = 1
+# The scripts run in-process: each defines main() and calls it only under
+# `if __name__ == '__main__'`. Any other command runs as a child process.
+TRACED_SCRIPTS = frozenset({
+    'apply-patterns.py', 'check-async.py', 'check-css.py', 'check-files.py',
+    'check-gobject.py', 'check-init.py', 'check-lifecycle.py', 'check-metadata.py',
+    'check-package.py', 'check-prefs.py', 'check-quality.py', 'check-resources.py',
+    'check-schema.py',
+})
+
+_clock_offset_ns = time.time_ns() - time.perf_counter_ns()
+
+
+def now_us():
+    """Wall-clock microseconds, from the monotonic clock."""
+    return (time.perf_counter_ns() + _clock_offset_ns) // 1000
+
+
+def launch_us():
+    """When the caller launched this stage: $EGO_LINT_STAGE_START (bash's
+    $EPOCHREALTIME), so wall time includes interpreter startup; else now."""
+    value = os.environ.get(ENV_STAGE_START, '').replace(',', '.')
+    seconds, _, fraction = value.partition('.')
+    if not seconds.isdigit():
+        return now_us()
+    fraction = fraction[:6] if fraction.isdigit() else ''
+    return int(seconds) * 1000000 + int(fraction.ljust(6, '0'))
+
+
+class Recorder:
+    """Spans and per-function totals of one stage."""
+
+    def __init__(self):
+        self.spans = []
+        self.totals = {}    # name -> [calls, total us, self us]
+        self._children = [0]    # time spent in nested spans, per open span
+
+    def enter(self):
+        self._children.append(0)
+        return now_us()
+
+    def leave(self, name, start):
+        dur = now_us() - start
+        children = self._children.pop()
+        self._children[-1] += dur
+        total = self.totals.get(name)
+        if total is None:
+            total = self.totals[name] = [0, 0, 0]
+        total[0] += 1
+        total[1] += dur
+        total[2] += dur - children
+        if dur >= MIN_SPAN_US:
+            self.spans.append((name, start, dur))
+
+    def wrap(self, func, name):
+        enter = self.enter
+        leave = self.leave
+
+        def traced(*args, **kwargs):
+            start = enter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                leave(name, start)
+
+        traced.__wrapped__ = func
+        traced.__name__ = func.__name__
+        traced.__qualname__ = func.__qualname__
+        traced.__doc__ = func.__doc__
+        return traced
+
+    def instrument(self, namespace, path):
+        """Wrap the functions and class methods a script defined or imported."""
+        for name, obj in list(namespace.items()):
+            if isinstance(obj, types.FunctionType) and _traceable(obj, path):
+                namespace[name] = self.wrap(obj, name)
+            elif isinstance(obj, type) and obj.__module__ == namespace['__name__']:
+                for attr, member in list(vars(obj).items()):
+                    if isinstance(member, types.FunctionType) and _traceable(member, path):
+                        setattr(obj, attr, self.wrap(member, f'{obj.__name__}.{attr}'))
+
+    def top(self, count=TOP_FUNCTIONS):
+        """{name: [calls, total ms, self ms]} of the functions with the most
+        self time (time not spent in other traced functions)."""
+        ranked = sorted(self.totals.items(), key=lambda item: -item[1][2])[:count]
+        return {name: [calls, round(total / 1000, 1), round(own / 1000, 1)]
+                for name, (calls, total, own) in ranked}
+
+
+# The Recorder of the stage running in this process, if it is traced
+_recorder = None
+
+
+@contextmanager
+def span(name):
+    """Record a span around a block (say, one rule) when traced; else a no-op."""
+    recorder = _recorder
+    if recorder is None:
+        yield
+        return
+    start = recorder.enter()
+    try:
+        yield
+    finally:
+        recorder.leave(name, start)
+
+
+def _traceable(func, path):
+    if inspect.isgeneratorfunction(func) or inspect.iscoroutinefunction(func):
+        return False
+    if func.__code__.co_filename == path:
+        return True
+    return (func.__module__ or '').startswith('ego_lint.') and func.__module__ != __name__
+
+
+def script_of(command):
+    """(script path, args) when command runs a Python script, else None."""
+    if command[0].endswith('.py'):
+        return command[0], command[1:]
+    if os.path.basename(command[0]).startswith('python') and len(command) > 1 \
+            and command[1].endswith('.py'):
+        return command[1], command[2:]
+    return None
+
+
+def stage_name(command):
+    """Name of a stage: its script or module, not the interpreter running it."""
+    script = script_of(command)
+    if script:
+        return os.path.basename(script[0])
+    program = os.path.basename(command[0])
+    if (program in ('bash', 'sh') or program.startswith('python')) and len(command) > 1:
+        if command[1] == '-m' and len(command) > 2:
+            return command[2]
+        return os.path.basename(command[1])
+    return program
+
+
+def _run_script(path, args, recorder):
+    """Exit status of a script run in this process with its functions traced."""
+    path = os.path.realpath(path)
+    with open(path, encoding='utf-8') as f:
+        code = compile(f.read(), path, 'exec')
+    sys.argv = [path] + args
+    sys.path.insert(0, os.path.dirname(path))
+    namespace = {'__name__': '__ego_lint_traced__', '__file__': path,
+                 '__builtins__': builtins}
+    exec(code, namespace)
+    recorder.instrument(namespace, path)
+    global _recorder
+    _recorder = recorder
+    status = namespace['main']()
+    return status if isinstance(status, int) else 0
+
+
+def run(trace_dir, command, name=None):
+    """Run one stage and append its events; returns its exit status."""
+    start = launch_us()
+    script = script_of(command)
+    name = name or stage_name(command)
+    recorder = Recorder()
+    if script and os.path.basename(script[0]) in TRACED_SCRIPTS:
+        try:
+            status = _run_script(script[0], script[1], recorder)
+        except SystemExit as e:
+            status = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except Exception:
+            traceback.print_exc()
+            status = 1
+        sys.stdout.flush()
+        usage = [resource.getrusage(resource.RUSAGE_SELF),
+                 resource.getrusage(resource.RUSAGE_CHILDREN)]
+    else:
+        try:
+            proc = subprocess.Popen(command)
+        except OSError as e:
+            print(f'{command[0]}: {e}', file=sys.stderr)
+            return 127
+        # wait4() rather than proc.wait(): it also returns the child's rusage
+        _pid, wait_status, child_usage = os.wait4(proc.pid, 0)
+        status = proc.returncode = os.waitstatus_to_exitcode(wait_status)
+        usage = [child_usage]
+    dur = now_us() - start
+    cpu_ms = sum(u.ru_utime + u.ru_stime for u in usage) * 1000
+    rss_kb = max(u.ru_maxrss for u in usage)
+
+    events = [{'name': name, 'cat': 'stage', 'ph': 'X', 'ts': start, 'dur': dur,
+               'pid': PID, 'tid': TID,
+               'args': {'cpu_ms': round(cpu_ms, 1), 'rss_kb': rss_kb, 'exit': status,
+                        'functions': recorder.top()}}]
+    events += [{'name': span, 'cat': 'function', 'ph': 'X', 'ts': ts, 'dur': d,
+                'pid': PID, 'tid': TID} for span, ts, d in recorder.spans]
+    with open(os.path.join(trace_dir, EVENTS_FILE), 'a', encoding='utf-8') as f:
+        f.writelines(json.dumps(e, separators=(',', ':')) + '\n' for e in events)
+    return status
+
+
+def load_events(trace_dir):
+    events = []
+    try:
+        with open(os.path.join(trace_dir, EVENTS_FILE), encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    events.append(json.loads(line))
+    except OSError:
+        pass
+    return events
+
+
+def report(trace_dir):
+    """Print the per-stage table and the slowest functions of the run."""
+    stages = [e for e in load_events(trace_dir) if e.get('cat') == 'stage']
+    print(f"  {'stage':<28} {'wall ms':>9} {'cpu ms':>9} {'peak MB':>8}")
+    wall = cpu = 0.0
+    rss = 0
+    for e in stages:
+        args = e['args']
+        wall += e['dur'] / 1000
+        cpu += args['cpu_ms']
+        rss = max(rss, args['rss_kb'])
+        print(f"  {e['name']:<28} {e['dur'] / 1000:>9.1f} {args['cpu_ms']:>9.1f} "
+              f"{args['rss_kb'] / 1024:>8.1f}")
+    print(f"  {'total':<28} {wall:>9.1f} {cpu:>9.1f} {rss / 1024:>8.1f}")
+
+    functions = [(own, total, calls, f"{e['name']}: {name}")
+                 for e in stages
+                 for name, (calls, total, own) in e['args']['functions'].items()]
+    if functions:
+        print()
+        print(f"  {'slowest functions (by self time)':<52} {'calls':>7} {'self ms':>9} "
+              f"{'total ms':>9}")
+        for own, total, calls, label in sorted(functions, reverse=True)[:TOP_FUNCTIONS]:
+            print(f"  {label:<52} {calls:>7} {own:>9.1f} {total:>9.1f}")
+
+
+def write(trace_dir, path, label='ego-lint'):
+    """Write the run as Chrome trace-event JSON, under one root span."""
+    events = load_events(trace_dir)
+    root = []
+    if events:
+        start = min(e['ts'] for e in events)
+        end = max(e['ts'] + e['dur'] for e in events)
+        root = [{'name': 'process_name', 'ph': 'M', 'pid': PID, 'args': {'name': label}},
+                {'name': 'ego-lint', 'cat': 'run', 'ph': 'X', 'ts': start,
+                 'dur': end - start, 'pid': PID, 'tid': TID}]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': root + events, 'displayTimeUnit': 'ms'}, f,
+                  separators=(',', ':'))
+        f.write('\n')
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    usage = ('Usage: python3 -m ego_lint.trace run TRACE_DIR [--name NAME] -- COMMAND...\n'
+             '       python3 -m ego_lint.trace report TRACE_DIR\n'
+             '       python3 -m ego_lint.trace write TRACE_DIR FILE [LABEL]')
+    if len(argv) >= 3 and argv[0] == 'run':
+        trace_dir, rest = argv[1], argv[2:]
+        name = None
+        if rest[:1] == ['--name'] and len(rest) >= 2:
+            name, rest = rest[1], rest[2:]
+        if rest[:1] == ['--']:
+            rest = rest[1:]
+        if rest:
+            return run(trace_dir, rest, name)
+    elif len(argv) == 2 and argv[0] == 'report':
+        report(argv[1])
+        return 0
+    elif len(argv) in (3, 4) and argv[0] == 'write':
+        write(*argv[1:])
+        return 0
+    print(usage, file=sys.stderr)
+    return 2
+
+
+if __name__ == '__main__':
+    # Run as ego_lint.trace, so scripts importing it share the active recorder
+    from ego_lint.trace import main as _main
+    sys.exit(_main())
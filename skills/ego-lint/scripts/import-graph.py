@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""import-graph.py — List modules reachable through local ESM imports.
+
+Usage: import-graph.py EXTENSION_DIR ENTRY [ENTRY...]
+
+Prints one path per line (relative to EXTENSION_DIR) for every module
+reachable from the given entry points, entry points first, in BFS order.
+Missing entry points are skipped. Used by check-imports.sh for the
+prefs.js transitive segregation check.
+"""
+
+import os
+import sys
+
+from ego_lint import extfs
+from ego_lint.importgraph import ImportGraph
+
+
+def main():
+    if len(sys.argv) < 3:
+        print("Usage: import-graph.py EXTENSION_DIR ENTRY [ENTRY...]", file=sys.stderr)
+        sys.exit(1)
+
+    ext_dir = os.path.realpath(sys.argv[1])
+    if not extfs.isdir(ext_dir):
+        print(f"Error: {ext_dir} is not a directory", file=sys.stderr)
+        sys.exit(1)
+
+    for rel in ImportGraph(ext_dir).reachable(*sys.argv[2:]):
+        print(rel)
+
+
+if __name__ == '__main__':
+    main()
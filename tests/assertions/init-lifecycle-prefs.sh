@@ -49,3 +49,10 @@ echo "=== timeout-no-remove ==="
 run_lint "timeout-no-remove@test"
 assert_output_contains "detects missing Source.remove" "\[FAIL\].*lifecycle/timeout-not-removed"
 echo ""
+
+# --- literal-braces ---
+echo "=== literal-braces ==="
+run_lint "literal-braces@test"
+assert_output_contains "disable() body not cut short by braces in literals or after i++ / n" "\[PASS\].*lifecycle/timeout-not-removed"
+assert_output_not_contains "no false selective-disable" "\[FAIL\].*lifecycle/selective-disable"
+echo ""
@@ -21,3 +21,19 @@ run_lint "typeof-super-method@test"
 assert_exit_code "exits with 1 (has failures)" 1
 assert_output_contains "fails on typeof super.method (R-SLOP-30)" "\[FAIL\].*R-SLOP-30"
 echo ""
+
+# --- metadata-not-object ---
+echo "=== metadata-not-object ==="
+run_lint "metadata-not-object@test"
+assert_exit_code "exits with 1 (has failures)" 1
+assert_output_contains "fails on non-object metadata.json" "\[FAIL\].*metadata/valid-json"
+assert_output_contains "quality checks see unreadable metadata" "\[WARN\].*quality/clipboard-disclosure.*could not be read"
+assert_output_not_contains "no check crashes on non-object metadata" "Traceback"
+echo ""
+
+# --- metadata-vendored-modules ---
+echo "=== metadata-vendored-modules ==="
+run_lint "metadata-vendored-modules@test"
+assert_output_not_contains "node_modules sessionMode use is not the extension's" "\[WARN\].*metadata/session-modes-consistency"
+assert_output_contains "node_modules dgettext domain is not the extension's" "\[PASS\].*metadata/gettext-domain-consistency"
+echo ""
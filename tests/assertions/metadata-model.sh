@@ -0,0 +1,31 @@
+# Shared metadata.json model assertions
+# Sourced by run-tests.sh — uses run_now, assert_output_contains, assert_exit_code, etc.
+
+# Lints a copy of valid-extension@test whose metadata.json carries a 300 KB
+# custom field, more than one exec argument or environment string may hold
+# (128 KB on Linux). The model must reach every check without going through
+# the environment.
+large_metadata_run() {
+    local ext="$WORK_DIR/large-metadata@test"
+    rm -rf "$ext"
+    cp -R "$FIXTURES/valid-extension@test" "$ext"
+    python3 - "$ext/metadata.json" <<'PY'
+import json, sys
+with open(sys.argv[1]) as f:
+    meta = json.load(f)
+meta['uuid'] = 'large-metadata@test'
+meta['x-changelog'] = [f'entry {i} of a long changelog' for i in range(10000)]
+with open(sys.argv[1], 'w') as f:
+    json.dump(meta, f, indent=4)
+PY
+    bash "$LINT" "$ext"
+}
+
+# --- large-metadata ---
+echo "=== large-metadata ==="
+run_now large_metadata_run
+assert_exit_code "exits with 0" 0
+assert_output_not_contains "no stage fails to start" "Argument list too long"
+assert_output_contains "metadata checks see the model" "\[PASS\].*metadata/uuid-matches-dir"
+assert_output_contains "later checks still run" "\[PASS\].*lifecycle/"
+echo ""
@@ -51,3 +51,91 @@ echo "=== custom-logger ==="
 run_lint "custom-logger@test"
 assert_output_contains "detects custom logger class" "\[WARN\].*R-QUAL-26"
 echo ""
+
+# --- zip-submission (linted straight from its zip) ---
+echo "=== zip-submission ==="
+run_lint "zip-submission@test/zip-submission@test.zip"
+assert_exit_code "exits with 1 (has failures)" 1
+assert_output_contains "reads extension.js from the zip" "\[PASS\].*file-structure/extension.js"
+assert_output_contains "reads the schema from the zip" "\[PASS\].*schema/id-matches"
+assert_output_contains "detects GTK import in a zipped lib module" "\[FAIL\].*imports/no-gtk-in-extension.*lib/label.js"
+assert_output_contains "validates the linted zip as the package" "\[PASS\].*package/exists.*zip-submission@test.zip"
+assert_output_contains "detects files nested in a top-level folder" "\[FAIL\].*package/nested-structure"
+assert_output_not_contains "does not compare UUID with the zip name" "\[FAIL\].*metadata/uuid-matches-dir"
+echo ""
+
+# --- package-zip-bomb ---
+echo "=== package-zip-bomb ==="
+run_lint "package-zip-bomb@test"
+assert_output_contains "detects member expanding over 100x" "\[FAIL\].*package/compression-ratio.*assets/padding.bin"
+assert_output_contains "lists member over 1MB uncompressed" "\[WARN\].*package/largest-members.*assets/padding.bin"
+assert_output_not_contains "does not flag normal members" "\[FAIL\].*package/compression-ratio.*extension.js"
+echo ""
+
+# --- package-integrity ---
+echo "=== package-integrity ==="
+run_lint "package-integrity@test"
+assert_output_contains "detects member failing its CRC-32" "\[FAIL\].*package/integrity.*data/notes.txt"
+assert_output_contains "detects the same blob stored twice" "\[WARN\].*package/duplicate-content.*icons/logo.png = assets/logo-copy.png"
+assert_output_contains "lists the largest members" "\[PASS\].*package/largest-members.*icons/logo.png"
+echo ""
+
+# Lints a copy of package-bomb-total@test packaged with COUNT padding members
+# of 1023 KB of zeros each. Every member stays under MIN_BOMB_SIZE, so only
+# the whole-archive limits can catch it. The zip is built here, not committed.
+padded_package_run() {
+    local name="$1" count="$2"
+    local ext="$WORK_DIR/$name"
+    rm -rf "$ext"
+    cp -R "$FIXTURES/package-bomb-total@test" "$ext"
+    python3 - "$ext" "$count" <<'PY'
+import os, sys, zipfile
+ext, count = sys.argv[1], int(sys.argv[2])
+padding = bytes(1023 * 1024)
+with zipfile.ZipFile(os.path.join(ext, 'package.zip'), 'w', zipfile.ZIP_DEFLATED) as zf:
+    for name in ('metadata.json', 'extension.js', 'LICENSE'):
+        zf.write(os.path.join(ext, name), name)
+    for i in range(count):
+        zf.writestr(f'assets/pad{i:04}.bin', padding)
+PY
+    bash "$LINT" "$ext"
+}
+
+# --- package-bomb-total (110 MB in members just under 1 MB) ---
+echo "=== package-bomb-total ==="
+run_now padded_package_run package-bomb-total@test 110
+assert_output_contains "detects the package expanding past the total cap" "\[FAIL\].*package/compression-ratio.*expands to more than 100.0MB"
+assert_output_not_contains "no single member is flagged" "\[FAIL\].*package/compression-ratio.*member\(s\) expand"
+assert_output_contains "skips integrity instead of inflating" "\[SKIP\].*package/integrity.*not decompressed"
+assert_output_contains "skips duplicate-content instead of inflating" "\[SKIP\].*package/duplicate-content.*not decompressed"
+echo ""
+
+# --- package-bomb-ratio (40 MB under the cap, but 1000x overall) ---
+echo "=== package-bomb-ratio ==="
+run_now padded_package_run package-bomb-ratio@test 40
+assert_output_contains "detects the package expanding over 100x overall" "\[FAIL\].*package/compression-ratio.*expands [0-9]+x overall"
+assert_output_not_contains "stays under the total cap" "package/compression-ratio.*expands to more than"
+assert_output_not_contains "does not hash the padding" "package/duplicate-content.*pad0000"
+echo ""
+
+# --- zip-bomb-member (a 2 MB lib/pad.js that compresses 400x, linted as a zip) ---
+echo "=== zip-bomb-member ==="
+run_lint "zip-bomb-member@test/zip-bomb-member@test.zip"
+assert_exit_code "exits with 1 (has failures)" 1
+assert_output_contains "flags the bomb member" "\[FAIL\].*package/compression-ratio.*lib/pad.js"
+assert_output_not_contains "no check crashes on the refused member" "Traceback"
+assert_output_contains "still reads the other members" "\[PASS\].*metadata/valid-json"
+assert_output_contains "source checks still run" "\[PASS\].*lifecycle/default-export"
+assert_output_contains "inflates the members that are not bombs" "\[PASS\].*package/integrity"
+echo ""
+
+# --- zip-corrupt-member (metadata.json fails to inflate, next to gschemas.compiled, linted as a zip) ---
+echo "=== zip-corrupt-member ==="
+run_lint "zip-corrupt-member@test/zip-corrupt-member@test.zip"
+assert_exit_code "exits with 1 (has failures)" 1
+assert_output_contains "reports metadata.json as unreadable" "\[FAIL\].*metadata/valid-json.*Cannot read zip member"
+assert_output_contains "compiled-schemas check reads no shell-version" "\[WARN\].*package/compiled-schemas-unnecessary"
+assert_output_contains "detects the corrupt member" "\[FAIL\].*package/integrity.*metadata.json"
+assert_output_not_contains "no check crashes on the corrupt member" "Traceback"
+assert_output_contains "source checks still run" "\[PASS\].*lifecycle/default-export"
+echo ""
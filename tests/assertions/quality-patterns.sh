@@ -32,3 +32,20 @@ run_lint "empty-catch-commented@test"
 assert_exit_code "exits with 0 (commented catch is intentional)" 0
 assert_output_not_contains "no empty-catch warning for commented catches" "\[WARN\].*quality/empty-catch"
 echo ""
+
+# --- empty-catch-paired ---
+echo "=== empty-catch-paired ==="
+run_lint "empty-catch-paired@test"
+assert_output_contains "warns on empty catch despite cleanup in another try" "\[WARN\].*quality/empty-catch.*extension\.js:21"
+assert_output_not_contains "commented catch paired with its own try" "\[WARN\].*quality/empty-catch.*extension\.js:12"
+assert_output_contains "try/catch in comments not counted" "\[PASS\].*quality/try-catch-density.*\(2/4\)"
+echo ""
+
+# --- module-scope-tags ---
+echo "=== module-scope-tags ==="
+run_lint "module-scope-tags@test"
+assert_output_contains "module-level let opening an object is module state" "\[WARN\].*quality/module-state.*extension\.js:7"
+assert_output_not_contains "let inside a function is not module state" "\[WARN\].*quality/module-state.*extension\.js:12"
+assert_output_contains "constructor of a plain class checked despite earlier widget class" "\[WARN\].*quality/constructor-resources.*extension\.js:26"
+assert_output_not_contains "registerClass constructor is not init-time" "\[FAIL\].*init/shell-modification"
+echo ""
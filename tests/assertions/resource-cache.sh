@@ -0,0 +1,50 @@
+# On-disk scan cache assertions (EGO_LINT_CACHE_DIR is the runner's own)
+# Sourced by run-tests.sh — uses run_now, assert_output_contains, assert_exit_code, etc.
+
+# Lints a copy of cross-file-leak@test three times: cold, again unchanged,
+# and after fixing the leak in lib/manager.js. Output lines are prefixed with
+# the run they come from. "new entries" counts scan cache entries added since
+# the cold run. Before the edited run, the fan-out directory its new entry
+# lands in (found with a throwaway cache) is seeded with 40 stale entries,
+# past the MAX_SCAN_ENTRIES / FANOUT (32) that pruning keeps.
+resource_cache_runs() {
+    local ext="$WORK_DIR/resource-cache@test"
+    local check="$SCRIPT_DIR/skills/ego-lint/scripts/check-resources.py"
+    local scans="$EGO_LINT_CACHE_DIR/resource-scan"
+    local probe="$WORK_DIR/resource-cache-probe"
+    local entry i
+    rm -rf "$ext" "$probe"
+    cp -R "$FIXTURES/cross-file-leak@test" "$ext"
+    python3 "$check" "$ext" | sed 's/^/cold: /'
+    (cd "$scans" && find . -name '*.json' | sort) > "$WORK_DIR/resource-cache.cold"
+    touch "$WORK_DIR/resource-cache.marker"
+    python3 "$check" "$ext" | sed 's/^/warm: /'
+    echo "warm new entries: $(cd "$scans" && find . -name '*.json' | sort | comm -13 "$WORK_DIR/resource-cache.cold" - | wc -l)"
+    echo "warm hits marked used: $(find "$scans" -name '*.json' -newer "$WORK_DIR/resource-cache.marker" | wc -l)"
+    sed -i 's|// Missing: global.display.disconnect|global.display.disconnect|' "$ext/lib/manager.js"
+    EGO_LINT_CACHE_DIR="$probe" python3 "$check" "$ext" > /dev/null
+    entry="$(cd "$probe/resource-scan" && find . -name '*.json' | sort | comm -13 "$WORK_DIR/resource-cache.cold" -)"
+    mkdir -p "$scans/$(dirname "$entry")"
+    for i in $(seq 1 40); do
+        echo '{}' > "$scans/$(dirname "$entry")/stale$i.json"
+        touch -d '2000-01-01' "$scans/$(dirname "$entry")/stale$i.json"
+    done
+    python3 "$check" "$ext" | sed 's/^/edited: /'
+    echo "edited new entries: $(cd "$scans" && find . -name '*.json' ! -name 'stale*' | sort | comm -13 "$WORK_DIR/resource-cache.cold" - | wc -l)"
+    echo "edited entry kept: $([[ -f "$scans/$entry" ]] && echo yes || echo no)"
+    echo "fan-out directory entries: $(find "$scans/$(dirname "$entry")" -name '*.json' | wc -l)"
+}
+
+# --- resource-cache ---
+echo "=== resource-cache ==="
+run_now resource_cache_runs
+assert_exit_code "exits with 0" 0
+assert_output_contains "cold run detects the orphan signal" "^cold: WARN\|resource-tracking/orphan-signal\|lib/manager.js"
+assert_output_contains "unchanged files are served from the cache" "^warm new entries: +0$"
+assert_output_contains "cache hits are marked as used" "^warm hits marked used: +3$"
+assert_output_contains "cache hit reports the same orphan" "^warm: WARN\|resource-tracking/orphan-signal\|lib/manager.js"
+assert_output_not_contains "edited file is rescanned: orphan fixed" "^edited: .*orphan-signal"
+assert_output_contains "edited file gets a new cache entry" "^edited new entries: +1$"
+assert_output_contains "the new entry survives pruning" "^edited entry kept: yes$"
+assert_output_contains "its fan-out directory is pruned to the limit" "^fan-out directory entries: +32$"
+echo ""
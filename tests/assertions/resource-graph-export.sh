@@ -0,0 +1,68 @@
+# Resource graph export, query and snapshot assertions
+# Sourced by run-tests.sh — uses run_now, assert_output_contains, assert_exit_code, etc.
+
+# Runs build-resource-graph.py on cross-file-leak@test in every output mode
+# and both query forms. Output lines are prefixed with the mode they come
+# from. It uses a cache of its own, seeded with stale snapshots, so the build
+# has to prune it back to MAX_GRAPH_SNAPSHOTS (64).
+resource_graph_runs() (
+    export EGO_LINT_CACHE_DIR="$WORK_DIR/resource-graph-cache"
+    local ext="$FIXTURES/cross-file-leak@test"
+    local graph="$SCRIPT_DIR/skills/ego-lint/scripts/build-resource-graph.py"
+    local snapshots="$EGO_LINT_CACHE_DIR/resource-graph"
+    local i
+    mkdir -p "$snapshots"
+    for i in $(seq 1 80); do
+        echo '{}' > "$snapshots/stale$i.json"
+        touch -d '2000-01-01' "$snapshots/stale$i.json"
+    done
+    python3 "$graph" --format dot "$ext" | sed 's/^/dot: /'
+    python3 "$graph" --format graphml "$ext" > "$WORK_DIR/graph.graphml"
+    python3 -c '
+import sys
+import xml.etree.ElementTree as ET
+ns = {"g": "http://graphml.graphdrawing.org/xmlns"}
+root = ET.parse(sys.argv[1]).getroot()
+print("graphml nodes:", len(root.findall(".//g:node", ns)))
+print("graphml edges:", len(root.findall(".//g:edge", ns)))
+for node in root.findall(".//g:node", ns):
+    data = {d.get("key"): d.text for d in node.findall("g:data", ns)}
+    if data.get("orphan") == "true":
+        print("graphml orphan:", node.get("id"))
+' "$WORK_DIR/graph.graphml"
+    python3 "$graph" "$ext" > "$WORK_DIR/graph.json"
+    python3 "$graph" --compact "$ext" > "$WORK_DIR/graph.compact.json"
+    echo "compact lines: $(wc -l < "$WORK_DIR/graph.compact.json")"
+    python3 -c '
+import json, sys
+pretty, compact = (json.load(open(p)) for p in sys.argv[1:])
+print("compact matches pretty:", pretty == compact)
+' "$WORK_DIR/graph.json" "$WORK_DIR/graph.compact.json"
+    python3 "$graph" query "$ext" --file lib/manager.js | sed 's/^/file: /'
+    python3 "$graph" query "$ext" --path extension.js Controller | sed 's/^/path: /'
+    echo "snapshots kept: $(find "$snapshots" -name '*.json' | wc -l)"
+    echo "stale snapshots kept: $(find "$snapshots" -name 'stale*.json' | wc -l)"
+)
+
+# --- resource-graph-export ---
+echo "=== resource-graph-export ==="
+run_now resource_graph_runs
+assert_exit_code "exits with 0" 0
+assert_output_contains "DOT has a box per module" '^dot:   "lib/manager.js" \[shape=box, style=bold\];$'
+assert_output_contains "DOT marks the orphan signal red" '^dot:   "lib/manager.js:9:signal" \[shape=ellipse, label="signal this._handlerId\\nline 9", color=red, fontcolor=red\];$'
+assert_output_contains "DOT keeps the cleaned-up timeout uncolored" '^dot:   "lib/controller.js:6:timeout" \[shape=ellipse, label="timeout this._timeoutId\\nline 6"\];$'
+assert_output_contains "DOT has the ownership edges" '^dot:   "extension.js" -> "lib/manager.js" \[label="this._manager"\];$'
+assert_output_contains "GraphML is well-formed with every node" "^graphml nodes: 6$"
+assert_output_contains "GraphML has creates and owns edges" "^graphml edges: 5$"
+assert_output_contains "GraphML flags the orphan signal" "^graphml orphan: lib/manager.js:9:signal$"
+assert_output_contains "GraphML flags the orphan file monitor" "^graphml orphan: lib/controller.js:11:filemonitor$"
+assert_output_contains "--compact writes one line" "^compact lines: 1$"
+assert_output_contains "--compact is the same graph as the default output" "^compact matches pretty: True$"
+assert_output_contains "query --file lists the orphan signal" "^file: lib/manager.js:9 signal this._handlerId$"
+assert_output_contains "query --file gives the orphan reason" "^file:     ORPHAN: this._handlerId created but not cleaned up in destroy\(\)$"
+assert_output_contains "query --file names the owner" "^file: owned by extension.js:6 as this._manager, destroyed at extension.js:11$"
+assert_output_contains "query --path starts at the entry point" "^path: extension.js$"
+assert_output_contains "query --path follows the chain to a class" "^path:   -> lib/controller.js via this._controller = new Controller\(\) \(lib/manager.js:6, destroyed at line 13\)$"
+assert_output_contains "snapshots are pruned to the limit" "^snapshots kept: 64$"
+assert_output_contains "the least recently used snapshots go first" "^stale snapshots kept: 63$"
+echo ""
@@ -0,0 +1,60 @@
+# ego-lint --timings, --corpus and --trace assertions
+# Sourced by run-tests.sh — uses run_lint, assert_output_contains, assert_exit_code, etc.
+
+# --- timings ---
+echo "=== timings ==="
+run_lint "valid-extension@test" --timings
+assert_exit_code "exits with 0 under --timings" 0
+assert_output_contains "prints a per-stage table" "^  check-lifecycle.py +[0-9.]+ +[0-9.]+ +[0-9.]+$"
+assert_output_contains "lists the slowest functions" "slowest functions \(by self time\)"
+echo ""
+
+# --- corpus ---
+echo "=== corpus ==="
+run_lint "gsettings-key-typo@test" --corpus
+assert_exit_code "exits with 0 under --corpus (FAILs do not count)" 0
+assert_output_contains "streams one record per extension" '^\{"type": "extension", "path": "[^"]*/gsettings-key-typo@test"'
+assert_output_contains "records results as ego-lint reports them" '"status": "FAIL", "check": "schema/key-exists"'
+assert_output_contains "ends with per-check stats" '^\{"type": "stats", "extensions": 1, "failed": 1, .*"schema/key-exists": \{"fail": 1'
+assert_output_contains "prints a summary" "^Linted 1 extension\(s\) in "
+echo ""
+
+# Lints valid-extension@test with and without --trace and prints the lines
+# only the traced run has, then checks that trace.TRACED_SCRIPTS (the stages
+# run in-process) covers every Python stage ego-lint runs and that each one
+# only calls main() under its __main__ guard.
+trace_runs() {
+    local ext="$FIXTURES/valid-extension@test"
+    diff <(bash "$LINT" "$ext") <(bash "$LINT" --trace "$WORK_DIR/trace.json" "$ext") \
+        > "$WORK_DIR/trace.diff"
+    sed -n 's/^> /traced only: /p' "$WORK_DIR/trace.diff"
+    echo "differing lines: $(grep -c '^[<>]' "$WORK_DIR/trace.diff")"
+    echo "trace events: $(python3 -c 'import json, sys; print(len(json.load(open(sys.argv[1]))["traceEvents"]))' "$WORK_DIR/trace.json")"
+    PYTHONPATH="$SCRIPT_DIR/skills/ego-lint/scripts" python3 - <<'PY'
+import ast, os
+from ego_lint import corpus, trace
+scripts = sorted(s for s in corpus.STAGES if s.endswith('.py'))
+print('untraced stages:', [s for s in scripts if s not in trace.TRACED_SCRIPTS] or 'none')
+for name in sorted(trace.TRACED_SCRIPTS):
+    with open(os.path.join(corpus.SCRIPTS_DIR, name), encoding='utf-8') as f:
+        body = ast.parse(f.read()).body
+    defines_main = any(isinstance(n, ast.FunctionDef) and n.name == 'main' for n in body)
+    # main() may only be called from the `if __name__ == '__main__':` block
+    calls_main = any(isinstance(n, ast.Expr) and isinstance(n.value, ast.Call)
+                     and getattr(n.value.func, 'id', None) == 'main' for n in body)
+    guarded = any(isinstance(n, ast.If) and ast.unparse(n.test) == "__name__ == '__main__'"
+                  for n in body)
+    if not defines_main or calls_main or not guarded:
+        print('unguarded:', name)
+PY
+}
+
+# --- trace ---
+echo "=== trace ==="
+run_now trace_runs
+assert_output_contains "adds only the trace file line to the output" "^traced only: Trace written to .*/trace\.json "
+assert_output_contains "no blank line or other extra output" "^differing lines: 1$"
+assert_output_contains "writes the trace events" "^trace events: [1-9][0-9]*$"
+assert_output_contains "every Python stage runs in-process" "^untraced stages: none$"
+assert_output_not_contains "every in-process stage guards main()" "^unguarded:"
+echo ""
@@ -0,0 +1,27 @@
+# GSettings schema and key usage assertions
+# Sourced by run-tests.sh — uses run_lint, assert_output_contains, assert_exit_code, etc.
+
+# --- schema-enum-first ---
+echo "=== schema-enum-first ==="
+run_lint "schema-enum-first@test"
+assert_output_contains "takes the schema id, not the enum id" "\[PASS\].*schema/id-matches"
+assert_output_not_contains "no filename false positive from the enum id" "\[FAIL\].*schema/filename-convention"
+assert_output_contains "compiles schema with enum key" "\[PASS\].*schema/compile"
+echo ""
+
+# --- gsettings-key-typo ---
+echo "=== gsettings-key-typo ==="
+run_lint "gsettings-key-typo@test"
+assert_output_contains "flags misspelled key in get_int" "\[FAIL\].*schema/key-exists.*extension.js:11: 'refresh-intervall'"
+assert_output_contains "flags misspelled key in changed:: signal" "\[FAIL\].*schema/key-exists.*'show-icons' is not a key"
+assert_output_contains "flags set_string on an integer key" "\[FAIL\].*schema/key-type.*set_string\('refresh-interval'\)"
+assert_output_not_contains "ignores keys of system schemas" "color-scheme"
+echo ""
+
+# --- gsettings-rebound ---
+echo "=== gsettings-rebound ==="
+run_lint "gsettings-rebound@test"
+assert_output_not_contains "accepts a key of the schema the field was first bound to" "schema/key-exists.*extension.js:7:"
+assert_output_contains "checks a rebound field against every schema it holds" "\[FAIL\].*schema/key-exists.*extension.js:13: 'window-height' is not a key of .*\.window or org\.gnome\.shell\.extensions\.gsettings-rebound$"
+assert_output_contains "flags a type that matches none of the candidates" "\[FAIL\].*schema/key-type.*get_string\('window-width'\)"
+echo ""
@@ -0,0 +1,26 @@
+# Shared tokenizer and index assertions (check-files, check-gobject, check-css)
+# Sourced by run-tests.sh — uses run_lint, assert_output_contains, assert_exit_code, etc.
+
+# --- minified-multibyte ---
+echo "=== minified-multibyte ==="
+run_lint "minified-multibyte@test"
+assert_output_contains "long non-ASCII line under 500 characters is not minified" "\[PASS\].*minified-js"
+echo ""
+
+# --- gobject-long-bodies ---
+echo "=== gobject-long-bodies ==="
+run_lint "gobject-long-bodies@test"
+assert_output_contains "GTypeName after long metadata found" "\[PASS\].*gobject/missing-gtypename"
+assert_output_contains "super._init scoped to registered classes" "\[PASS\].*gobject/missing-super-init"
+assert_output_contains "cr.\$dispose at end of long callback found" "\[PASS\].*gobject/cairo-dispose"
+echo ""
+
+# --- css-multi-sheet ---
+echo "=== css-multi-sheet ==="
+run_lint "css-multi-sheet@test"
+assert_output_contains "detects unscoped class in one-line @media block" "\[WARN\].*css/unscoped-class.*\.container"
+assert_output_not_contains "commented-out selector not indexed" "css/unscoped-class.*\.wrapper"
+assert_output_contains "counts !important in stylesheet-dark.css" "\[WARN\].*css/important.*1 !important.*stylesheet-dark\.css"
+assert_output_contains "detects shell class override in dark stylesheet" "\[FAIL\].*css/shell-class-override.*\.popup-menu-item"
+assert_output_not_contains "descendant shell class is scoped" "css/shell-class-override.*\.panel-button"
+echo ""
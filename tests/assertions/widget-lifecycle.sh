@@ -8,3 +8,9 @@ assert_output_contains "widget not destroyed in disable()" "\[WARN\].*lifecycle/
 echo "=== settings-no-null ==="
 run_lint "settings-no-null@test"
 assert_output_contains "settings not nulled in disable()" "\[WARN\].*lifecycle/settings-cleanup"
+
+echo "=== lifecycle-optional-destroy ==="
+run_lint "lifecycle-optional-destroy@test"
+assert_output_contains "widget destroyed with ?.destroy() counts as cleanup" "\[PASS\].*lifecycle/widget-destroy"
+assert_output_contains "Source.remove() in a string or comment is not cleanup" "\[FAIL\].*lifecycle/timeout-not-removed"
+assert_output_contains "destroy without null still flagged" "\[WARN\].*lifecycle/destroy-no-null.*extension\.js:18"
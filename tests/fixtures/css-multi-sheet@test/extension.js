@@ -0,0 +1,6 @@
+import {Extension} from 'resource:///org/gnome/shell/extensions/extension.js';
+
+export default class TestExtension extends Extension {
+    enable() {}
+    disable() {}
+}
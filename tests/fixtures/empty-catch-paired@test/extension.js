@@ -0,0 +1,30 @@
+import {Extension} from 'resource:///org/gnome/shell/extensions/extension.js';
+
+export default class EmptyCatchPairedExtension extends Extension {
+    enable() {
+        this._label = null;
+        this._loadState();
+    }
+
+    _dropLabel() {
+        try {
+            this._label.destroy();
+        } catch {
+            // Already destroyed — safe to ignore
+        }
+    }
+
+    _loadState() {
+        // The cleanup above must not excuse this one: try { } catch {}
+        try {
+            this._state = JSON.parse(this._raw);
+        } catch (e) {
+        }
+    }
+
+    disable() {
+        this._dropLabel();
+        this._label = null;
+        this._state = null;
+    }
+}
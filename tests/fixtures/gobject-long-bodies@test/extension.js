@@ -0,0 +1,68 @@
+import GObject from 'gi://GObject';
+import St from 'gi://St';
+import {Extension} from 'resource:///org/gnome/shell/extensions/extension.js';
+
+// GTypeName after a long properties block
+const LongWidget = GObject.registerClass({
+    Properties: {
+        'primary-label': GObject.ParamSpec.string(
+            'primary-label', 'Primary label', 'Text of the primary label',
+            GObject.ParamFlags.READWRITE, ''),
+        'secondary-label': GObject.ParamSpec.string(
+            'secondary-label', 'Secondary label', 'Text of the secondary label',
+            GObject.ParamFlags.READWRITE, ''),
+        'show-icon': GObject.ParamSpec.boolean(
+            'show-icon', 'Show icon', 'Whether the icon is visible',
+            GObject.ParamFlags.READWRITE, true),
+    },
+    GTypeName: 'LongBodiesLongWidget',
+}, class LongWidget extends St.BoxLayout {
+    _init(params) {
+        super._init(params);
+    }
+});
+
+// cr.$dispose() at the end of a long repaint
+const LongDrawing = GObject.registerClass({
+    GTypeName: 'LongBodiesLongDrawing',
+}, class LongDrawing extends St.DrawingArea {
+    vfunc_repaint() {
+        const cr = this.get_context();
+        const [width, height] = this.get_surface_size();
+        const node = this.get_theme_node();
+        const foreground = node.get_foreground_color();
+        const background = node.get_background_color();
+        cr.setSourceRGBA(background.red / 255, background.green / 255,
+            background.blue / 255, background.alpha / 255);
+        cr.rectangle(0, 0, width, height);
+        cr.fill();
+        cr.setSourceRGBA(foreground.red / 255, foreground.green / 255,
+            foreground.blue / 255, foreground.alpha / 255);
+        cr.arc(width / 2, height / 2, Math.min(width, height) / 2, 0, 2 * Math.PI);
+        cr.fill();
+        cr.$dispose();
+    }
+});
+
+// Undecorated helper class: _init without super is not a GObject concern
+class Helper {
+    _init() {
+        this._ready = true;
+    }
+}
+
+export default class TestExtension extends Extension {
+    enable() {
+        this._widget = new LongWidget();
+        this._drawing = new LongDrawing();
+        this._helper = new Helper();
+    }
+
+    disable() {
+        this._widget?.destroy();
+        this._widget = null;
+        this._drawing?.destroy();
+        this._drawing = null;
+        this._helper = null;
+    }
+}
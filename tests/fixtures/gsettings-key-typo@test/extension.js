@@ -0,0 +1,27 @@
+import Gio from 'gi://Gio';
+import {Extension} from 'resource:///org/gnome/shell/extensions/extension.js';
+
+export default class GSettingsKeyTypoExtension extends Extension {
+    enable() {
+        this._settings = this.getSettings();
+        this._interface = new Gio.Settings({schema_id: 'org.gnome.desktop.interface'});
+
+        // this._settings.get_boolean('show-icons') in a comment is not a call
+        this._showIcon = this._settings.get_boolean('show-icon');
+        this._interval = this._settings.get_int('refresh-intervall');
+        this._position = this._settings.get_string('panel-position');
+        this._settings.set_string('refresh-interval', '30');
+        this._scheme = this._interface.get_string('color-scheme');
+        this._changedId = this._settings.connect('changed::show-icons', () => this._sync());
+    }
+
+    _sync() {
+        this._showIcon = this.getSettings().get_boolean('show-icon');
+    }
+
+    disable() {
+        this._settings.disconnect(this._changedId);
+        this._settings = null;
+        this._interface = null;
+    }
+}
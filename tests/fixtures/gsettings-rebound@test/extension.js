@@ -0,0 +1,20 @@
+import Gio from 'gi://Gio';
+import {Extension} from 'resource:///org/gnome/shell/extensions/extension.js';
+
+export default class GSettingsReboundExtension extends Extension {
+    enable() {
+        this._settings = new Gio.Settings({schema_id: 'org.gnome.shell.extensions.gsettings-rebound.window'});
+        this._width = this._settings.get_int('window-width');
+        this._settings = null;
+
+        // The same field, rebound to the main schema
+        this._settings = this.getSettings();
+        this._showIcon = this._settings.get_boolean('show-icon');
+        this._height = this._settings.get_int('window-height');
+        this._label = this._settings.get_string('window-width');
+    }
+
+    disable() {
+        this._settings = null;
+    }
+}
@@ -0,0 +1,20 @@
+import GLib from 'gi://GLib';
+import St from 'gi://St';
+import * as Main from 'resource:///org/gnome/shell/ui/main.js';
+import {Extension} from 'resource:///org/gnome/shell/extensions/extension.js';
+
+export default class TestExtension extends Extension {
+    enable() {
+        this._label = new St.Label({text: 'disable() { GLib.Source.remove(id); }'});
+        Main.panel._rightBox.add_child(this._label);
+        this._timeoutId = GLib.timeout_add_seconds(GLib.PRIORITY_DEFAULT, 5, () => {
+            this._label.set_text('tick');
+            return GLib.SOURCE_CONTINUE;
+        });
+    }
+
+    disable() {
+        // GLib.Source.remove(this._timeoutId) is still missing here
+        this._label?.destroy();
+    }
+}
@@ -0,0 +1,26 @@
+import GLib from 'gi://GLib';
+import {Extension} from 'resource:///org/gnome/shell/extensions/extension.js';
+
+export default class TestExtension extends Extension {
+    enable() {
+        this._timeoutId = GLib.timeout_add_seconds(GLib.PRIORITY_DEFAULT, 5, () => {
+            return GLib.SOURCE_CONTINUE;
+        });
+    }
+
+    disable() {
+        const summary = `stopping {${this.uuid}}`;
+        const closer = '}';
+        if (/}/.test(summary + closer))
+            this._summary = null;
+
+        let step = 2;
+        const half = step++ / 2; if (half) { this._ratio = step / half; }
+        const rest = step-- / 2; if (rest) { this._rest = step / rest; }
+
+        if (this._timeoutId) {
+            GLib.Source.remove(this._timeoutId);
+            this._timeoutId = null;
+        }
+    }
+}
@@ -0,0 +1,12 @@
+import St from 'gi://St';
+import {Extension} from 'resource:///org/gnome/shell/extensions/extension.js';
+
+export default class MetadataNotObjectExtension extends Extension {
+    enable() {
+        this._clipboard = St.Clipboard.get_default();
+    }
+
+    disable() {
+        this._clipboard = null;
+    }
+}
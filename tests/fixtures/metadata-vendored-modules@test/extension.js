@@ -0,0 +1,14 @@
+import GLib from 'gi://GLib';
+import {Extension, gettext as _} from 'resource:///org/gnome/shell/extensions/extension.js';
+
+export default class MetadataVendoredModulesExtension extends Extension {
+    enable() {
+        this._title = GLib.dgettext('metadata-vendored-modules', 'Title');
+        this._subtitle = _('Subtitle');
+    }
+
+    disable() {
+        this._title = null;
+        this._subtitle = null;
+    }
+}
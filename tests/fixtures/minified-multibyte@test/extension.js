@@ -0,0 +1,12 @@
+import {Extension} from 'resource:///org/gnome/shell/extensions/extension.js';
+
+export default class MinifiedMultibyteExtension extends Extension {
+    enable() {
+        // Ελληνικά κείμενα, Ελληνικά κείμενα, Ελληνικά κείμενα, Ελληνικά κείμενα, Ελληνικά κείμενα, Ελληνικά κείμενα, Ελληνικά κείμενα, Ελληνικά κείμενα, Ελληνικά κείμενα, Ελληνικά κείμενα, Ελληνικά κείμενα, Ελληνικά κείμενα, Ελληνικά κείμενα, Ελληνικά κείμενα, Ελληνικά κείμενα, Ελληνικά κείμενα, Ελληνικά κείμενα, Ελληνικά κείμενα, Ελληνικά κείμενα, Ελληνικά κείμενα, Ελληνικά κείμενα, Ελληνικά κείμενα,
+        this._greeting = 'Καλημέρα';
+    }
+
+    disable() {
+        this._greeting = null;
+    }
+}
@@ -0,0 +1,48 @@
+import GObject from 'gi://GObject';
+import St from 'gi://St';
+import * as Main from 'resource:///org/gnome/shell/ui/main.js';
+import {Extension} from 'resource:///org/gnome/shell/extensions/extension.js';
+
+// Module-level object opened on the declaration line
+let iconCache = {
+    entries: new Map(),
+};
+
+function lookup(name) {
+    let entry = iconCache.entries.get(name); }
+
+const Indicator = GObject.registerClass({
+    GTypeName: 'ModuleScopeTagsIndicator',
+}, class Indicator extends St.BoxLayout {
+    constructor(params) {
+        super(params);
+        this.add_child(new St.Label({text: 'ok'}));
+    }
+});
+
+class Tracker {
+    constructor(settings) {
+        this._settings = settings;
+        this._id = this._settings.connect('changed', () => lookup('tracker'));
+    }
+}
+
+class Helper {
+    destroy() {
+        this._tracker = null;
+    }
+}
+
+export default class TestExtension extends Extension {
+    enable() {
+        this._indicator = new Indicator();
+        this._tracker = new Tracker(this.getSettings());
+        Main.panel.addToStatusArea(this.uuid, this._indicator);
+    }
+
+    disable() {
+        this._indicator?.destroy();
+        this._indicator = null;
+        this._tracker = null;
+    }
+}
@@ -0,0 +1,11 @@
+import {Extension} from 'resource:///org/gnome/shell/extensions/extension.js';
+
+export default class PackageBombTotalExtension extends Extension {
+    enable() {
+        this._enabled = true;
+    }
+
+    disable() {
+        this._enabled = false;
+    }
+}
@@ -0,0 +1,13 @@
+import {Extension} from 'resource:///org/gnome/shell/extensions/extension.js';
+
+export default class SchemaEnumFirstExtension extends Extension {
+    enable() {
+        this._settings = this.getSettings();
+        this._position = this._settings.get_enum('panel-position');
+    }
+
+    disable() {
+        this._settings = null;
+        this._position = null;
+    }
+}
@@ -0,0 +1,13 @@
+import {Extension} from 'resource:///org/gnome/shell/extensions/extension.js';
+
+import {PADDING} from './lib/pad.js';
+
+export default class ZipBombMemberExtension extends Extension {
+    enable() {
+        this._padding = PADDING;
+    }
+
+    disable() {
+        this._padding = null;
+    }
+}
@@ -0,0 +1,16 @@
+import {Extension} from 'resource:///org/gnome/shell/extensions/extension.js';
+
+import {PanelLabel} from './lib/label.js';
+
+export default class ZipSubmissionExtension extends Extension {
+    enable() {
+        this._settings = this.getSettings();
+        this._label = new PanelLabel(this._settings.get_string('label-text'));
+    }
+
+    disable() {
+        this._label?.destroy();
+        this._label = null;
+        this._settings = null;
+    }
+}
@@ -0,0 +1,14 @@
+import Gtk from 'gi://Gtk?version=4.0';
+import St from 'gi://St';
+
+export class PanelLabel {
+    constructor(text) {
+        this._actor = new St.Label({text});
+        this._clipboard = Gtk.Clipboard;
+    }
+
+    destroy() {
+        this._actor.destroy();
+        this._actor = null;
+    }
+}
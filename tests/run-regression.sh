@@ -17,7 +17,7 @@ NC='\033[0m' # No Color
 
 assert_output_contains() {
     local label="$1" pattern="$2"
-    if echo "$output" | grep -qE "$pattern"; then
+    if grep -qE "$pattern" <<< "$output"; then
         echo -e "  ${GREEN}✓${NC} $label"
         PASS_COUNT=$((PASS_COUNT + 1))
     else
@@ -28,7 +28,7 @@ assert_output_contains() {
 
 assert_output_not_contains() {
     local label="$1" pattern="$2"
-    if ! echo "$output" | grep -qE "$pattern"; then
+    if ! grep -qE "$pattern" <<< "$output"; then
         echo -e "  ${GREEN}✓${NC} $label"
         PASS_COUNT=$((PASS_COUNT + 1))
     else
@@ -1,4 +1,15 @@
 #!/usr/bin/env bash
+# Usage: run-tests.sh [-j N] [--shard I/N] [--timings]
+#
+#   -j N, --jobs N   Lint N fixtures at a time (default: number of CPUs)
+#   --shard I/N      Run only the I-th of N slices of the fixtures (for CI)
+#   --timings        List every fixture's lint time, slowest first
+#
+# The suite runs in two passes. This script first re-runs itself with
+# run_lint() only recording fixture names, then lints every fixture once,
+# in parallel, caching its output and exit code. The assertions then run
+# in order against the cached output, so the report reads the same at
+# any -j.
 set -euo pipefail
 
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
@@ -12,9 +23,53 @@ RED='\033[0;31m'
 GREEN='\033[0;32m'
 NC='\033[0m' # No Color
 
+JOBS="$(getconf _NPROCESSORS_ONLN 2>/dev/null || echo 1)"
+SHARD_INDEX=1
+SHARD_COUNT=1
+TIMINGS=false
+SLOWEST_LISTED=5
+
+usage() {
+    sed -n '2,7s/^# \{0,1\}//p' "${BASH_SOURCE[0]}"
+}
+
+while [[ $# -gt 0 ]]; do
+    case "$1" in
+        -j|--jobs) JOBS="${2:-}"; shift 2 ;;
+        -j*) JOBS="${1#-j}"; shift ;;
+        --jobs=*) JOBS="${1#*=}"; shift ;;
+        --shard) SHARD="${2:-}"; shift 2 ;;
+        --shard=*) SHARD="${1#*=}"; shift ;;
+        --timings) TIMINGS=true; shift ;;
+        -h|--help) usage; exit 0 ;;
+        *) echo "Unknown option: $1" >&2; usage >&2; exit 2 ;;
+    esac
+done
+if [[ ! "$JOBS" =~ ^[1-9][0-9]*$ ]]; then
+    echo "-j expects a positive number, got: '$JOBS'" >&2
+    exit 2
+fi
+if [[ -n "${SHARD:-}" ]]; then
+    if [[ ! "$SHARD" =~ ^([1-9][0-9]*)/([1-9][0-9]*)$ ]] \
+            || (( BASH_REMATCH[1] > BASH_REMATCH[2] )); then
+        echo "--shard expects I/N with 1 <= I <= N, got: '$SHARD'" >&2
+        exit 2
+    fi
+    SHARD_INDEX="${BASH_REMATCH[1]}"
+    SHARD_COUNT="${BASH_REMATCH[2]}"
+fi
+
+# Set while collecting fixture names: run_lint records, assertions do nothing
+COLLECTING="${EGO_TESTS_COLLECT:-}"
+# Set by run_lint when the fixture belongs to another shard
+SKIPPED=false
+
+# <<< instead of `echo | grep -q`: with pipefail, grep -q exiting on the
+# first match could kill echo with SIGPIPE and fail the pipeline
 assert_output_contains() {
+    [[ -z "$COLLECTING" && "$SKIPPED" == false ]] || return 0
     local label="$1" pattern="$2"
-    if echo "$output" | grep -qE "$pattern"; then
+    if grep -qE "$pattern" <<< "$output"; then
         echo -e "  ${GREEN}✓${NC} $label"
         PASS_COUNT=$((PASS_COUNT + 1))
     else
@@ -24,8 +79,9 @@ assert_output_contains() {
 }
 
 assert_output_not_contains() {
+    [[ -z "$COLLECTING" && "$SKIPPED" == false ]] || return 0
     local label="$1" pattern="$2"
-    if ! echo "$output" | grep -qE "$pattern"; then
+    if ! grep -qE "$pattern" <<< "$output"; then
         echo -e "  ${GREEN}✓${NC} $label"
         PASS_COUNT=$((PASS_COUNT + 1))
     else
@@ -35,6 +91,7 @@ assert_output_not_contains() {
 }
 
 assert_exit_code() {
+    [[ -z "$COLLECTING" && "$SKIPPED" == false ]] || return 0
     local label="$1" expected="$2"
     if [[ "$exit_code" -eq "$expected" ]]; then
         echo -e "  ${GREEN}✓${NC} $label (exit code: $exit_code)"
@@ -45,13 +102,92 @@ assert_exit_code() {
     fi
 }
 
+# Cache file stem of a lint run: "FIXTURE [OPTION...]" (fixtures may name a
+# file: "x@test/x.zip")
+cache_key() {
+    local key="${1//\//__}"
+    echo "$WORK_DIR/${key// /_}"
+}
+
+# run_lint FIXTURE [OPTION...] — ego-lint options must not contain spaces
 run_lint() {
-    local fixture="$1"
+    local run="$*" key
+    if [[ -n "$COLLECTING" ]]; then
+        echo "$run" >&3
+        return 0
+    fi
+    output=""
+    exit_code=0
+    key="$(cache_key "$run")"
+    if [[ ! -f "$key.status" ]]; then
+        SKIPPED=true
+        return 0
+    fi
+    SKIPPED=false
+    output="$(< "$key.out")"
+    read -r exit_code _ < "$key.status"
+}
+
+# run_now COMMAND [ARG...] — run a command in the assertion pass itself, for
+# tests that change files between runs (the cached lints cannot express
+# that). Like run_lint it sets $output and $exit_code. These blocks belong
+# to shard 1.
+run_now() {
     output=""
     exit_code=0
-    output="$(bash "$LINT" "$FIXTURES/$fixture" 2>&1)" || exit_code=$?
+    if [[ -n "$COLLECTING" || "$SHARD_INDEX" -ne 1 ]]; then
+        SKIPPED=true
+        return 0
+    fi
+    SKIPPED=false
+    output="$("$@" 2>&1)" || exit_code=$?
+}
+
+now_ms() {
+    if [[ -n "${EPOCHREALTIME:-}" ]]; then
+        local now="${EPOCHREALTIME/[.,]/}"
+        echo $(( 10#$now / 1000 ))
+    else
+        echo $(( $(date +%s) * 1000 ))
+    fi
 }
 
+# lint_fixture STEM "FIXTURE [OPTION...]" — run ego-lint once; STEM.out holds
+# the output, STEM.status "EXIT_CODE MILLISECONDS FIXTURE [OPTION...]"
+lint_fixture() {
+    local stem="$1" run="$2" start rc=0 words
+    [[ -n "$run" ]] || return 0
+    read -r -a words <<< "$run"
+    start="$(now_ms)"
+    bash "$LINT" "$FIXTURES/${words[0]}" "${words[@]:1}" > "$stem.out" 2>&1 || rc=$?
+    echo "$rc $(( $(now_ms) - start )) $run" > "$stem.status"
+}
+
+REPORT=/dev/null
+if [[ -z "$COLLECTING" ]]; then
+    WORK_DIR="$(mktemp -d "${TMPDIR:-/tmp}/ego-lint-tests.XXXXXX")"
+    trap 'rm -rf "$WORK_DIR"' EXIT
+    REPORT="$WORK_DIR/report"
+    # A fresh on-disk cache per run: nothing is written to the developer's
+    # ~/.cache, and no result can come from an entry an older tree left
+    export EGO_LINT_CACHE_DIR="$WORK_DIR/cache"
+
+    # Pass 1: every fixture the assertions lint, in order, once each
+    EGO_TESTS_COLLECT=1 bash "${BASH_SOURCE[0]}" 3> "$WORK_DIR/fixtures" > /dev/null
+    SUITE_START="$(now_ms)"
+    export LINT FIXTURES
+    export -f now_ms lint_fixture
+    awk -v i="$SHARD_INDEX" -v n="$SHARD_COUNT" \
+        '!seen[$0]++ && (++count - 1) % n == i - 1' "$WORK_DIR/fixtures" \
+        | while IFS= read -r run; do
+            printf '%s\0%s\0' "$(cache_key "$run")" "$run"
+        done \
+        | xargs -0 -n 2 -P "$JOBS" bash -c 'lint_fixture "$@"' _
+    SUITE_MS=$(( $(now_ms) - SUITE_START ))
+fi
+
+# Pass 2 (or, while collecting, pass 1): the assertions, in order
+{
 echo "============================================"
 echo "  ego-lint Test Runner"
 echo "============================================"
@@ -574,11 +710,38 @@ for assertion_file in "$ASSERTIONS_DIR"/*.sh; do
     source "$assertion_file"
 done
 
+} > "$REPORT"
+
+[[ -z "$COLLECTING" ]] || exit 0
+
+# Drop the headers of blocks whose fixture is in another shard
+awk '/^=== .* ===$/ { header = $0; next }
+     header != "" { skipped = ($0 == ""); if (!skipped) print header; header = "" }
+     skipped && $0 == "" { skipped = 0; next }
+     { print }' "$WORK_DIR/report"
+
 # --- Summary ---
+FIXTURE_COUNT="$(find "$WORK_DIR" -name '*.status' | wc -l | tr -d ' ')"
 echo "============================================"
 echo "  Results: $PASS_COUNT passed, $FAIL_COUNT failed"
+if [[ "$SHARD_COUNT" -gt 1 ]]; then
+    echo "  Shard $SHARD_INDEX/$SHARD_COUNT: linted $FIXTURE_COUNT fixture(s) in $SUITE_MS ms (-j $JOBS)"
+else
+    echo "  Linted $FIXTURE_COUNT fixture(s) in $SUITE_MS ms (-j $JOBS)"
+fi
 echo "============================================"
 
+if [[ "$TIMINGS" == true ]]; then
+    echo "Fixture timings (ms):"
+    cat "$WORK_DIR"/*.status 2>/dev/null | sort -k2,2nr | awk '{ ms = $2; $1 = $2 = ""; printf "  %6d  %s\n", ms, substr($0, 3) }'
+else
+    echo "Slowest fixtures (ms):"
+    # awk stops printing rather than exiting early: `head` would leave sort
+    # writing into a closed pipe, and pipefail turns its SIGPIPE into exit 141
+    cat "$WORK_DIR"/*.status 2>/dev/null | sort -k2,2nr \
+        | awk -v n="$SLOWEST_LISTED" 'NR <= n { ms = $2; $1 = $2 = ""; printf "  %6d  %s\n", ms, substr($0, 3) }'
+fi
+
 if [[ "$FAIL_COUNT" -gt 0 ]]; then
     echo -e "${RED}SOME TESTS FAILED${NC}"
     exit 1